@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from rated.analytics.streaming import Moments
+from rated.ethereum.datatypes import ValidatorEffectiveness
+
+# Metrics watched by default
+DEFAULT_FIELDS: Tuple[str, ...] = ("uptime", "attester_effectiveness")
+
+
+class Baseline(str, Enum):
+    """What a value is compared to"""
+
+    FLEET = "fleet"
+    HISTORY = "history"
+
+
+@dataclass
+class Anomaly:
+    """A value of a validator that deviates from its baseline, by `deviation` standard deviations"""
+
+    validator_index: int
+    field: str
+    value: float
+    baseline: Baseline
+    expected: float
+    deviation: float
+    hour: int | None = None
+    day: int | None = None
+
+
+class _Rings:
+    """Ring buffers of the most recent values of a metric, one per validator, in preallocated arrays"""
+
+    def __init__(self, window: int, capacity: int) -> None:
+        self.window = window
+        self.values = array("d")
+        self.counts = array("i")
+        self.heads = array("i")
+        self.sums = array("d")
+        self.squares = array("d")
+        self.grow(capacity)
+
+    def grow(self, capacity: int) -> None:
+        added = capacity - len(self.counts)
+        self.values.frombytes(bytes(self.values.itemsize * self.window * added))
+        for values in (self.counts, self.heads, self.sums, self.squares):
+            values.frombytes(bytes(values.itemsize * added))
+
+    def stats(self, row: int) -> Tuple[int, float, float]:
+        """Number of values, mean and standard deviation of a ring"""
+        count = self.counts[row]
+        if not count:
+            return 0, 0.0, 0.0
+        mean = self.sums[row] / count
+        variance = max(self.squares[row] / count - mean * mean, 0.0)
+        return count, mean, math.sqrt(variance)
+
+    def push(self, row: int, value: float) -> None:
+        position = row * self.window + self.heads[row]
+        if self.counts[row] == self.window:
+            oldest = self.values[position]
+            self.sums[row] -= oldest
+            self.squares[row] -= oldest * oldest
+        else:
+            self.counts[row] += 1
+        self.values[position] = value
+        self.sums[row] += value
+        self.squares[row] += value * value
+        self.heads[row] = (self.heads[row] + 1) % self.window
+
+    def ordered(self, row: int) -> List[float]:
+        """Values of a ring, oldest first"""
+        start, count = row * self.window, self.counts[row]
+        ring = self.values[start : start + self.window]
+        head = self.heads[row]
+        return (ring[head:] + ring[:head]).tolist()[self.window - count :]
+
+
+class AnomalyDetector:
+    """
+    Flag drops in the performance of validators, against the fleet and against their own recent history
+
+    Every validator keeps a rolling window of its most recent values in preallocated arrays, so that memory is bounded
+    by the number of validators and the window, and every row is handled in constant time. The fleet baseline is the
+    mean and spread of every validator over the previous period, i.e. the previous hour for hourly rows.
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        *,
+        window: int = 24,
+        capacity: int = 1024,
+        threshold: float = 3.0,
+        tolerance: float = 0.01,
+        min_history: int = 6,
+        two_sided: bool = False,
+    ) -> None:
+        """
+        Initialize a detector
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.analytics.anomalies import AnomalyDetector
+            >>> from rated.ethereum import MAINNET
+            >>> from rated.ethereum.enums import FilterType, Granularity
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> fleet = range(500_000, 600_000)
+            >>> detector = AnomalyDetector(window=24, capacity=len(fleet))
+            >>> rows = eth.validators.effectiveness_backfill(
+            >>>     indices=fleet,
+            >>>     from_day=24_000,
+            >>>     to_day=24_047,
+            >>>     filter_type=FilterType.HOUR,
+            >>>     granularity=Granularity.HOUR,
+            >>> )
+            >>> for anomaly in detector.detect(rows):
+            >>>     print(f"{anomaly.validator_index = }, {anomaly.field = }, {anomaly.value = }, {anomaly.baseline = }")
+
+        Args:
+            fields: Metrics of the effectiveness rows to watch
+            window: Number of most recent values kept per validator and metric
+            capacity: Number of validators to preallocate room for; grows as needed
+            threshold: Number of standard deviations away from the baseline a value has to be to be flagged
+            tolerance: Smallest absolute deviation that is flagged, so that a steady baseline does not flag every
+                tiny wobble
+            min_history: Number of past values a validator needs before being compared to its own history
+            two_sided: Whether rises are flagged as well as drops
+        """
+        if window < 1 or capacity < 1:
+            raise ValueError("The window and capacity must be positive")
+
+        self.fields = tuple(fields)
+        self.window = window
+        self.threshold = threshold
+        self.tolerance = tolerance
+        self.min_history = min_history
+        self.two_sided = two_sided
+
+        self._capacity = capacity
+        self._rows: Dict[int, int] = {}
+        self._rings = {name: _Rings(window, capacity) for name in self.fields}
+        self._period: int | None = None
+        self._current = {name: Moments() for name in self.fields}
+        self._baseline: Dict[str, Moments] = {}
+
+    def __len__(self) -> int:
+        """Number of validators watched"""
+        return len(self._rows)
+
+    def update(self, row: ValidatorEffectiveness) -> List[Anomaly]:
+        """
+        Check a row against the baselines, then add it to them
+
+        Args:
+            row: Effectiveness of a validator over an hour or a day, no earlier than the rows before it
+
+        Returns:
+            The anomalies of the row, if any
+
+        Raises:
+            ValueError: If the row has no validator index, or is earlier than the rows before it
+        """
+        if row.validator_index is None:
+            raise ValueError("Rows must have a validator index")
+
+        period = row.hour if row.hour is not None else row.day
+        if period is not None and self._period is not None and period < self._period:
+            raise ValueError(
+                f"Rows must be in time order, got period {period} after {self._period}"
+            )
+        if period is not None and period != self._period:
+            if self._period is not None:
+                self._baseline = self._current
+                self._current = {name: Moments() for name in self.fields}
+            self._period = period
+
+        slot = self._slot(row.validator_index)
+        anomalies = []
+        for name in self.fields:
+            value = getattr(row, name)
+            if value is None:
+                continue
+
+            rings = self._rings[name]
+            count, mean, std = rings.stats(slot)
+            if count >= self.min_history:
+                anomalies.extend(
+                    self._check(row, name, value, Baseline.HISTORY, mean, std)
+                )
+
+            fleet = self._baseline.get(name)
+            if fleet is not None and fleet.count > 1:
+                anomalies.extend(
+                    self._check(
+                        row, name, value, Baseline.FLEET, fleet.mean, fleet.std or 0.0
+                    )
+                )
+
+            rings.push(slot, value)
+            self._current[name].add(value)
+        return anomalies
+
+    def detect(self, rows: Iterable[ValidatorEffectiveness]) -> Iterator[Anomaly]:
+        """
+        Check a stream of rows, in time order
+
+        Args:
+            rows: Effectiveness rows of the fleet, oldest first, e.g. from a backfill
+
+        Yields:
+            Anomalies as they are found
+        """
+        for row in rows:
+            yield from self.update(row)
+
+    def history(self, validator_index: int, field: str) -> List[float]:
+        """
+        The rolling window of a validator
+
+        Args:
+            validator_index: Validator index
+            field: Metric watched
+
+        Returns:
+            The most recent values, oldest first
+        """
+        slot = self._rows.get(validator_index)
+        if slot is None:
+            return []
+        return self._rings[field].ordered(slot)
+
+    def _slot(self, validator_index: int) -> int:
+        slot = self._rows.get(validator_index)
+        if slot is None:
+            slot = len(self._rows)
+            if slot == self._capacity:
+                self._capacity *= 2
+                for rings in self._rings.values():
+                    rings.grow(self._capacity)
+            self._rows[validator_index] = slot
+        return slot
+
+    def _check(
+        self,
+        row: ValidatorEffectiveness,
+        name: str,
+        value: float,
+        baseline: Baseline,
+        mean: float,
+        std: float,
+    ) -> List[Anomaly]:
+        difference = value - mean if self.two_sided else min(value - mean, 0.0)
+        if abs(difference) <= max(self.threshold * std, self.tolerance):
+            return []
+        return [
+            Anomaly(
+                validator_index=row.validator_index,  # type: ignore[arg-type]
+                field=name,
+                value=value,
+                baseline=baseline,
+                expected=mean,
+                deviation=difference / std
+                if std
+                else math.copysign(math.inf, difference),
+                hour=row.hour,
+                day=row.day,
+            )
+        ]
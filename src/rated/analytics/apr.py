@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, List, Mapping, Sequence, Tuple
+
+from rated.analytics.columns import Columns, factorize, group_sums, take, to_columns
+from rated.analytics.effectiveness import Batch, Labels, label_rows
+from rated.ethereum.datatypes import OperatorApr, ValidatorAPR
+from rated.ethereum.enums import AprType, IdType, TimeWindow
+
+# Stake of an active validator, in gwei like the rewards
+STAKE_PER_VALIDATOR: int = 32 * 10**9
+
+DAYS_PER_YEAR: int = 365
+
+# Days covered by every time window, None for all time
+WINDOW_DAYS: Dict[TimeWindow, int | None] = {
+    TimeWindow.ONE_DAY: 1,
+    TimeWindow.SEVEN_DAYS: 7,
+    TimeWindow.THIRTY_DAYS: 30,
+    TimeWindow.ALL_TIME: None,
+}
+
+# Effectiveness columns APR is computed from
+APR_COLUMNS: Tuple[str, ...] = (
+    "validator_index",
+    "day",
+    "sum_all_rewards",
+    "sum_priority_fees",
+    "sum_baseline_mev",
+)
+
+
+def validator_apr(
+    batch: Batch,
+    *,
+    time_window: TimeWindow = TimeWindow.ALL_TIME,
+) -> Dict[int, ValidatorAPR]:
+    """
+    Backward-looking APR of every validator, from daily effectiveness rows rather than one request per validator
+
+    Examples:
+        >>> from rated import Rated
+        >>> from rated.analytics.apr import validator_apr
+        >>> from rated.ethereum import MAINNET
+        >>> from rated.ethereum.enums import TimeWindow
+        >>>
+        >>> RATED_KEY = "ey..."
+        >>> r = Rated(RATED_KEY)
+        >>> eth = r.ethereum(network=MAINNET)
+        >>> rows = eth.validators.effectiveness_backfill(indices=range(1000, 2000), from_day=1000, to_day=1029)
+        >>> for index, apr in validator_apr(rows, time_window=TimeWindow.THIRTY_DAYS).items():
+        >>>     print(f"{index = }, {apr.percentage = }%")
+
+    Args:
+        batch: Daily effectiveness rows, or columns of them
+        time_window: Number of most recent days to compute APR over
+
+    Returns:
+        The APR of every validator, like `Validator.apr` returns it
+    """
+    columns = _window(batch, time_window)
+    indices = columns["validator_index"]
+    aprs = _apr(columns, range(len(indices)), list(indices))
+    return {
+        index: ValidatorAPR(
+            id_type="validator",
+            time_window=time_window.value,
+            apr_type=AprType.BACKWARD.value,
+            id=index,
+            **values,
+        )
+        for index, values in aprs.items()
+    }
+
+
+def group_apr(
+    batch: Batch,
+    labels: Labels,
+    *,
+    time_window: TimeWindow = TimeWindow.ALL_TIME,
+    id_type: IdType | str = "custom",
+) -> Dict[Hashable, OperatorApr]:
+    """
+    Backward-looking APR of groups of validators, such as operators or any custom grouping, computed locally
+
+    Rewards of a group are annualized over its average active stake, counting 32 ETH for every validator with a row
+    for a day, averaged over the days the rows span within the time window. Execution rewards are priority fees and baseline MEV, and consensus rewards the remainder of all
+    rewards.
+
+    Examples:
+        >>> from rated import Rated
+        >>> from rated.analytics.apr import group_apr
+        >>> from rated.analytics.effectiveness import operator_labels
+        >>> from rated.ethereum import MAINNET
+        >>> from rated.ethereum.enums import IdType, TimeWindow
+        >>> from rated.ethereum.registry import ValidatorRegistry
+        >>>
+        >>> RATED_KEY = "ey..."
+        >>> r = Rated(RATED_KEY)
+        >>> eth = r.ethereum(network=MAINNET)
+        >>> registry = ValidatorRegistry("registry.db")
+        >>> metadata = list(registry.by_pool("Lido"))
+        >>> rows = eth.validators.effectiveness_backfill(
+        >>>     indices=[m.validator_index for m in metadata], from_day=1000, to_day=1006
+        >>> )
+        >>> aprs = group_apr(rows, operator_labels(metadata), time_window=TimeWindow.SEVEN_DAYS, id_type=IdType.NODE_OPERATOR)
+        >>> for operator, apr in aprs.items():
+        >>>     print(f"{operator = }, {apr.percentage = }%, {apr.active_validators = }")
+
+    Args:
+        batch: Daily effectiveness rows, or columns of them
+        labels: Label of every validator index, e.g. its operator or pool; validators without a label are left out
+        time_window: Number of most recent days to compute APR over
+        id_type: Type of the labels, to tag the results with
+
+    Returns:
+        The APR of every label, like `Operator.apr` returns it
+    """
+    columns = _window(batch, time_window)
+    rows, row_labels = label_rows(columns["validator_index"], labels)
+    aprs = _apr(columns, rows, row_labels)
+    id_type = id_type.value if isinstance(id_type, IdType) else id_type
+    return {
+        label: OperatorApr(
+            id=label,
+            id_type=id_type,
+            time_window=time_window.value,
+            apr_type=AprType.BACKWARD.value,
+            **values,
+        )
+        for label, values in aprs.items()
+    }
+
+
+def _window(batch: Batch, time_window: TimeWindow) -> Columns:
+    """Columns of the rows within the most recent days of a time window"""
+    columns: Columns = (
+        batch if isinstance(batch, Mapping) else to_columns(batch, APR_COLUMNS)
+    )
+    days: Sequence[Any] = columns["day"]
+    window = WINDOW_DAYS[time_window]
+    if window is None or not len(days):
+        return columns
+
+    first_day = max(days) - window + 1
+    kept = [r for r, day in enumerate(days) if day >= first_day]
+    return {name: take(values, kept) for name, values in columns.items()}
+
+
+def _apr(
+    columns: Columns,
+    rows: Sequence[int],
+    row_labels: List[Any],
+) -> Dict[Any, Dict[str, Any]]:
+    if not rows:
+        return {}
+    # Stake is averaged over the days the rows span, which may be fewer than the window when history is short
+    days: Sequence[Any] = columns["day"]
+    day_count = max(days) - min(days) + 1
+
+    group_ids, groups = factorize(row_labels)
+
+    def sums(name: str) -> List[Any]:
+        return group_sums(take(columns[name], rows), group_ids, len(groups))
+
+    validator_days: List[Any] = group_sums([1] * len(rows), group_ids, len(groups))
+    all_rewards, fees, mev = (
+        sums("sum_all_rewards"),
+        sums("sum_priority_fees"),
+        sums("sum_baseline_mev"),
+    )
+
+    result: Dict[Any, Dict[str, Any]] = {}
+    for group, label in enumerate(groups):
+        # Stake held over the window, in gwei-days, which a year of rewards is compared to
+        stake_days = validator_days[group] * STAKE_PER_VALIDATOR
+        execution = (fees[group] or 0) + (mev[group] or 0)
+        consensus = (all_rewards[group] or 0) - execution
+        scale = 100 * DAYS_PER_YEAR / stake_days
+        active_validators = validator_days[group] / day_count
+        result[label] = {
+            "percentage": (consensus + execution) * scale,
+            "percentage_consensus": consensus * scale,
+            "percentage_execution": execution * scale,
+            "active_stake": active_validators * STAKE_PER_VALIDATOR,
+            "active_validators": round(active_validators),
+        }
+    return result
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from array import array
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, cast
+
+from rated.analytics.blocks import (
+    BLOCK_METRICS,
+    BlockTotals,
+    block_columns,
+    group_totals,
+)
+from rated.analytics.columns import HAS_NUMPY, np
+from rated.ethereum.datatypes import Block, SlotBlock, ValidatorMetadata
+
+DEFAULT_PAGE_SIZE: int = 10_000
+
+
+class ValidatorLabels:
+    """
+    Labels of validators, such as their node operators or pool, kept in an array addressed by validator index
+
+    Validators sharing the same labels share a combination of labels, so that the array holds a single number per
+    validator whatever the number of labels.
+    """
+
+    def __init__(
+        self,
+        metadata: Iterable[ValidatorMetadata],
+        *,
+        field: str = "node_operators",
+    ) -> None:
+        """
+        Initialize labels from a stream of validator metadata, keeping none of the metadata itself
+
+        Examples:
+            >>> from rated.analytics.attribution import ValidatorLabels
+            >>> from rated.ethereum.registry import ValidatorRegistry
+            >>>
+            >>> registry = ValidatorRegistry("registry.db")
+            >>> operators = ValidatorLabels(registry.by_pool("Lido"), field="node_operators")
+
+        Args:
+            metadata: Validator metadata
+            field: Attribute of the metadata to label validators with, holding either a label or a list of them;
+                validators without any are left unlabeled
+        """
+        self.field = field
+        # The combination of labels of every validator index, -1 when unlabeled
+        self._combinations = array("i")
+        self._combination_ids: Dict[Tuple[str, ...], int] = {}
+
+        for m in metadata:
+            value = getattr(m, field)
+            labels = tuple(value) if isinstance(value, list) else (value,)
+            labels = tuple(label for label in labels if label is not None)
+            if not labels:
+                continue
+
+            combination = self._combination_ids.setdefault(
+                labels, len(self._combination_ids)
+            )
+            index = m.validator_index
+            if index >= len(self._combinations):
+                self._combinations.extend([-1] * (index + 1 - len(self._combinations)))
+            self._combinations[index] = combination
+
+    def __len__(self) -> int:
+        return sum(1 for c in self._combinations if c >= 0)
+
+    @property
+    def combinations(self) -> List[Tuple[str, ...]]:
+        """Distinct combinations of labels, in order of first appearance"""
+        return list(self._combination_ids)
+
+    def of(self, validator_index: int) -> Tuple[str, ...]:
+        """
+        Labels of a validator
+
+        Args:
+            validator_index: Validator index
+
+        Returns:
+            The labels of the validator, empty if it has none
+        """
+        combination = self._lookup_one(validator_index)
+        return () if combination < 0 else self.combinations[combination]
+
+    def lookup(
+        self,
+        validator_indices: Sequence[int],
+        *,
+        missing: int = -1,
+    ) -> Sequence[int]:
+        """
+        Probe the array for many validators at once
+
+        Args:
+            validator_indices: Validator indices
+            missing: What to return for unlabeled validators
+
+        Returns:
+            The combination of labels of every validator, as a position in `combinations`, or `missing`
+        """
+        if not HAS_NUMPY:
+            looked_up = (self._lookup_one(i) for i in validator_indices)
+            return [missing if c < 0 else c for c in looked_up]
+
+        combinations = np.frombuffer(self._combinations, dtype=np.int32)
+        indices = np.asarray(validator_indices, dtype=np.int64)
+        known = (indices >= 0) & (indices < len(combinations))
+        found = np.full(len(indices), -1, dtype=np.int32)
+        found[known] = combinations[indices[known]]
+        return cast(Sequence[int], np.where(found < 0, missing, found))
+
+    def _lookup_one(self, validator_index: int) -> int:
+        if 0 <= validator_index < len(self._combinations):
+            return self._combinations[validator_index]
+        return -1
+
+
+def attribute(
+    blocks: Iterable[Block | SlotBlock],
+    labels: ValidatorLabels,
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Dict[str | None, BlockTotals]:
+    """
+    Attribute block rewards to the labels of their proposers, e.g. to node operators or pools
+
+    Blocks are joined with the labels one page at a time, so that neither the blocks nor the metadata are held in
+    memory. A block whose proposer has several labels counts in full towards each of them, and blocks of unlabeled
+    proposers are attributed to None.
+
+    Examples:
+        >>> from rated import Rated
+        >>> from rated.analytics.attribution import ValidatorLabels, attribute
+        >>> from rated.ethereum import MAINNET
+        >>> from rated.ethereum.registry import ValidatorRegistry
+        >>>
+        >>> RATED_KEY = "ey..."
+        >>> r = Rated(RATED_KEY)
+        >>> eth = r.ethereum(network=MAINNET)
+        >>> registry = ValidatorRegistry("registry.db")
+        >>> operators = ValidatorLabels(registry.by_pool("Lido"))
+        >>> blocks = eth.blocks.range(8_000_000, 8_225_000)
+        >>> for operator, totals in attribute(blocks, operators).items():
+        >>>     print(f"{operator = }, {totals.total_rewards = }, {totals.missed_execution_rewards = }")
+
+    Args:
+        blocks: Stream of blocks, or of slots as returned by `Blocks.range`, of which missed slots are left out
+        labels: Labels of the validators
+        page_size: Number of blocks joined at once
+
+    Returns:
+        The totals of the blocks of every label
+
+    Raises:
+        Exception: The error of the first slot that could not be fetched, since the rewards of the other labels and
+            every share would be off without it
+    """
+    names = [*BLOCK_METRICS, "consensus_proposer_duty", "validator_index"]
+    # Blocks of unlabeled proposers are grouped last
+    group_count = len(labels.combinations) + 1
+    totals: Dict[str, List[Any]] = {}
+
+    blocks = iter(blocks)
+    while True:
+        page = list(islice(blocks, page_size))
+        if not page:
+            break
+        columns = block_columns(page, names)
+        group_ids = labels.lookup(columns["validator_index"], missing=group_count - 1)
+        for name, values in group_totals(columns, group_ids, group_count).items():
+            totals[name] = (
+                [_nullable_add(a, b) for a, b in zip(totals[name], values)]
+                if name in totals
+                else values
+            )
+
+    if not totals:
+        return {}
+
+    # Spread the totals of every combination over its labels
+    groups: List[Tuple[str | None, ...]] = [*labels.combinations, (None,)]
+    by_label: Dict[str | None, Dict[str, Any]] = {}
+    for group, group_labels in enumerate(groups):
+        if not totals["blocks"][group]:
+            continue
+        for label in group_labels:
+            current = by_label.setdefault(label, {})
+            for name, values in totals.items():
+                current[name] = _nullable_add(current.get(name), values[group])
+
+    block_count = sum(b or 0 for b in totals["blocks"])
+    return {
+        label: BlockTotals(share=values["blocks"] / block_count, **values)
+        for label, values in by_label.items()
+    }
+
+
+def _nullable_add(a: Any, b: Any) -> Any:
+    return b if a is None else a if b is None else a + b
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from rated.analytics.columns import factorize_columns, group_sums, repeat_rows, take
+from rated.ethereum.datatypes import Block, SlotBlock
+from rated.ethereum.enums import SlotStatus
+
+# Block amounts and counters summed in breakdowns
+BLOCK_METRICS: Tuple[str, ...] = (
+    "total_priority_fees",
+    "baseline_mev",
+    "execution_rewards",
+    "missed_execution_rewards",
+    "consensus_rewards",
+    "missed_consensus_rewards",
+    "total_rewards",
+    "total_rewards_missed",
+    "total_burnt_fees",
+    "total_gas_used",
+    "total_transactions",
+)
+
+# Block fields holding lists, such as the relays a block was delivered by
+LIST_FIELDS: Tuple[str, ...] = ("relays", "block_builder_pubkeys")
+
+# A batch of blocks, either as rows, as slots from `Blocks.range`, or as columns
+BlockBatch = Union[Iterable[Union[Block, SlotBlock]], Mapping[str, Sequence[Any]]]
+
+
+@dataclass
+class BlockTotals:
+    """Totals of a group of blocks"""
+
+    blocks: int
+    missed_blocks: int
+    share: float
+    total_priority_fees: int | None = None
+    baseline_mev: int | None = None
+    execution_rewards: int | None = None
+    missed_execution_rewards: int | None = None
+    consensus_rewards: int | None = None
+    missed_consensus_rewards: float | None = None
+    total_rewards: int | None = None
+    total_rewards_missed: float | None = None
+    total_burnt_fees: int | None = None
+    total_gas_used: int | None = None
+    total_transactions: int | None = None
+
+    @property
+    def mev_share(self) -> float | None:
+        """Share of MEV in the execution rewards, i.e. baseline MEV over baseline MEV and priority fees"""
+        mev, fees = self.baseline_mev or 0, self.total_priority_fees or 0
+        if mev + fees <= 0:
+            return None
+        return mev / (mev + fees)
+
+
+def block_columns(
+    blocks: Iterable[Block | SlotBlock],
+    names: Sequence[str] | None = None,
+) -> Dict[str, List[Any]]:
+    """
+    Turn blocks into columns
+
+    Args:
+        blocks: Blocks, or slots as returned by `Blocks.range`, of which missed slots are left out
+        names: Names of the columns to keep; defaults to every field
+
+    Returns:
+        The values of every column, in block order
+
+    Raises:
+        Exception: The error of the first slot that could not be fetched, so that totals are never computed over
+            part of a range
+    """
+    names = [f.name for f in fields(Block)] if names is None else names
+    rows = list(_unwrap(blocks))
+    return {name: [getattr(block, name) for block in rows] for name in names}
+
+
+def explode(values: Sequence[Sequence[Any] | None]) -> Tuple[Sequence[int], List[Any]]:
+    """
+    Flatten a column of lists into one row per entry
+
+    A block without any entry, e.g. built locally rather than delivered by a relay, is kept as a single null entry.
+
+    Args:
+        values: A list for every row
+
+    Returns:
+        The row every entry comes from, and the entries
+    """
+    entries: List[Any] = []
+    for value in values:
+        if value:
+            entries.extend(value)
+        else:
+            entries.append(None)
+    return repeat_rows([len(value) if value else 1 for value in values]), entries
+
+
+def breakdown(
+    batch: BlockBatch,
+    *,
+    by: Sequence[str],
+) -> Dict[Tuple[Hashable, ...], BlockTotals]:
+    """
+    Break block rewards and counters down by one or more fields
+
+    Lists such as `relays` are exploded, so that a block counts towards each of its entries; shares of blocks may
+    then add up to more than 1. Runs vectorized when NumPy is available, except for walking the lists and numbering
+    keys other than integer arrays, such as relays or fee recipients, which hashes them one by one.
+
+    Examples:
+        >>> from rated import Rated
+        >>> from rated.analytics.blocks import breakdown
+        >>> from rated.ethereum import MAINNET
+        >>>
+        >>> RATED_KEY = "ey..."
+        >>> r = Rated(RATED_KEY)
+        >>> eth = r.ethereum(network=MAINNET)
+        >>> blocks = eth.blocks.range(8_000_000, 8_007_200)
+        >>> for (relay, epoch), totals in breakdown(blocks, by=("relays", "epoch")).items():
+        >>>     print(f"{relay = }, {epoch = }, {totals.share = }, {totals.mev_share = }")
+
+    Args:
+        batch: Blocks, slots as returned by `Blocks.range`, or columns of blocks
+        by: Fields to group blocks by, e.g. `relays`, `block_builder_pubkeys`, `fee_recipient` or `epoch`
+
+    Returns:
+        The totals of every group, keyed by the values of the `by` fields
+
+    Raises:
+        Exception: The error of the first slot that could not be fetched
+    """
+    names = set(BLOCK_METRICS) | set(by) | {"consensus_proposer_duty"}
+    columns: Mapping[str, Sequence[Any]] = (
+        batch if isinstance(batch, Mapping) else block_columns(batch, sorted(names))
+    )
+    block_count = len(next(iter(columns.values()), []))
+
+    # Positions of the blocks behind every row, after exploding lists
+    rows: Sequence[int] = repeat_rows([1] * block_count)
+    keys: List[Sequence[Any]] = []
+    for name in by:
+        values = take(columns[name], rows)
+        if name in LIST_FIELDS:
+            exploded, entries = explode(values)
+            rows = take(rows, exploded)
+            keys = [take(k, exploded) for k in keys]
+            values = entries
+        keys.append(values)
+
+    group_ids, groups = factorize_columns(keys, len(rows))
+    group_count = len(groups)
+
+    picked = {
+        name: take(columns[name], rows)
+        for name in (*BLOCK_METRICS, "consensus_proposer_duty")
+        if name in columns
+    }
+    totals = group_totals(picked, group_ids, group_count)
+
+    result: Dict[Tuple[Hashable, ...], BlockTotals] = {}
+    for group, key in enumerate(groups):
+        group_values = {name: column[group] for name, column in totals.items()}
+        result[key] = BlockTotals(
+            share=group_values["blocks"] / block_count, **group_values
+        )
+    return result
+
+
+def group_totals(
+    columns: Mapping[str, Sequence[Any]],
+    group_ids: Sequence[int],
+    group_count: int,
+) -> Dict[str, List[Any]]:
+    """
+    Count the blocks of every group, and sum their amounts and counters
+
+    Args:
+        columns: Block columns, of which the proposer duties and `BLOCK_METRICS` are used
+        group_ids: The group of every block, numbered from 0
+        group_count: Number of groups
+
+    Returns:
+        The number of blocks and missed blocks of every group, along with the sum of every metric found in the
+        columns
+    """
+    block_count = len(group_ids)
+    duties = columns.get("consensus_proposer_duty")
+    missed = (
+        [0] * block_count
+        if duties is None
+        else [1 if duty == SlotStatus.MISSED.value else 0 for duty in duties]
+    )
+
+    totals: Dict[str, List[Any]] = {
+        "blocks": group_sums([1] * block_count, group_ids, group_count),
+        "missed_blocks": group_sums(missed, group_ids, group_count),
+    }
+    for name in BLOCK_METRICS:
+        if name in columns:
+            totals[name] = group_sums(columns[name], group_ids, group_count)
+    return totals
+
+
+def by_relay(batch: BlockBatch) -> Dict[str | None, BlockTotals]:
+    """
+    Break blocks down by relay, with locally built blocks under None
+
+    Args:
+        batch: Blocks, or columns of them
+
+    Returns:
+        The totals of every relay
+    """
+    return _by_one(batch, "relays")
+
+
+def by_builder(batch: BlockBatch) -> Dict[str | None, BlockTotals]:
+    """
+    Break blocks down by block builder public key, with locally built blocks under None
+
+    Args:
+        batch: Blocks, or columns of them
+
+    Returns:
+        The totals of every builder
+    """
+    return _by_one(batch, "block_builder_pubkeys")
+
+
+def by_fee_recipient(batch: BlockBatch) -> Dict[str | None, BlockTotals]:
+    """
+    Break blocks down by fee recipient
+
+    Args:
+        batch: Blocks, or columns of them
+
+    Returns:
+        The totals of every fee recipient
+    """
+    return _by_one(batch, "fee_recipient")
+
+
+def by_epoch(batch: BlockBatch) -> Dict[int, BlockTotals]:
+    """
+    Break blocks down by epoch
+
+    Args:
+        batch: Blocks, or columns of them
+
+    Returns:
+        The totals of every epoch
+    """
+    return _by_one(batch, "epoch")
+
+
+def _by_one(batch: BlockBatch, name: str) -> Dict[Any, BlockTotals]:
+    return {key[0]: totals for key, totals in breakdown(batch, by=(name,)).items()}
+
+
+def _unwrap(blocks: Iterable[Block | SlotBlock]) -> Iterator[Block]:
+    for item in blocks:
+        if isinstance(item, SlotBlock):
+            if item.status == SlotStatus.ERROR:
+                raise item.error or ValueError(f"Slot {item.slot} could not be fetched")
+            if item.block is not None:
+                yield item.block
+        else:
+            yield item
@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import math
+from dataclasses import fields
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+from rated.ethereum.aggregation import (
+    SUMMED_FIELDS,
+    WEIGHTED_FIELDS,
+    nullable_sum,
+    weighted_mean,
+)
+from rated.ethereum.datatypes import ValidatorEffectiveness
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+# Whether aggregations run vectorized with NumPy, or fall back to plain Python
+HAS_NUMPY: bool = np is not None
+
+# Effectiveness metrics combined when aggregating rows
+METRIC_FIELDS: Tuple[str, ...] = SUMMED_FIELDS + tuple(WEIGHTED_FIELDS)
+
+# Metrics holding whole numbers, which are summed exactly
+INTEGER_FIELDS: Tuple[str, ...] = tuple(
+    f.name for f in fields(ValidatorEffectiveness) if str(f.type).startswith("int")
+)
+
+Value = Optional[Union[int, float]]
+Columns = Mapping[str, Sequence[Value]]
+
+
+def to_columns(
+    rows: Iterable[ValidatorEffectiveness],
+    names: Sequence[str] | None = None,
+) -> Dict[str, List[Any]]:
+    """
+    Turn effectiveness rows into columns
+
+    Args:
+        rows: Effectiveness rows
+        names: Names of the columns to keep; defaults to every field
+
+    Returns:
+        The values of every column, in row order
+    """
+    names = [f.name for f in fields(ValidatorEffectiveness)] if names is None else names
+    rows = list(rows)
+    return {name: [getattr(row, name) for row in rows] for name in names}
+
+
+def factorize(keys: Iterable[Hashable]) -> Tuple[List[int], List[Hashable]]:
+    """
+    Number the distinct keys in order of first appearance
+
+    Args:
+        keys: A group key for every row
+
+    Returns:
+        The group number of every row, and the key of every group
+    """
+    numbers: Dict[Hashable, int] = {}
+    group_ids = [numbers.setdefault(key, len(numbers)) for key in keys]
+    return group_ids, list(numbers)
+
+
+def factorize_columns(
+    keys: Sequence[Sequence[Hashable]],
+    row_count: int,
+) -> Tuple[Sequence[int], List[Tuple[Hashable, ...]]]:
+    """
+    Number the distinct combinations of several key columns in order of first appearance
+
+    Every column is numbered on its own, with NumPy for integer arrays and by hashing otherwise, after which the
+    combinations of numbers are numbered at once. Runs vectorized when NumPy is available.
+
+    Args:
+        keys: The values of every key column, as lists or NumPy arrays
+        row_count: Number of rows, needed when there are no key columns
+
+    Returns:
+        The group number of every row, and the key of every group
+    """
+    if not HAS_NUMPY or row_count == 0:
+        group_ids, distinct = factorize(zip(*keys) if keys else [()] * row_count)
+        return group_ids, [cast(Tuple[Hashable, ...], key) for key in distinct]
+
+    codes = []
+    uniques: List[List[Any]] = []
+    for column in keys:
+        if isinstance(column, np.ndarray) and column.dtype.kind in "biu":
+            values, inverse = np.unique(column, return_inverse=True)
+            codes.append(inverse.reshape(-1))
+            uniques.append(values.tolist())
+        else:
+            ids, distinct = factorize(column)
+            codes.append(np.asarray(ids, dtype=np.intp))
+            uniques.append(distinct)
+
+    if not codes:
+        return cast(Sequence[int], np.zeros(row_count, dtype=np.intp)), [()]
+    combined, first, inverse = np.unique(
+        np.stack(codes, axis=1), axis=0, return_index=True, return_inverse=True
+    )
+    # Renumber the groups from sorted order to order of first appearance
+    order = np.argsort(first, kind="stable")
+    renumber = np.empty_like(order)
+    renumber[order] = np.arange(len(order))
+    groups = [
+        tuple(values[code] for values, code in zip(uniques, combined[group].tolist()))
+        for group in order.tolist()
+    ]
+    return cast(Sequence[int], renumber[inverse.reshape(-1)]), groups
+
+
+def repeat_rows(counts: Sequence[int]) -> Sequence[int]:
+    """
+    List the positions of rows, each repeated a number of times
+
+    Runs vectorized when NumPy is available.
+
+    Args:
+        counts: How many times every row is repeated
+
+    Returns:
+        The position of every repeated row, in row order
+    """
+    if HAS_NUMPY:
+        return cast(Sequence[int], np.repeat(np.arange(len(counts)), counts))
+    return [row for row, count in enumerate(counts) for _ in range(count)]
+
+
+def take(values: Sequence[Any], rows: Sequence[int]) -> Sequence[Any]:
+    """
+    Pick rows of a column, possibly repeating them
+
+    Args:
+        values: The values of a column, as a list or a NumPy array
+        rows: Positions of the rows to pick, in order
+
+    Returns:
+        The picked values, of the same kind as the column
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        return values[np.asarray(rows, dtype=np.intp)]
+    return [values[r] for r in rows]
+
+
+def group_sums(
+    values: Sequence[Value],
+    group_ids: Sequence[int],
+    group_count: int,
+    *,
+    exact: bool = True,
+) -> List[Value]:
+    """
+    Sum the values of the rows of every group
+
+    Whole numbers are summed exactly, however large the totals. Null values are ignored, and a group whose values
+    are all null sums to null. Runs vectorized when NumPy is available.
+
+    Args:
+        values: A value for every row
+        group_ids: The group of every row, numbered from 0
+        group_count: Number of groups
+        exact: Whether whole numbers are summed exactly rather than as floats
+
+    Returns:
+        The sum of every group
+    """
+    if HAS_NUMPY:
+        try:
+            groups = np.asarray(group_ids, dtype=np.intp)
+            return _group_sums_numpy(values, groups, group_count, exact)
+        except OverflowError:
+            # Values beyond 64 bits are summed in plain Python instead
+            pass
+
+    sums: List[Value] = [None] * group_count
+    for value, group in zip(values, group_ids):
+        if value is not None and not _is_nan(value):
+            total = sums[group]
+            sums[group] = value if total is None else total + value
+    return sums
+
+
+def aggregate_columns(
+    columns: Columns,
+    group_ids: Sequence[int],
+    group_count: int,
+) -> Dict[str, List[Value]]:
+    """
+    Combine the effectiveness metrics of the rows of every group
+
+    Follows the same rules as the Rated API when it groups rows by time window: counters and amounts are summed,
+    while averages are weighted by the counter they were computed over, e.g. `uptime` by
+    `total_attestation_assignments`. Null values are ignored, and a metric that is null for every row of a group is
+    null for the group. Runs vectorized when NumPy is available.
+
+    Args:
+        columns: Effectiveness metrics, along with the counters averages are weighted by
+        group_ids: The group of every row, numbered from 0
+        group_count: Number of groups
+
+    Returns:
+        The combined value of every metric found in the columns, for every group
+    """
+    if HAS_NUMPY:
+        try:
+            return _aggregate_numpy(columns, group_ids, group_count)
+        except OverflowError:
+            # Amounts beyond 64 bits are summed exactly in plain Python instead
+            pass
+    return _aggregate_python(columns, group_ids, group_count)
+
+
+def _aggregate_python(
+    columns: Columns,
+    group_ids: Sequence[int],
+    group_count: int,
+) -> Dict[str, List[Value]]:
+    members: List[List[int]] = [[] for _ in range(group_count)]
+    for row, group in enumerate(group_ids):
+        members[group].append(row)
+
+    result: Dict[str, List[Value]] = {}
+    for name in SUMMED_FIELDS:
+        if name in columns:
+            values = columns[name]
+            result[name] = [nullable_sum(values[r] for r in rows) for rows in members]
+    for name, weight in WEIGHTED_FIELDS.items():
+        if name in columns:
+            values = columns[name]
+            weights = columns.get(weight) or [None] * len(group_ids)
+            result[name] = [
+                weighted_mean((values[r], weights[r]) for r in rows) for rows in members
+            ]
+    return result
+
+
+def _aggregate_numpy(
+    columns: Columns,
+    group_ids: Sequence[int],
+    group_count: int,
+) -> Dict[str, List[Value]]:
+    groups = np.asarray(group_ids, dtype=np.intp)
+    result: Dict[str, List[Value]] = {}
+
+    for name in SUMMED_FIELDS:
+        if name in columns:
+            result[name] = _group_sums_numpy(
+                columns[name], groups, group_count, name in INTEGER_FIELDS
+            )
+
+    for name, weight in WEIGHTED_FIELDS.items():
+        if name not in columns:
+            continue
+        values, present = _column(columns[name])
+        if weight in columns:
+            weights, _ = _column(columns[weight])
+            weights = np.where(present, weights, 0.0)
+        else:
+            weights = np.zeros(len(groups))
+        counts = np.bincount(groups[present], minlength=group_count)
+        total_weight = np.bincount(groups, weights=weights, minlength=group_count)
+        weighted = np.bincount(groups, weights=values * weights, minlength=group_count)
+        plain = np.bincount(groups, weights=values, minlength=group_count)
+
+        means = np.divide(plain, counts, out=np.zeros(group_count), where=counts > 0)
+        np.divide(weighted, total_weight, out=means, where=total_weight > 0)
+        result[name] = _nullable(means, counts > 0)
+
+    return result
+
+
+def _group_sums_numpy(
+    values: Sequence[Value],
+    groups: Any,
+    group_count: int,
+    exact: bool,
+) -> List[Value]:
+    filled, present = _column(values, exact=exact)
+    counts = np.bincount(groups[present], minlength=group_count)
+    if filled.dtype != np.int64:
+        sums = np.bincount(groups, weights=filled, minlength=group_count)
+        return _nullable(sums, counts > 0)
+
+    # The high and low 32 bits are summed apart, so that totals cannot wrap around 64 bits
+    high = np.zeros(group_count, dtype=np.int64)
+    low = np.zeros(group_count, dtype=np.int64)
+    np.add.at(high, groups, filled >> 32)
+    np.add.at(low, groups, filled & 0xFFFFFFFF)
+    totals = [(h << 32) + lo for h, lo in zip(high.tolist(), low.tolist())]
+    return [t if c else None for t, c in zip(totals, counts.tolist())]
+
+
+def _column(values: Sequence[Value], *, exact: bool = False) -> Tuple[Any, Any]:
+    """Values with nulls replaced by zeros, and whether every value is present"""
+    if np is not None and isinstance(values, np.ndarray):
+        present = (
+            ~np.isnan(values)
+            if values.dtype.kind == "f"
+            else np.ones(len(values), dtype=bool)
+        )
+        return np.nan_to_num(values, nan=0.0), present
+
+    present = np.fromiter(
+        (v is not None and not _is_nan(v) for v in values),
+        dtype=bool,
+        count=len(values),
+    )
+    dtype = (
+        np.int64
+        if exact and all(isinstance(v, int) for v in values if v is not None)
+        else np.float64
+    )
+    filled = np.fromiter(
+        (v if p else 0 for v, p in zip(values, present)), dtype=dtype, count=len(values)
+    )
+    return filled, present
+
+
+def _nullable(values: Any, present: Any) -> List[Value]:
+    return [v if p else None for v, p in zip(values.tolist(), present.tolist())]
+
+
+def _is_nan(value: Value) -> bool:
+    """Whether a value is NaN, which stands for null in float columns"""
+    return isinstance(value, float) and math.isnan(value)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Union
+
+from rated.analytics.streaming import Aggregator, Field
+
+# Share of the total the largest entities must exceed for the Nakamoto coefficient, e.g. to halt finality
+NAKAMOTO_THRESHOLD: float = 1 / 3
+
+# What snapshots are told apart by: an attribute name, or a function of the item
+SnapshotKey = Union[str, Callable[[Any], Hashable]]
+
+
+class Concentration(Aggregator):
+    """
+    How concentrated a distribution is among entities, such as validators among countries, hosting providers, pools
+    or operators
+
+    Every item is one entity, and its value the entity's size: a share, a stake or a validator count. Unlike other
+    aggregators, its memory is not constant but O(entities), as one value is kept per entity; all metrics are
+    computed at once, over a single sort of the values, and kept until the next update.
+    """
+
+    def __init__(
+        self,
+        field: Field = None,
+        *,
+        total: float | None = None,
+        threshold: float = NAKAMOTO_THRESHOLD,
+    ) -> None:
+        """
+        Initialize concentration metrics
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.analytics.concentration import Concentration
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> hosting = Concentration("validator_share", total=1)
+            >>> hosting.update(eth.p2p.hosting_provider_distribution(size=100, follow_next=True))
+            >>> print(f"{hosting.hhi = }, {hosting.nakamoto = }")
+
+        Args:
+            field: Attribute of the items holding their size, a function of the item, or None for items that are sizes
+                themselves
+            total: Size of the whole population, e.g. 1 for shares, when the items only cover part of it; defaults
+                to the sum of the sizes seen
+            threshold: Share of the total the largest entities must exceed for the Nakamoto coefficient
+        """
+        super().__init__(field)
+        self.total = total
+        self.threshold = threshold
+        self.values: List[float] = []
+        self._stats: Dict[str, Any] | None = None
+
+    @property
+    def count(self) -> int:
+        """Number of entities"""
+        return len(self.values)
+
+    @property
+    def gini(self) -> float | None:
+        """Gini coefficient of the sizes, from 0 when all entities are equal to nearly 1 when one holds everything"""
+        return self.result["gini"]
+
+    @property
+    def hhi(self) -> float | None:
+        """Herfindahl-Hirschman index, the sum of squared shares, between 0 and 1"""
+        return self.result["hhi"]
+
+    @property
+    def entropy(self) -> float | None:
+        """Shannon entropy of the shares, in bits; higher is more spread out"""
+        return self.result["entropy"]
+
+    @property
+    def nakamoto(self) -> int | None:
+        """
+        Nakamoto coefficient: the least number of entities that together hold more than the threshold of the total,
+        or None if all of them together do not
+        """
+        return self.result["nakamoto"]
+
+    @property
+    def result(self) -> Dict[str, Any]:
+        if self._stats is None:
+            self._stats = self._compute()
+        return dict(self._stats)
+
+    def _compute(self) -> Dict[str, Any]:
+        ordered = sorted(self.values)
+        n, size = len(ordered), sum(ordered)
+        total = size if self.total is None else self.total
+        stats: Dict[str, Any] = {
+            "count": n,
+            "gini": None,
+            "hhi": None,
+            "entropy": None,
+            "nakamoto": None,
+        }
+        if n and size:
+            weighted = sum((i + 1) * value for i, value in enumerate(ordered))
+            stats["gini"] = 2 * weighted / (n * size) - (n + 1) / n
+        if not total:
+            return stats
+
+        shares = [value / total for value in ordered]
+        stats["hhi"] = sum(share * share for share in shares)
+        stats["entropy"] = -sum(
+            share * math.log2(share) for share in shares if share > 0
+        )
+        held = 0.0
+        for count, value in enumerate(reversed(ordered), start=1):
+            held += value
+            if held > self.threshold * total:
+                stats["nakamoto"] = count
+                break
+        return stats
+
+    def _add(self, value: float) -> None:
+        self.values.append(value)
+        self._stats = None
+
+    def _merge(self, other: Concentration) -> None:
+        self.values.extend(other.values)
+        self._stats = None
+
+
+def concentration_by_snapshot(
+    items: Iterable[Any],
+    *,
+    by: SnapshotKey,
+    field: Field = None,
+    total: float | None = None,
+    threshold: float = NAKAMOTO_THRESHOLD,
+) -> Dict[Hashable, Concentration]:
+    """
+    Concentration of every snapshot of a distribution, in a single pass over a stream mixing them
+
+    Examples:
+        >>> from rated import Rated
+        >>> from rated.analytics.concentration import concentration_by_snapshot
+        >>> from rated.ethereum import MAINNET
+        >>> from rated.ethereum.enums import TimeWindow
+        >>>
+        >>> RATED_KEY = "ey..."
+        >>> r = Rated(RATED_KEY)
+        >>> eth = r.ethereum(network=MAINNET)
+        >>> pools = [p for w in TimeWindow for p in eth.network.capacity_pool(time_window=w)]
+        >>> for window, c in concentration_by_snapshot(pools, by="time_window", field="validator_count").items():
+        >>>     print(f"{window = }, {c.gini = }, {c.nakamoto = }")
+
+    Args:
+        items: Entities of every snapshot
+        by: Attribute of the items telling snapshots apart, e.g. a time window or a day, or a function of the item
+        field: Attribute of the items holding their size, a function of the item, or None for items that are sizes
+            themselves
+        total: Size of the whole population of every snapshot, when the items only cover part of it
+        threshold: Share of the total the largest entities must exceed for the Nakamoto coefficient
+
+    Returns:
+        The concentration of every snapshot, in order of first appearance
+    """
+    snapshot_of: Callable[[Any], Hashable] = (
+        (lambda item: getattr(item, by)) if isinstance(by, str) else by
+    )
+    snapshots: Dict[Hashable, Concentration] = {}
+    for item in items:
+        snapshot = snapshot_of(item)
+        concentration = snapshots.get(snapshot)
+        if concentration is None:
+            concentration = Concentration(field, total=total, threshold=threshold)
+            snapshots[snapshot] = concentration
+        concentration.add(item)
+    return snapshots
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+from rated.analytics.columns import (
+    METRIC_FIELDS,
+    Columns,
+    aggregate_columns,
+    factorize,
+    take,
+    to_columns,
+)
+from rated.ethereum.aggregation import (
+    TIME_FIELDS,
+    WEIGHTED_FIELDS,
+    TimeKey,
+    most_recent_first,
+)
+from rated.ethereum.datatypes import ValidatorEffectiveness, ValidatorMetadata
+
+# A batch of effectiveness rows, either as rows or as columns
+Batch = Union[Iterable[ValidatorEffectiveness], Columns]
+
+# Labels of validator indices; a validator with a list of labels counts towards each of them
+Labels = Union[Mapping[int, Any], Callable[[int], Any]]
+
+
+def operator_labels(metadata: Iterable[ValidatorMetadata]) -> Dict[int, List[str]]:
+    """
+    Label validators with their node operators
+
+    Args:
+        metadata: Validator metadata
+
+    Returns:
+        The node operators of every validator index
+    """
+    return {m.validator_index: list(m.node_operators or []) for m in metadata}
+
+
+def pool_labels(metadata: Iterable[ValidatorMetadata]) -> Dict[int, str | None]:
+    """
+    Label validators with their pool
+
+    Args:
+        metadata: Validator metadata
+
+    Returns:
+        The pool of every validator index
+    """
+    return {m.validator_index: m.pool for m in metadata}
+
+
+def label_rows(
+    validator_indices: Sequence[Any],
+    labels: Labels,
+) -> Tuple[List[int], List[Any]]:
+    """
+    Label the rows of many validators, repeating rows of validators with several labels
+
+    Args:
+        validator_indices: The validator index of every row
+        labels: Label of every validator index; validators without a label are left out
+
+    Returns:
+        The position of every labeled row, and its label
+    """
+    label_of: Callable[[Any], Any] = (
+        labels.get if isinstance(labels, Mapping) else labels
+    )
+    rows: List[int] = []
+    row_labels: List[Any] = []
+    for row, index in enumerate(validator_indices):
+        label = label_of(index)
+        if label is None:
+            continue
+        for each in label if isinstance(label, list) else [label]:
+            rows.append(row)
+            row_labels.append(each)
+    return rows, row_labels
+
+
+def aggregate(
+    batch: Batch,
+    *,
+    by: Sequence[str] = ("day",),
+    labels: Labels | None = None,
+) -> Dict[Tuple[Hashable, ...], ValidatorEffectiveness]:
+    """
+    Aggregate the effectiveness of many validators by label and time
+
+    Counters and amounts are summed, while averages are weighted by the counter they were computed over, e.g.
+    `uptime` by `total_attestation_assignments`. Null values are ignored. Runs vectorized when NumPy is available.
+
+    Examples:
+        >>> from rated import Rated
+        >>> from rated.analytics.effectiveness import aggregate, operator_labels
+        >>> from rated.ethereum import MAINNET
+        >>> from rated.ethereum.registry import ValidatorRegistry
+        >>>
+        >>> RATED_KEY = "ey..."
+        >>> r = Rated(RATED_KEY)
+        >>> eth = r.ethereum(network=MAINNET)
+        >>> registry = ValidatorRegistry("registry.db")
+        >>> metadata = list(registry.by_pool("Lido"))
+        >>> rows = eth.validators.effectiveness_backfill(
+        >>>     indices=[m.validator_index for m in metadata], from_day=1000, to_day=1006
+        >>> )
+        >>> for (operator, day), row in aggregate(rows, labels=operator_labels(metadata)).items():
+        >>>     print(f"{operator = }, {day = }, {row.sum_all_rewards = }, {row.uptime = }")
+
+    Args:
+        batch: Effectiveness rows, or columns of them such as those read from an `EffectivenessStore`
+        by: Columns to group by besides the labels, e.g. `day`; empty to aggregate over the whole batch
+        labels: Label of every validator index, e.g. its operator or pool; validators without a label are left out
+
+    Returns:
+        One row per group, keyed by the label, if any, followed by the values of the `by` columns
+    """
+    columns: Columns = batch if isinstance(batch, Mapping) else to_columns(batch)
+    by_columns = [columns[name] for name in by]
+    row_count = len(next(iter(columns.values()), []))
+
+    keys: List[Tuple[Hashable, ...]] = []
+    taken: List[int] | None = None
+    if labels is None:
+        keys = [tuple(c[r] for c in by_columns) for r in range(row_count)]
+    else:
+        taken, row_labels = label_rows(columns["validator_index"], labels)
+        keys = [
+            (label, *(c[r] for c in by_columns)) for r, label in zip(taken, row_labels)
+        ]
+
+    metrics: Columns = {
+        name: values
+        for name, values in columns.items()
+        if name in METRIC_FIELDS or name in WEIGHTED_FIELDS.values()
+    }
+    if taken is not None:
+        metrics = {name: take(values, taken) for name, values in metrics.items()}
+
+    group_ids, groups = factorize(keys)
+    combined = aggregate_columns(metrics, group_ids, len(groups))
+
+    result: Dict[Tuple[Hashable, ...], ValidatorEffectiveness] = {}
+    for group, group_key in enumerate(groups):
+        key = cast(Tuple[Hashable, ...], group_key)
+        values: Dict[str, Any] = {name: combined[name][group] for name in combined}
+        values.update(zip(by, key[len(key) - len(by) :]))
+        result[key] = ValidatorEffectiveness(**values)
+    return result
+
+
+def group_by_time(batch: Batch) -> List[ValidatorEffectiveness]:
+    """
+    Aggregate the effectiveness of many validators by time window, like grouping by time with the Rated API
+
+    Args:
+        batch: Effectiveness rows, or columns of them
+
+    Returns:
+        One row per time window, most recent first like the Rated API
+    """
+    columns: Columns = batch if isinstance(batch, Mapping) else to_columns(batch)
+    by = [name for name in TIME_FIELDS if name in columns]
+    windows = aggregate(columns, by=by)
+    return [
+        windows[key]
+        for key in sorted(
+            windows, key=lambda key: most_recent_first(cast(TimeKey, key))
+        )
+    ]
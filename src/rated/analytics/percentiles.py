@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Hashable, Iterable, List, Sequence, cast
+
+from rated.analytics.columns import HAS_NUMPY, np
+from rated.analytics.streaming import Field
+from rated.ethereum.datatypes import Percentile
+
+# Percentile ranks of the tables returned by the Rated API
+TABLE_RANKS: Sequence[int] = range(1, 101)
+
+# Slack for floating point errors when turning ranks into positions, e.g. 7% of 100 values must be 7 values, not 8
+ROUNDING: float = 1e-9
+
+
+class PercentileRanks:
+    """
+    Percentile ranks of values among a population, such as the effectiveness of operators or of custom groups of them
+
+    The percentile rank of a value is the percentage of the population at or below it, so that the highest value
+    ranks 100. Values can be added as data arrives, and values keyed by entity are replaced when the entity is seen
+    again.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Any] = (),
+        *,
+        field: Field = None,
+        key: Field = None,
+    ) -> None:
+        """
+        Initialize the ranks of a population
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.analytics.percentiles import PercentileRanks
+            >>> from rated.ethereum import MAINNET
+            >>> from rated.ethereum.enums import IdType, TimeWindow
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> summaries = eth.operators.summaries(
+            >>>     time_window=TimeWindow.THIRTY_DAYS, id_type=IdType.POOL, size=100, follow_next=True
+            >>> )
+            >>> ranks = PercentileRanks(summaries, field="avg_validator_effectiveness", key="id")
+            >>> print(f"{ranks.ranks([0.95, 0.97, 0.99]) = }, {ranks.value(50) = }")
+
+        Args:
+            items: Members of the population
+            field: Attribute of the items holding their value, a function of the item, or None for items that are
+                values themselves; null values are left out
+            key: Attribute of the items identifying them, or a function of the item, so that a later value of the
+                same entity replaces the earlier one; None to keep every value
+        """
+        self.field = field
+        self.key = key
+        self._sorted: List[float] = []
+        self._pending: List[float] = []
+        self._removed: List[float] = []
+        self._by_key: Dict[Hashable, float] = {}
+        self._array: Any = None
+        self.update(items)
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._pending) - len(self._removed)
+
+    def add(self, item: Any) -> None:
+        """
+        Add a member to the population
+
+        Args:
+            item: A member of the population
+        """
+        value = _get(item, self.field)
+        if value is None:
+            return
+
+        if self.key is not None:
+            key = _get(item, self.key)
+            previous = self._by_key.get(key)
+            if previous is not None:
+                self._removed.append(previous)
+            self._by_key[key] = value
+
+        self._pending.append(value)
+        self._array = None
+
+    def update(self, items: Iterable[Any]) -> None:
+        """
+        Add many members to the population
+
+        Args:
+            items: Members of the population
+        """
+        for item in items:
+            self.add(item)
+
+    def rank(self, value: float) -> float:
+        """
+        Percentile rank of a value
+
+        Args:
+            value: Any value, whether in the population or not
+
+        Returns:
+            The percentage of the population at or below the value
+        """
+        return cast(float, self.ranks([value])[0])
+
+    def ranks(self, values: Sequence[float | None]) -> List[float | None]:
+        """
+        Percentile ranks of many values at once, vectorized when NumPy is available
+
+        Args:
+            values: Any values, whether in the population or not
+
+        Returns:
+            The percentage of the population at or below every value, null for null values
+        """
+        population = self._settle()
+        if not population:
+            raise ValueError("Cannot rank values among an empty population")
+
+        size = len(population)
+        if not HAS_NUMPY:
+            return [
+                None if v is None else 100 * bisect_right(population, v) / size
+                for v in values
+            ]
+
+        present = [v is not None for v in values]
+        filled = np.asarray([v if p else 0.0 for v, p in zip(values, present)])
+        ranks = 100 * np.searchsorted(self._numpy(), filled, side="right") / size
+        return [r if p else None for r, p in zip(ranks.tolist(), present)]
+
+    def value(self, rank: float) -> float:
+        """
+        Smallest value of the population with at least a given percentile rank
+
+        Args:
+            rank: Percentile rank, between 0 and 100
+
+        Returns:
+            The value at the rank
+        """
+        return self.values([rank])[0]
+
+    def values(self, ranks: Sequence[float]) -> List[float]:
+        """
+        Smallest values of the population with at least given percentile ranks, vectorized when NumPy is available
+
+        Args:
+            ranks: Percentile ranks, between 0 and 100
+
+        Returns:
+            The value at every rank
+        """
+        population = self._settle()
+        if not population:
+            raise ValueError("Cannot find values in an empty population")
+        if any(not 0 <= r <= 100 for r in ranks):
+            raise ValueError("Percentile ranks must be between 0 and 100")
+
+        size = len(population)
+        if not HAS_NUMPY:
+            return [
+                population[max(math.ceil(r * size / 100 - ROUNDING) - 1, 0)]
+                for r in ranks
+            ]
+
+        positions = np.ceil(np.asarray(ranks, dtype=float) * size / 100 - ROUNDING) - 1
+        return self._numpy()[np.maximum(positions, 0).astype(np.intp)].tolist()
+
+    def table(
+        self,
+        ranks: Sequence[int] = TABLE_RANKS,
+        *,
+        time_window: str = "",
+    ) -> List[Percentile]:
+        """
+        A rank to value table like the one returned by `Operators.percentiles`
+
+        Args:
+            ranks: Percentile ranks to tabulate
+            time_window: Time window the population was measured over, to label the table with
+
+        Returns:
+            The value at every rank
+        """
+        return [
+            Percentile(time_window=time_window, rank=rank, value=value)
+            for rank, value in zip(ranks, self.values(ranks))
+        ]
+
+    def _settle(self) -> List[float]:
+        if self._pending:
+            # Sorting appended values merges them into the sorted run in close to linear time
+            self._sorted.extend(self._pending)
+            self._sorted.sort()
+            self._pending = []
+        for value in self._removed:
+            del self._sorted[bisect_left(self._sorted, value)]
+        self._removed = []
+        return self._sorted
+
+    def _numpy(self) -> Any:
+        if self._array is None:
+            self._array = np.asarray(self._sorted, dtype=float)
+        return self._array
+
+
+def _get(item: Any, field: Field) -> Any:
+    if field is None:
+        return item
+    if isinstance(field, str):
+        return getattr(item, field)
+    return field(item)
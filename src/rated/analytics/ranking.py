@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import heapq
+from itertools import count, islice
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+T = TypeVar("T")
+
+# What items are ranked by: attribute names, optionally prefixed with "-" to rank that attribute the other way
+# round, or a function of the item
+SortKey = Union[str, Sequence[str], Callable[[Any], Any]]
+
+
+class _Rank:
+    """Sort values compared attribute by attribute, each in its own direction"""
+
+    __slots__ = ("directions", "values")
+
+    def __init__(self, values: Tuple[Any, ...], directions: Tuple[bool, ...]) -> None:
+        self.values = values
+        self.directions = directions
+
+    def __lt__(self, other: _Rank) -> bool:
+        for value, other_value, ascending in zip(
+            self.values, other.values, self.directions
+        ):
+            if value != other_value:
+                return value < other_value if ascending else value > other_value
+        return False
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Rank) and self.values == other.values
+
+
+def top_k(
+    items: Iterable[T],
+    k: int,
+    *,
+    key: SortKey,
+    presorted: bool = False,
+) -> List[T]:
+    """
+    The `k` items with the highest sort values, consuming a stream with O(k) memory
+
+    Items with a null sort value are left out, and ties keep the items that came first.
+
+    Examples:
+        >>> from rated import Rated
+        >>> from rated.analytics.ranking import top_k
+        >>> from rated.ethereum import MAINNET
+        >>> from rated.ethereum.enums import TimeWindow
+        >>>
+        >>> RATED_KEY = "ey..."
+        >>> r = Rated(RATED_KEY)
+        >>> eth = r.ethereum(network=MAINNET)
+        >>> summaries = eth.operators.summaries(time_window=TimeWindow.THIRTY_DAYS, size=100, follow_next=True)
+        >>> for s in top_k(summaries, 20, key=("avg_validator_effectiveness", "-validator_count")):
+        >>>     print(f"{s.id = }, {s.avg_validator_effectiveness = }")
+        >>>
+        >>> # The leaderboard comes ranked, so only the first page is fetched
+        >>> leaders = top_k(eth.slashings.leaderboard(follow_next=True), 5, key="slashes", presorted=True)
+
+    Args:
+        items: Items of a stream, such as the results of a resource
+        k: Number of items to keep
+        key: Attributes to rank items by, in order of precedence, or a function of the item
+        presorted: Whether the stream already comes ranked by the key, highest first, so that it can be cut short
+            after `k` items
+
+    Returns:
+        Up to `k` items, highest first
+    """
+    return _select(items, k, key, descending=True, presorted=presorted)
+
+
+def bottom_k(
+    items: Iterable[T],
+    k: int,
+    *,
+    key: SortKey,
+    presorted: bool = False,
+) -> List[T]:
+    """
+    The `k` items with the lowest sort values, consuming a stream with O(k) memory
+
+    Items with a null sort value are left out, and ties keep the items that came first.
+
+    Args:
+        items: Items of a stream, such as the results of a resource
+        k: Number of items to keep
+        key: Attributes to rank items by, in order of precedence, or a function of the item
+        presorted: Whether the stream already comes ranked by the key, lowest first, so that it can be cut short
+            after `k` items
+
+    Returns:
+        Up to `k` items, lowest first
+    """
+    return _select(items, k, key, descending=False, presorted=presorted)
+
+
+def _select(
+    items: Iterable[T],
+    k: int,
+    key: SortKey,
+    *,
+    descending: bool,
+    presorted: bool,
+) -> List[T]:
+    if k < 0:
+        raise ValueError("k must not be negative")
+
+    rank = _ranker(key, descending)
+    ranked = ((r, item) for item in items for r in [rank(item)] if r is not None)
+    if presorted:
+        return [item for _, item in islice(ranked, k)]
+    if k == 0:
+        return []
+
+    # A min-heap of the best items so far, whose root is the first to be replaced; among equal ranks, the most
+    # recent item is replaced first
+    heap: List[Tuple[_Rank, int, T]] = []
+    order = count()
+    for r, item in ranked:
+        entry = (r, -next(order), item)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif heap[0] < entry:
+            heapq.heapreplace(heap, entry)
+
+    return [item for _, _, item in sorted(heap, reverse=True)]
+
+
+def _ranker(key: SortKey, descending: bool) -> Callable[[Any], _Rank | None]:
+    if callable(key):
+        sort_value = key
+
+        def values_of(item: Any) -> Tuple[Any, ...]:
+            return (sort_value(item),)
+
+        directions: Tuple[bool, ...] = (descending,)
+    else:
+        names = [key] if isinstance(key, str) else list(key)
+        fields = tuple(name.lstrip("-") for name in names)
+        directions = tuple(descending != name.startswith("-") for name in names)
+
+        def values_of(item: Any) -> Tuple[Any, ...]:
+            return tuple(getattr(item, f) for f in fields)
+
+    def rank(item: Any) -> _Rank | None:
+        values = values_of(item)
+        if any(v is None for v in values):
+            return None
+        return _Rank(values, directions)
+
+    return rank
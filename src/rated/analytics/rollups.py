@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
+
+from rated.analytics.columns import aggregate_columns, factorize, to_columns
+from rated.ethereum.aggregation import most_recent_first
+from rated.ethereum.chain import GENESIS_DATES, MAINNET
+from rated.ethereum.datatypes import ValidatorEffectiveness
+from rated.ethereum.enums import Granularity
+
+# Granularities in increasing order of size
+GRANULARITY_ORDER: Tuple[Granularity, ...] = (
+    Granularity.HOUR,
+    Granularity.DAY,
+    Granularity.WEEK,
+    Granularity.MONTH,
+    Granularity.QUARTER,
+    Granularity.YEAR,
+    Granularity.ALL_TIME,
+)
+
+HOURS_PER_DAY: int = 24
+
+# First and last day of a time bucket
+Bucket = Tuple[int, int]
+
+
+@lru_cache(maxsize=None)
+def bucket_bounds(day: int, granularity: Granularity, network: str) -> Bucket:
+    """
+    The calendar period of a given granularity a day falls into
+
+    Weeks start on Mondays, and the first period of a network is cut at its genesis.
+
+    Args:
+        day: Day number
+        granularity: Size of the period, from a day to a year
+        network: The network the days are counted for
+
+    Returns:
+        The first and last day number of the period
+    """
+    genesis = GENESIS_DATES[network]
+    current = genesis + timedelta(days=day)
+
+    if granularity == Granularity.DAY:
+        return day, day
+    if granularity == Granularity.WEEK:
+        start = current - timedelta(days=current.weekday())
+        end = start + timedelta(days=6)
+    elif granularity == Granularity.MONTH:
+        start = current.replace(day=1)
+        end = _add_months(start, 1) - timedelta(days=1)
+    elif granularity == Granularity.QUARTER:
+        start = current.replace(month=(current.month - 1) // 3 * 3 + 1, day=1)
+        end = _add_months(start, 3) - timedelta(days=1)
+    elif granularity == Granularity.YEAR:
+        start = date(current.year, 1, 1)
+        end = date(current.year, 12, 31)
+    else:
+        raise ValueError(f"No calendar period for granularity '{granularity.value}'")
+
+    return max((start - genesis).days, 0), (end - genesis).days
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return day.replace(year=day.year + month // 12, month=month % 12 + 1)
+
+
+class Rollups:
+    """
+    Derive coarser granularities from finer effectiveness rows, without fetching them again
+
+    Rows are combined the way the Rated API does: counters and amounts are summed, while averages are weighted by the
+    counter they were computed over, e.g. `avg_inclusion_delay` by `total_unique_attestations`. Hours are counted
+    from the start of day 0, so that day `d` is made of hours `24 * d` to `24 * d + 23`.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[ValidatorEffectiveness],
+        *,
+        network: str = MAINNET,
+    ) -> None:
+        """
+        Initialize rollups of hourly or daily effectiveness rows
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.analytics.rollups import Rollups
+            >>> from rated.ethereum import MAINNET
+            >>> from rated.ethereum.enums import Granularity
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> daily = eth.validators.effectiveness_backfill(indices=[500, 501], from_day=900, to_day=1100)
+            >>> rollups = Rollups(daily, network=MAINNET)
+            >>> for row in rollups.at(Granularity.MONTH):
+            >>>     print(f"{row.validator_index = }, {row.start_day = }, {row.uptime = }")
+
+        Args:
+            rows: Effectiveness rows, each with either an hour or a day
+            network: The network the days are counted for
+
+        Raises:
+            ValueError: If a row has neither an hour nor a day
+        """
+        self.network = network
+        self.columns = to_columns(rows)
+
+        self.hours: List[int | None] = self.columns["hour"]
+        days = self.columns["day"]
+        self.days: List[int] = []
+        for hour, day in zip(self.hours, days):
+            if day is None and hour is None:
+                raise ValueError("Every row must have an hour or a day")
+            self.days.append(day if day is not None else hour // HOURS_PER_DAY)  # type: ignore[operator]
+
+        hourly = [h is not None for h in self.hours]
+        self.granularity = Granularity.HOUR if all(hourly) else Granularity.DAY
+        if self.days and any(hourly) and not all(hourly):
+            raise ValueError("Rows must either all be hourly or all be daily")
+
+        self._cache: Dict[Tuple[Granularity, bool], List[ValidatorEffectiveness]] = {}
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def at(
+        self,
+        granularity: Granularity,
+        *,
+        by_validator: bool = True,
+    ) -> List[ValidatorEffectiveness]:
+        """
+        Rows rolled up to a granularity
+
+        Args:
+            granularity: The size of the time buckets to roll up to
+            by_validator: One row per validator and time bucket, otherwise a single row per time bucket across
+                validators, like grouping by time with the Rated API
+
+        Returns:
+            One row per bucket, most recent first like the Rated API, then by validator index
+
+        Raises:
+            ValueError: If the granularity is finer than the rows
+        """
+        if GRANULARITY_ORDER.index(granularity) < GRANULARITY_ORDER.index(
+            self.granularity
+        ):
+            raise ValueError(
+                f"Cannot roll {self.granularity.value} rows up to '{granularity.value}'"
+            )
+
+        key = (granularity, by_validator)
+        if key not in self._cache:
+            self._cache[key] = self._rollup(granularity, by_validator)
+        return self._cache[key]
+
+    def _bucket(self, row: int, granularity: Granularity) -> Tuple[int, ...]:
+        if granularity == Granularity.HOUR:
+            return (self.hours[row],)  # type: ignore[return-value]
+        if granularity == Granularity.ALL_TIME:
+            return ()
+        return bucket_bounds(self.days[row], granularity, self.network)
+
+    def _rollup(
+        self,
+        granularity: Granularity,
+        by_validator: bool,
+    ) -> List[ValidatorEffectiveness]:
+        indices = self.columns["validator_index"]
+        keys = (
+            (indices[r] if by_validator else None, self._bucket(r, granularity))
+            for r in range(len(self))
+        )
+        group_ids, groups = factorize(keys)
+        metrics = aggregate_columns(self.columns, group_ids, len(groups))
+
+        first_days: List[int | None] = [None] * len(groups)
+        last_days: List[int | None] = [None] * len(groups)
+        start_epochs: List[int | None] = [None] * len(groups)
+        end_epochs: List[int | None] = [None] * len(groups)
+        for row, group in enumerate(group_ids):
+            first_days[group] = _nullable_min(first_days[group], self.days[row])
+            last_days[group] = _nullable_max(last_days[group], self.days[row])
+            start_epochs[group] = _nullable_min(
+                start_epochs[group], self.columns["start_epoch"][row]
+            )
+            end_epochs[group] = _nullable_max(
+                end_epochs[group], self.columns["end_epoch"][row]
+            )
+
+        rows = []
+        for group, key in enumerate(groups):
+            validator_index, bucket = cast(Tuple[Optional[int], Tuple[int, ...]], key)
+            values: Dict[str, Any] = {name: metrics[name][group] for name in metrics}
+            if granularity == Granularity.HOUR:
+                values["hour"] = bucket[0]
+                values["day"] = bucket[0] // HOURS_PER_DAY
+            elif granularity == Granularity.DAY:
+                values["day"] = bucket[0]
+            elif granularity == Granularity.ALL_TIME:
+                values["start_day"] = first_days[group]
+                values["end_day"] = last_days[group]
+            else:
+                values["start_day"], values["end_day"] = bucket
+            rows.append(
+                ValidatorEffectiveness(
+                    validator_index=validator_index,
+                    start_epoch=start_epochs[group],
+                    end_epoch=end_epochs[group],
+                    **values,
+                )
+            )
+
+        def order(row: ValidatorEffectiveness) -> Tuple[int, ...]:
+            time = row.hour if row.hour is not None else row.day
+            if time is None:
+                time = row.start_day
+            return (*most_recent_first((time,)), row.validator_index or 0)
+
+        return sorted(rows, key=order)
+
+
+def _nullable_min(a: int | None, b: int | None) -> int | None:
+    return b if a is None else a if b is None else min(a, b)
+
+
+def _nullable_max(a: int | None, b: int | None) -> int | None:
+    return b if a is None else a if b is None else max(a, b)
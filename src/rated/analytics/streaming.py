@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+T = TypeVar("T")
+
+# Where an aggregator reads its values from: an attribute name, a function of the item, or the item itself
+Field = Optional[Union[str, Callable[[Any], Any]]]
+
+DEFAULT_COMPRESSION: int = 100
+
+
+class Aggregator(ABC):
+    """
+    A statistic updated one item at a time, in constant memory
+
+    Items whose value is null are counted in `nulls` and otherwise ignored. Aggregators of the same kind can be
+    merged, e.g. to combine statistics computed over different streams.
+    """
+
+    def __init__(self, field: Field = None) -> None:
+        """
+        Initialize an aggregator
+
+        Args:
+            field: Attribute of the items to aggregate, a function of the item, or None to aggregate items themselves
+        """
+        self.field = field
+        self.nulls = 0
+
+    def add(self, item: Any) -> None:
+        """
+        Update the statistic with an item
+
+        Args:
+            item: An item of the stream
+        """
+        if self.field is None:
+            value = item
+        elif isinstance(self.field, str):
+            value = getattr(item, self.field)
+        else:
+            value = self.field(item)
+
+        if value is None:
+            self.nulls += 1
+        else:
+            self._add(value)
+
+    def update(self, items: Iterable[Any]) -> None:
+        """
+        Update the statistic with many items
+
+        Args:
+            items: Items of the stream
+        """
+        for item in items:
+            self.add(item)
+
+    def merge(self, other: Aggregator) -> None:
+        """
+        Combine the statistic of another aggregator of the same kind into this one
+
+        Args:
+            other: The other aggregator
+        """
+        if type(other) is not type(self):
+            raise TypeError(
+                f"Cannot merge {type(other).__name__} into {type(self).__name__}"
+            )
+        self.nulls += other.nulls
+        self._merge(other)
+
+    @property
+    @abstractmethod
+    def result(self) -> Any:
+        """The current value of the statistic"""
+
+    @abstractmethod
+    def _add(self, value: Any) -> None:
+        """Update the statistic with a value that isn't null"""
+
+    @abstractmethod
+    def _merge(self, other: Any) -> None:
+        """Combine the statistic of another aggregator of the same kind into this one"""
+
+
+class Count(Aggregator):
+    """Number of values"""
+
+    def __init__(self, field: Field = None) -> None:
+        super().__init__(field)
+        self.count = 0
+
+    @property
+    def result(self) -> int:
+        return self.count
+
+    def _add(self, value: Any) -> None:
+        self.count += 1
+
+    def _merge(self, other: Count) -> None:
+        self.count += other.count
+
+
+class Sum(Aggregator):
+    """Sum of values"""
+
+    def __init__(self, field: Field = None) -> None:
+        super().__init__(field)
+        self.total: float = 0
+
+    @property
+    def result(self) -> float:
+        return self.total
+
+    def _add(self, value: float) -> None:
+        self.total += value
+
+    def _merge(self, other: Sum) -> None:
+        self.total += other.total
+
+
+class Min(Aggregator):
+    """Smallest value"""
+
+    def __init__(self, field: Field = None) -> None:
+        super().__init__(field)
+        self.value: Any = None
+
+    @property
+    def result(self) -> Any:
+        return self.value
+
+    def _add(self, value: Any) -> None:
+        if self.value is None or value < self.value:
+            self.value = value
+
+    def _merge(self, other: Min) -> None:
+        if other.value is not None:
+            self._add(other.value)
+
+
+class Max(Aggregator):
+    """Largest value"""
+
+    def __init__(self, field: Field = None) -> None:
+        super().__init__(field)
+        self.value: Any = None
+
+    @property
+    def result(self) -> Any:
+        return self.value
+
+    def _add(self, value: Any) -> None:
+        if self.value is None or value > self.value:
+            self.value = value
+
+    def _merge(self, other: Max) -> None:
+        if other.value is not None:
+            self._add(other.value)
+
+
+class Moments(Aggregator):
+    """Mean and variance of values, computed with Welford's numerically stable algorithm"""
+
+    def __init__(self, field: Field = None) -> None:
+        super().__init__(field)
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def variance(self) -> float | None:
+        """Sample variance, or None with fewer than two values"""
+        return self._m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def std(self) -> float | None:
+        """Sample standard deviation, or None with fewer than two values"""
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+    @property
+    def result(self) -> Dict[str, float | None]:
+        return {
+            "mean": self.mean if self.count else None,
+            "variance": self.variance,
+            "std": self.std,
+        }
+
+    def _add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def _merge(self, other: Moments) -> None:
+        count = self.count + other.count
+        if not count:
+            return
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+
+
+class Quantiles(Aggregator):
+    """
+    Approximate quantiles of values, kept in a merging t-digest
+
+    The digest keeps at most a few times `compression` centroids whatever the number of values, and is most accurate
+    towards the tails of the distribution.
+    """
+
+    def __init__(
+        self,
+        field: Field = None,
+        *,
+        compression: int = DEFAULT_COMPRESSION,
+    ) -> None:
+        """
+        Initialize a digest
+
+        Args:
+            field: Attribute of the items to aggregate, a function of the item, or None to aggregate items themselves
+            compression: Trades memory for accuracy; higher keeps more centroids
+        """
+        super().__init__(field)
+        self.compression = compression
+        self.count: float = 0
+        self.min: float | None = None
+        self.max: float | None = None
+        self._centroids: List[Tuple[float, float]] = []
+        self._buffer: List[Tuple[float, float]] = []
+
+    @property
+    def result(self) -> Dict[float, float | None]:
+        return {q: self.quantile(q) for q in (0.01, 0.25, 0.5, 0.75, 0.99)}
+
+    @property
+    def centroids(self) -> List[Tuple[float, float]]:
+        """Means and weights of the centroids of the digest"""
+        self._compress()
+        return list(self._centroids)
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Estimate a quantile
+
+        Args:
+            q: Quantile, between 0 and 1
+
+        Returns:
+            The estimated value, or None if there are no values
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantiles must be between 0 and 1")
+
+        self._compress()
+        if not self._centroids:
+            return None
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+
+        target = q * self.count
+        prev_center, prev_mean = 0.0, self.min
+        cumulative = 0.0
+        for mean, weight in self._centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                return _interpolate(target, prev_center, prev_mean, center, mean)  # type: ignore[arg-type]
+            prev_center, prev_mean = center, mean
+            cumulative += weight
+        return _interpolate(target, prev_center, prev_mean, self.count, self.max)  # type: ignore[arg-type]
+
+    def _add(self, value: float) -> None:
+        self._add_weighted(value, 1)
+
+    def _add_weighted(self, value: float, weight: float) -> None:
+        self.count += weight
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self._buffer.append((value, weight))
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def _merge(self, other: Quantiles) -> None:
+        for mean, weight in other.centroids:
+            self._add_weighted(mean, weight)
+        # Centroid means lie within the extremes, which are kept exactly
+        for extreme in (other.min, other.max):
+            if extreme is not None:
+                self.min = min(self.min, extreme)  # type: ignore[type-var]
+                self.max = max(self.max, extreme)  # type: ignore[type-var]
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+
+        items = sorted(self._centroids + self._buffer)
+        self._buffer = []
+        total = sum(w for _, w in items)
+
+        merged: List[Tuple[float, float]] = []
+        mean, weight = items[0]
+        seen = 0.0
+        limit = self._q_limit(0.0)
+        for value, w in items[1:]:
+            if (seen + weight + w) / total <= limit:
+                weight += w
+                mean += (value - mean) * w / weight
+            else:
+                merged.append((mean, weight))
+                seen += weight
+                limit = self._q_limit(seen / total)
+                mean, weight = value, w
+        merged.append((mean, weight))
+        self._centroids = merged
+
+    def _q_limit(self, q: float) -> float:
+        # Scale function k1: centroids are small near the tails and large around the median
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(2 * math.pi * k / self.compression) + 1) / 2
+
+
+class Summary(Aggregator):
+    """Count, sum, min, max, mean, variance and quantiles of values, in a single pass"""
+
+    def __init__(
+        self,
+        field: Field = None,
+        *,
+        compression: int = DEFAULT_COMPRESSION,
+    ) -> None:
+        """
+        Initialize a summary
+
+        Args:
+            field: Attribute of the items to aggregate, a function of the item, or None to aggregate items themselves
+            compression: Trades memory for accuracy of the quantiles
+        """
+        super().__init__(field)
+        self.sum = Sum()
+        self.min = Min()
+        self.max = Max()
+        self.moments = Moments()
+        self.quantiles = Quantiles(compression=compression)
+
+    @property
+    def count(self) -> int:
+        """Number of values"""
+        return self.moments.count
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Estimate a quantile
+
+        Args:
+            q: Quantile, between 0 and 1
+
+        Returns:
+            The estimated value, or None if there are no values
+        """
+        return self.quantiles.quantile(q)
+
+    @property
+    def result(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "nulls": self.nulls,
+            "sum": self.sum.result,
+            "min": self.min.result,
+            "max": self.max.result,
+            **self.moments.result,
+            "quantiles": self.quantiles.result,
+        }
+
+    def _add(self, value: Any) -> None:
+        for part in self._parts():
+            part._add(value)
+
+    def _merge(self, other: Summary) -> None:
+        for part, other_part in zip(self._parts(), other._parts()):
+            part.merge(other_part)
+
+    def _parts(self) -> Tuple[Aggregator, ...]:
+        return self.sum, self.min, self.max, self.moments, self.quantiles
+
+
+def observe(items: Iterable[T], *aggregators: Aggregator) -> Iterator[T]:
+    """
+    Update aggregators with every item of a stream, passing items through untouched
+
+    Examples:
+        >>> from rated import Rated
+        >>> from rated.analytics.streaming import Quantiles, Summary, observe
+        >>> from rated.ethereum import MAINNET
+        >>>
+        >>> RATED_KEY = "ey..."
+        >>> r = Rated(RATED_KEY)
+        >>> eth = r.ethereum(network=MAINNET)
+        >>> rewards = Summary("total_rewards")
+        >>> mev = Quantiles("baseline_mev")
+        >>> for block in observe(eth.blocks.all(size=100, follow_next=True), rewards, mev):
+        >>>     pass
+        >>> print(f"{rewards.result = }, {mev.quantile(0.99) = }")
+
+    Args:
+        items: Items of a stream, such as the results of a resource
+        aggregators: Aggregators to update
+
+    Yields:
+        Every item
+    """
+    for item in items:
+        for aggregator in aggregators:
+            aggregator.add(item)
+        yield item
+
+
+def _interpolate(x: float, x0: float, y0: float, x1: float, y1: float) -> float:
+    if x1 == x0:
+        return y1
+    return y0 + (x - x0) / (x1 - x0) * (y1 - y0)
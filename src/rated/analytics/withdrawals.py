@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, Iterator, List
+
+from rated.ethereum.chain import MAINNET, SLOTS_PER_EPOCH, slot_day
+from rated.ethereum.datatypes import (
+    Withdrawal,
+    WithdrawalDayTotal,
+    WithdrawalEpochTotal,
+)
+
+
+class WithdrawalProjection:
+    """
+    Running totals of predicted withdrawals per epoch, per day and per withdrawal type
+
+    Totals are kept in arrays with one slot per epoch, from the first to the last epoch seen, so that memory grows with
+    the time span of the predictions rather than with their number.
+    """
+
+    def __init__(
+        self,
+        withdrawals: Iterable[Withdrawal] = (),
+        *,
+        network: str = MAINNET,
+    ) -> None:
+        """
+        Initialize a projection, consuming a stream of predicted withdrawals
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.analytics.withdrawals import WithdrawalProjection
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> projection = WithdrawalProjection(eth.withdrawals.by_operator("Lido", follow_next=True))
+            >>> for t in projection.by_day():
+            >>>     print(f"{t.day = }, {t.withdrawable_amount = }, {t.withdrawable_amount_by_type = }")
+
+        Args:
+            withdrawals: Predicted withdrawals, in any order
+            network: The network the days are counted for
+        """
+        self.network = network
+        self.first_epoch: int | None = None
+        self._counts = array("q")
+        self._amounts = array("q")
+        self._amounts_by_type: Dict[str, array[int]] = {}
+        self.update(withdrawals)
+
+    def __len__(self) -> int:
+        """Number of epochs spanned"""
+        return len(self._counts)
+
+    @property
+    def epochs(self) -> range:
+        """Epochs spanned, from the first to the last epoch with a withdrawal"""
+        first = self.first_epoch or 0
+        return range(first, first + len(self))
+
+    def add(self, withdrawal: Withdrawal) -> None:
+        """
+        Add a predicted withdrawal to the totals
+
+        Args:
+            withdrawal: A predicted withdrawal
+        """
+        position = self._position(withdrawal.withdrawal_epoch)
+        amounts_of_type = self._amounts_by_type.get(withdrawal.withdrawal_type)
+        if amounts_of_type is None:
+            amounts_of_type = array("q", bytes(self._counts.itemsize * len(self)))
+            self._amounts_by_type[withdrawal.withdrawal_type] = amounts_of_type
+
+        self._counts[position] += 1
+        self._amounts[position] += withdrawal.withdrawable_amount
+        amounts_of_type[position] += withdrawal.withdrawable_amount
+
+    def update(self, withdrawals: Iterable[Withdrawal]) -> None:
+        """
+        Add many predicted withdrawals to the totals
+
+        Args:
+            withdrawals: Predicted withdrawals
+        """
+        for withdrawal in withdrawals:
+            self.add(withdrawal)
+
+    def by_epoch(self) -> Iterator[WithdrawalEpochTotal]:
+        """
+        Totals of every epoch spanned, including epochs without withdrawals
+
+        Yields:
+            Withdrawal totals, in epoch order
+        """
+        for position, epoch in enumerate(self.epochs):
+            yield WithdrawalEpochTotal(
+                epoch=epoch,
+                validator_count=self._counts[position],
+                withdrawable_amount=self._amounts[position],
+                withdrawable_amount_by_type=self._by_type(position, position + 1),
+            )
+
+    def by_day(self) -> Iterator[WithdrawalDayTotal]:
+        """
+        Totals of every day spanned, including days without withdrawals
+
+        Yields:
+            Withdrawal totals, in day order
+        """
+        days = [slot_day(e * SLOTS_PER_EPOCH, self.network) for e in self.epochs]
+        start = 0
+        for end in range(1, len(days) + 1):
+            if end < len(days) and days[end] == days[start]:
+                continue
+            yield WithdrawalDayTotal(
+                day=days[start],
+                validator_count=sum(self._counts[start:end]),
+                withdrawable_amount=sum(self._amounts[start:end]),
+                withdrawable_amount_by_type=self._by_type(start, end),
+            )
+            start = end
+
+    def totals_by_type(self) -> Dict[str, int]:
+        """
+        Totals of every withdrawal type across all epochs
+
+        Returns:
+            The withdrawable amount of every type
+        """
+        return self._by_type(0, len(self))
+
+    def _position(self, epoch: int) -> int:
+        if self.first_epoch is None:
+            self.first_epoch = epoch
+
+        if epoch < self.first_epoch:
+            padding = bytes(self._counts.itemsize * (self.first_epoch - epoch))
+            for values in self._arrays():
+                values[0:0] = array("q", padding)
+            self.first_epoch = epoch
+        elif epoch >= self.first_epoch + len(self):
+            padding = bytes(
+                self._counts.itemsize * (epoch - self.first_epoch + 1 - len(self))
+            )
+            for values in self._arrays():
+                values.frombytes(padding)
+
+        return epoch - self.first_epoch
+
+    def _arrays(self) -> List[array[int]]:
+        return [self._counts, self._amounts, *self._amounts_by_type.values()]
+
+    def _by_type(self, start: int, end: int) -> Dict[str, int]:
+        totals = {
+            withdrawal_type: sum(amounts[start:end])
+            for withdrawal_type, amounts in self._amounts_by_type.items()
+        }
+        return {t: amount for t, amount in totals.items() if amount}
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import importlib
+import json
+from dataclasses import asdict, dataclass
 from typing import Iterator, Type, Dict, Any
 
 import httpx
@@ -11,6 +14,93 @@ from rated.version import __version__
 api_base_url: str = "https://api.rated.network"
 
 
+@dataclass
+class PaginationCursor:
+    """
+    The state of an iteration over paginated results, which can be saved and resumed later
+
+    The cursor points at the page being read, and counts the items of that page already consumed.
+    """
+
+    url: str
+    params: Dict[str, Any] | None = None
+    cls: str | None = None
+    follow_next: bool = False
+    offset: int = 0
+    items_consumed: int = 0
+    done: bool = False
+
+    def to_json(self) -> str:
+        """Serialize the cursor to JSON"""
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> PaginationCursor:
+        """
+        Deserialize a cursor from JSON
+
+        Args:
+            data: A cursor serialized with `to_json`
+
+        Returns:
+            The cursor
+        """
+        return cls(**json.loads(data))
+
+    def result_type(self) -> Type | None:
+        """
+        The dataclass results are converted to
+
+        Raises:
+            ValueError: If the cursor refers to a type outside of this package
+        """
+        if self.cls is None:
+            return None
+        module, _, name = self.cls.partition(":")
+        if module.split(".")[0] != "rated":
+            raise ValueError(f"Cannot resume results of type '{self.cls}'")
+        return getattr(importlib.import_module(module), name)
+
+
+class PaginatedResults(Iterator[Any]):
+    """An iterator over paginated results, whose progress is kept in a cursor"""
+
+    def __init__(self, client: Client, cursor: PaginationCursor) -> None:
+        """
+        Initialize an iteration from a cursor
+
+        Args:
+            client: HTTP Client to use for requests
+            cursor: Where to start from; it is updated as results are consumed
+        """
+        self.client = client
+        self.cursor = cursor
+        self._results = self._fetch()
+
+    def __next__(self) -> Any:
+        return next(self._results)
+
+    def _fetch(self) -> Iterator[Any]:
+        cursor = self.cursor
+        cls = cursor.result_type()
+        while not cursor.done:
+            response = self.client.client.get(
+                cursor.url, params=cursor.params, headers=self.client.headers
+            )
+            content = response.json()
+            for item in content["data"][cursor.offset :]:
+                cursor.offset += 1
+                cursor.items_consumed += 1
+                yield json_to_instance(item, cls) if cls else item
+
+            if not content["next"] or not cursor.follow_next:
+                cursor.done = True
+            else:
+                cursor.url = content["next"]
+                cursor.params = None
+                cursor.offset = 0
+
+
 class RatedApiError(Exception):
     def __init__(self, response: httpx.Response):
         self.status_code = response.status_code
@@ -18,6 +108,21 @@ class RatedApiError(Exception):
         self.request_id = response.headers.get("x-request-id")
 
 
+def is_transient(error: Exception) -> bool:
+    """
+    Whether a failed request is worth retrying
+
+    Args:
+        error: The error raised by the request
+
+    Returns:
+        True for network errors, rate limiting and server errors
+    """
+    if isinstance(error, RatedApiError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
 def check_for_user_agent(request: httpx.Request):
     user_agent = request.headers.get("user-agent")
     if not user_agent == f"rated-python/{__version__}":
@@ -113,7 +218,7 @@ class Client:
         params: dict | None = None,
         cls: Type | None = None,
         follow_next: bool = False,
-    ) -> Iterator:
+    ) -> PaginatedResults:
         """
         Yield all results of a paginated response from the Rated API
 
@@ -124,25 +229,48 @@ class Client:
             follow_next: Follow next page if any and fetch its results
 
         Returns:
-            An iterator over the results of the page
+            An iterator over the results of the page, whose `cursor` can be saved to resume it later
         """
         params_: Dict[str, Any] | None = params.copy() if params else None
         if params_:
             params_ = {k: v for k, v in params_.items() if v is not None}
-        while True:
-            response = self.client.get(url, params=params_, headers=self.headers)
-            content = response.json()
-            for item in content["data"]:
-                if cls:
-                    yield json_to_instance(item, cls)
-                else:
-                    yield item
+        cursor = PaginationCursor(
+            url,
+            params=params_,
+            cls=f"{cls.__module__}:{cls.__qualname__}" if cls else None,
+            follow_next=follow_next,
+        )
+        return PaginatedResults(self, cursor)
 
-            if not content["next"] or not follow_next:
-                break
+    def resume(self, cursor: PaginationCursor) -> PaginatedResults:
+        """
+        Continue an iteration over paginated results from where it stopped
+
+        The page the cursor points at is fetched again, and the items of it already consumed are skipped.
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.client import PaginationCursor
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> metadata = eth.validators.metadata(follow_next=True)
+            >>> for m in metadata:
+            >>>     save(m, cursor=metadata.cursor.to_json())
+            >>>
+            >>> # After a restart
+            >>> for m in eth.client.resume(PaginationCursor.from_json(load_cursor())):
+            >>>     save(m)
+
+        Args:
+            cursor: The cursor of an earlier iteration
 
-            url = content["next"]
-            params_ = None
+        Returns:
+            An iterator over the remaining results
+        """
+        return PaginatedResults(self, cursor)
 
 
 def json_to_instance(json_: Dict, cls: Type) -> Any:
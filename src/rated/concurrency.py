@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import (
+    Callable,
+    Deque,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Set,
+    TypeVar,
+)
+
+K = TypeVar("K")
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY: int = 8
+
+
+@dataclass
+class BatchResult(Generic[K, T]):
+    """The outcome of a single call made as part of a batch"""
+
+    key: K
+    value: T | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the call succeeded"""
+        return self.error is None
+
+    def unwrap(self) -> T:
+        """
+        Get the value of a successful call
+
+        Returns:
+            The value returned by the call
+
+        Raises:
+            Exception: The error raised by the call, if any
+        """
+        if self.error is not None:
+            raise self.error
+        return self.value  # type: ignore[return-value]
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Split items into lists of at most `size` elements
+
+    Args:
+        items: The items to split
+        size: Maximum number of items per chunk
+
+    Yields:
+        Chunks of items, in order
+    """
+    if size < 1:
+        raise ValueError("Chunk size must be at least 1")
+
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            break
+        yield chunk
+
+
+def run_concurrently(
+    fn: Callable[[K], T],
+    keys: Iterable[K],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    ordered: bool = True,
+) -> Iterator[BatchResult[K, T]]:
+    """
+    Call `fn` for every key using a bounded pool of threads
+
+    Calls share the caller's HTTP client, and so its pool of connections. Only a small window of keys is in flight at
+    any time, so arbitrarily long inputs can be consumed lazily.
+
+    Args:
+        fn: The function to call for every key
+        keys: The keys to call `fn` with
+        concurrency: Maximum number of calls in flight
+        ordered: Yield results in input order, otherwise as they complete
+
+    Yields:
+        The result of every call; errors are captured rather than raised
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+
+    def call(key: K) -> BatchResult[K, T]:
+        try:
+            return BatchResult(key, value=fn(key))
+        # Any error of the call is handed to the caller in its result, to be raised by `unwrap`
+        except Exception as exc:  # noqa: BLE001
+            return BatchResult(key, error=exc)
+
+    keys_ = iter(keys)
+    window = concurrency * 2
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    in_flight: Deque[Future] = deque(
+        executor.submit(call, key) for key in islice(keys_, window)
+    )
+    try:
+        if ordered:
+            while in_flight:
+                result = in_flight.popleft().result()
+                in_flight.extend(executor.submit(call, key) for key in islice(keys_, 1))
+                yield result
+        else:
+            not_done: Set[Future] = set(in_flight)
+            while not_done:
+                done, not_done = wait(not_done, return_when=FIRST_COMPLETED)
+                for future in done:
+                    in_flight.remove(future)
+                    for key in islice(keys_, 1):
+                        new = executor.submit(call, key)
+                        in_flight.append(new)
+                        not_done.add(new)
+                    yield future.result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def with_retries(
+    fn: Callable[[], T],
+    *,
+    retries: int,
+    backoff: float = 0.5,
+    retry_on: Callable[[Exception], bool] = lambda _: True,
+) -> T:
+    """
+    Call `fn`, retrying with exponential backoff when it fails
+
+    Args:
+        fn: The function to call
+        retries: Maximum number of retries after the first attempt
+        backoff: Seconds to wait before the first retry, doubled on every retry
+        retry_on: Whether an error is worth retrying
+
+    Returns:
+        The value returned by the first successful call
+
+    Raises:
+        Exception: The last error raised, once retries are exhausted
+    """
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as exc:
+            if attempt >= retries or not retry_on(exc):
+                raise
+            time.sleep(backoff * 2**attempt)
+            attempt += 1
@@ -1,21 +1,24 @@
+from __future__ import annotations
+
 from rated.base import Network
 from rated.ethereum.blocks import Block, Blocks
+from rated.ethereum.chain import MAINNET, HOLESKY
 from rated.ethereum.operators import Operator, Operators
 from rated.ethereum.p2p import P2P
+from rated.ethereum.pubkeys import PubkeyIndex
 from rated.ethereum.slashings import Slashings
 from rated.ethereum.validators import Validator, Validators
 from rated.ethereum.network import Network as NetworkMetrics
 from rated.ethereum.withdrawals import Withdrawals
 
-# supported networks
-MAINNET = "mainnet"
-HOLESKY = "holesky"
-
 
 class Ethereum(Network):
     path = "/v0/eth"
     supported_networks = [MAINNET, HOLESKY]
 
+    # When set, pubkey arguments are rewritten to validator indices, which make for much shorter URLs
+    pubkey_index: PubkeyIndex | None = None
+
     @property
     def block(self):
         return Block(self)
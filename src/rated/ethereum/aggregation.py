@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from dataclasses import fields
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from rated.ethereum.datatypes import ValidatorEffectiveness
+
+# Fields locating an effectiveness row in time; rows are combined when they match
+TIME_FIELDS: Tuple[str, ...] = (
+    "day",
+    "hour",
+    "start_day",
+    "end_day",
+    "start_epoch",
+    "end_epoch",
+)
+
+# Fields that identify a single validator and lose their meaning once rows are combined
+IDENTITY_FIELDS: Tuple[str, ...] = ("validator_index", "validator_pubkey")
+
+# Averages and ratios, mapped to the counter each of them has to be weighted by
+WEIGHTED_FIELDS: Dict[str, str] = {
+    "avg_correctness": "total_unique_attestations",
+    "avg_inclusion_delay": "total_unique_attestations",
+    "uptime": "total_attestation_assignments",
+    "attester_effectiveness": "total_attestation_assignments",
+    "validator_effectiveness": "total_attestation_assignments",
+    "proposer_effectiveness": "proposer_duties_count",
+}
+
+# Everything else is a counter or an amount, which simply adds up
+SUMMED_FIELDS: Tuple[str, ...] = tuple(
+    f.name
+    for f in fields(ValidatorEffectiveness)
+    if f.name not in TIME_FIELDS
+    and f.name not in IDENTITY_FIELDS
+    and f.name not in WEIGHTED_FIELDS
+)
+
+TimeKey = Tuple[Optional[int], ...]
+
+
+def nullable_sum(values: Iterable[int | float | None]) -> int | float | None:
+    """
+    Sum values, ignoring nulls
+
+    Args:
+        values: Values to sum
+
+    Returns:
+        The sum, or None if every value is null
+    """
+    present = [v for v in values if v is not None]
+    if not present:
+        return None
+    return sum(present)
+
+
+def weighted_mean(
+    pairs: Iterable[Tuple[float | None, int | float | None]],
+) -> float | None:
+    """
+    Average values by their weights, ignoring null values
+
+    Falls back to a plain mean when no value has a positive weight.
+
+    Args:
+        pairs: Tuples of value and weight
+
+    Returns:
+        The weighted mean, or None if every value is null
+    """
+    present = [(v, w or 0) for v, w in pairs if v is not None]
+    if not present:
+        return None
+
+    total_weight = sum(w for _, w in present)
+    if total_weight > 0:
+        return sum(v * w for v, w in present) / total_weight
+    return sum(v for v, _ in present) / len(present)
+
+
+def time_key(row: ValidatorEffectiveness) -> TimeKey:
+    """The time window an effectiveness row belongs to"""
+    return tuple(getattr(row, name) for name in TIME_FIELDS)
+
+
+def most_recent_first(key: TimeKey) -> Tuple[int, ...]:
+    """Sort key putting later time windows first, like the Rated API, and windows with null times last"""
+    return tuple(1 if v is None else -v for v in key)
+
+
+def merge_effectiveness(
+    rows: Sequence[ValidatorEffectiveness],
+) -> ValidatorEffectiveness:
+    """
+    Combine effectiveness rows covering disjoint sets of validators over the same time window
+
+    Counters and amounts are summed, while averages are weighted by the counter they were computed over,
+    e.g. `uptime` by `total_attestation_assignments`.
+
+    Args:
+        rows: Rows to combine
+
+    Returns:
+        A single row for the whole set of validators
+    """
+    if not rows:
+        raise ValueError("Cannot merge an empty set of rows")
+
+    values: Dict[str, int | float | None] = {
+        name: getattr(rows[0], name) for name in TIME_FIELDS
+    }
+    for name in SUMMED_FIELDS:
+        values[name] = nullable_sum(getattr(row, name) for row in rows)
+    for name, weight in WEIGHTED_FIELDS.items():
+        values[name] = weighted_mean(
+            (getattr(row, name), getattr(row, weight)) for row in rows
+        )
+    return ValidatorEffectiveness(**values)  # type: ignore[arg-type]
+
+
+def merge_by_time_window(
+    pages: Iterable[Iterable[ValidatorEffectiveness]],
+) -> Iterator[ValidatorEffectiveness]:
+    """
+    Combine rows grouped by time window, fetched for disjoint sets of validators
+
+    Args:
+        pages: Rows fetched for every set of validators
+
+    Yields:
+        One row per time window, most recent first like the Rated API
+    """
+    windows: Dict[TimeKey, List[ValidatorEffectiveness]] = {}
+    for page in pages:
+        for row in page:
+            windows.setdefault(time_key(row), []).append(row)
+
+    for key in sorted(windows, key=most_recent_first):
+        yield merge_effectiveness(windows[key])
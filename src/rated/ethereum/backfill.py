@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, TypeVar
+
+from rated.concurrency import run_concurrently
+from rated.ethereum.chain import GENESIS_DATES
+from rated.ethereum.enums import FilterType, Granularity
+
+T = TypeVar("T")
+
+# Number of time buckets, at the chosen granularity, fetched per sub-window
+DEFAULT_BUCKETS_PER_WINDOW: int = 30
+
+# Length of a time bucket, in hours, for the granularities whose buckets all have the same length. Weeks, months,
+# quarters and years follow the calendar, so a range is never split at those granularities.
+GRANULARITY_HOURS: Dict[Granularity, int] = {
+    Granularity.HOUR: 1,
+    Granularity.DAY: 24,
+}
+
+FILTER_HOURS: Dict[FilterType, int] = {
+    FilterType.HOUR: 1,
+    FilterType.DAY: 24,
+}
+
+
+def day_number(day: int | date, network: str) -> int:
+    """
+    Convert a date to the number of days since the genesis of the network
+
+    Args:
+        day: A day number or a date
+        network: The network the days are counted for
+
+    Returns:
+        The day number
+    """
+    if isinstance(day, date):
+        return (day - GENESIS_DATES[network]).days
+    return day
+
+
+def bucket_length(granularity: Granularity, filter_type: FilterType) -> int:
+    """
+    Length of a time bucket, in units of the filter type, which the edges of sub-windows are aligned to
+
+    Args:
+        granularity: The size of the time buckets being fetched
+        filter_type: Whether the range is expressed in days or hours
+
+    Returns:
+        The length of a time bucket, or 1 if it isn't a whole number of days or hours
+    """
+    if granularity not in GRANULARITY_HOURS or filter_type not in FILTER_HOURS:
+        return 1
+    return max(1, GRANULARITY_HOURS[granularity] // FILTER_HOURS[filter_type])
+
+
+def window_length(
+    granularity: Granularity,
+    filter_type: FilterType,
+    *,
+    buckets: int = DEFAULT_BUCKETS_PER_WINDOW,
+) -> int | None:
+    """
+    Length of the sub-windows of a backfill, in units of the filter type
+
+    Args:
+        granularity: The size of the time buckets being fetched
+        filter_type: Whether the range is expressed in days or hours
+        buckets: Number of time buckets per sub-window
+
+    Returns:
+        The length of a sub-window, or None if the range can't be split
+    """
+    if filter_type not in FILTER_HOURS:
+        raise ValueError(f"Cannot backfill with filter type '{filter_type.value}'")
+    if granularity not in GRANULARITY_HOURS:
+        return None
+    return bucket_length(granularity, filter_type) * buckets
+
+
+def split_range(
+    start: int,
+    end: int,
+    length: int | None,
+    *,
+    align: int = 1,
+) -> List[Tuple[int, int]]:
+    """
+    Split a range into consecutive sub-windows
+
+    Args:
+        start: First day or hour of the range
+        end: Last day or hour of the range
+        length: Maximum length of a sub-window, or None to keep the range whole
+        align: Sub-windows after the first start on a multiple of it, so that no time bucket straddles two of them
+
+    Returns:
+        Sub-windows as tuples of their first and last day or hour, in chronological order
+    """
+    if end < start:
+        raise ValueError("The end of the range must not precede its start")
+    if length is None:
+        return [(start, end)]
+    if length % align:
+        raise ValueError(
+            "The length of the sub-windows must be a multiple of the alignment"
+        )
+    starts = [start, *range(start - start % align + length, end + 1, length)]
+    ends = [lo - 1 for lo in starts[1:]] + [end]
+    return list(zip(starts, ends))
+
+
+def row_time(row: Any, filter_type: FilterType) -> int | None:
+    """
+    The day or hour an effectiveness row is attributed to
+
+    Args:
+        row: An effectiveness row
+        filter_type: Whether to look for the day or the hour of the row
+
+    Returns:
+        The day or hour of the row
+    """
+    if filter_type == FilterType.HOUR:
+        return row.hour
+    return row.day if row.day is not None else row.start_day
+
+
+def backfill(
+    fetch: Callable[[int, int], Iterable[T]],
+    start: int,
+    end: int,
+    *,
+    length: int | None,
+    align: int = 1,
+    filter_type: FilterType,
+    concurrency: int,
+) -> Iterator[T]:
+    """
+    Fetch a range of effectiveness rows as sub-windows fetched concurrently
+
+    Every row is attributed to the sub-window its day or hour falls into, so rows are never duplicated across
+    sub-windows. Rows without a day or hour can only be told apart when the range is kept whole, and come last.
+
+    Args:
+        fetch: Fetches the rows of the sub-window between a first and last day or hour
+        start: First day or hour of the range
+        end: Last day or hour of the range
+        length: Maximum length of a sub-window, or None to keep the range whole
+        align: Length of a time bucket, which the edges of sub-windows are aligned to
+        filter_type: Whether the range is expressed in days or hours
+        concurrency: Maximum number of sub-windows fetched at the same time
+
+    Yields:
+        Rows in chronological order
+
+    Raises:
+        ValueError: If the range is split and a row has no day or hour to attribute it to a sub-window
+    """
+
+    def order(row: T) -> Tuple[bool, int, int]:
+        time = row_time(row, filter_type)
+        return time is None, time or 0, _validator_index(row)
+
+    def fetch_window(window: Tuple[int, int]) -> List[T]:
+        lo, hi = window
+        rows = list(fetch(lo, hi))
+        if length is None:
+            rows.sort(key=order)
+            return rows
+
+        kept = []
+        for row in rows:
+            time = row_time(row, filter_type)
+            if time is None:
+                raise ValueError(
+                    f"Cannot attribute a row without a {filter_type.value} to a sub-window"
+                )
+            if lo <= time <= hi:
+                kept.append(row)
+        kept.sort(key=order)
+        return kept
+
+    windows = split_range(start, end, length, align=align)
+    for result in run_concurrently(fetch_window, windows, concurrency=concurrency):
+        yield from result.unwrap()
+
+
+def _validator_index(row: Any) -> int:
+    index = getattr(row, "validator_index", None)
+    return -1 if index is None else index
@@ -1,10 +1,41 @@
 from __future__ import annotations
 
-from typing import Iterator, Any, Dict
+import http
+import time
+from typing import Iterable, Iterator, Any, Dict, List, Tuple
 
 from rated.base import APIResource
-from rated.client import json_to_instance
-from rated.ethereum.datatypes import Block as EthBlock
+from rated.client import RatedApiError, is_transient, json_to_instance
+from rated.concurrency import DEFAULT_CONCURRENCY, BatchResult, run_concurrently
+from rated.ethereum.chain import SECONDS_PER_SLOT, slot_start_time
+from rated.ethereum.datatypes import Block as EthBlock, SlotBlock
+from rated.ethereum.enums import SlotStatus
+
+
+def slot_block(result: BatchResult[int, EthBlock]) -> SlotBlock:
+    """
+    Tell a missed slot apart from a failed lookup
+
+    Args:
+        result: The outcome of looking up a single slot
+
+    Returns:
+        The slot, its status and its block if any
+    """
+    if result.ok:
+        block: EthBlock = result.unwrap()
+        status = SlotStatus.PROPOSED
+        if block.consensus_proposer_duty == SlotStatus.MISSED.value:
+            status = SlotStatus.MISSED
+        return SlotBlock(result.key, status, block=block)
+
+    error = result.error
+    if (
+        isinstance(error, RatedApiError)
+        and error.status_code == http.HTTPStatus.NOT_FOUND
+    ):
+        return SlotBlock(result.key, SlotStatus.MISSED)
+    return SlotBlock(result.key, SlotStatus.ERROR, error=error)
 
 
 class Blocks(APIResource):
@@ -52,6 +83,148 @@ class Blocks(APIResource):
             follow_next=follow_next,
         )
 
+    def range(
+        self,
+        start_slot: int,
+        end_slot: int,
+        *,
+        page_size: int = 100,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Iterator[SlotBlock]:
+        """
+        Get every slot between two slots, both included, in slot order
+
+        Slots are fetched concurrently, either as pages of the blocks listing or as single block lookups, whichever
+        needs fewer requests. Slots without a block are reported as missed, while slots that could not be fetched
+        are reported as errors.
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> for slot in eth.blocks.range(7502000, 7502100):
+            >>>     print(f"{slot.slot = }, {slot.status = }")
+
+        Args:
+            start_slot: First slot of the range
+            end_slot: Last slot of the range
+            page_size: Number of slots per page of the blocks listing
+            concurrency: Maximum number of requests in flight
+
+        Yields:
+            Every slot of the range with its status and block
+        """
+        if end_slot < start_slot:
+            raise ValueError("The end slot must not precede the start slot")
+
+        slot_count = end_slot - start_slot + 1
+        page_count = -(-slot_count // page_size)
+        if page_count >= slot_count:
+            slots = range(start_slot, end_slot + 1)
+            return Block(self.network).get_many(slots, concurrency=concurrency)
+
+        pages = [
+            (start, min(start + page_size - 1, end_slot))
+            for start in range(start_slot, end_slot + 1, page_size)
+        ]
+        return self._range_from_pages(pages, concurrency=concurrency)
+
+    def follow(
+        self,
+        start_slot: int | None = None,
+        *,
+        page_size: int = 100,
+        backoff: float = 1.0,
+        max_backoff: float = SECONDS_PER_SLOT,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Iterator[SlotBlock]:
+        """
+        Follow the head of the chain, yielding every slot once its block is available
+
+        Slots are yielded in order, each exactly once. While caught up with the Rated API, polling waits for the next
+        slot to start, then backs off exponentially until its block is indexed. Transient errors are retried in the
+        same way, while other errors are raised.
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> for slot in eth.blocks.follow():
+            >>>     print(f"{slot.slot = }, {slot.status = }")
+
+        Args:
+            start_slot: First slot to yield; defaults to the slot after the most recent block available
+            page_size: Number of slots per page of the blocks listing, when catching up
+            backoff: Seconds to wait before polling again for a block that isn't available yet, doubled every time
+            max_backoff: Longest wait between two polls
+            concurrency: Maximum number of requests in flight, when catching up
+
+        Yields:
+            Every slot from the start slot on, with its status and block
+        """
+        network = self.client.network
+        next_slot = start_slot
+        delay = backoff
+        while True:
+            try:
+                head = next(iter(self.all(size=1))).consensus_slot
+                if next_slot is None:
+                    next_slot = head + 1
+                if head >= next_slot:
+                    slots = self.range(
+                        next_slot, head, page_size=page_size, concurrency=concurrency
+                    )
+                    for slot in slots:
+                        if slot.error is not None:
+                            raise slot.error
+                        yield slot
+                        next_slot = slot.slot + 1
+                        delay = backoff
+                    continue
+            except Exception as exc:
+                if not is_transient(exc):
+                    raise
+            else:
+                # Caught up: nothing can be available before the next slot starts
+                starts_in = slot_start_time(next_slot, network) - time.time()
+                if starts_in > 0:
+                    time.sleep(starts_in)
+                    continue
+            time.sleep(delay)
+            delay = min(delay * 2, max_backoff)
+
+    def _range_from_pages(
+        self,
+        pages: Iterable[Tuple[int, int]],
+        *,
+        concurrency: int,
+    ) -> Iterator[SlotBlock]:
+        def fetch_page(page: Tuple[int, int]) -> List[EthBlock]:
+            # The listing goes backwards from the given slot
+            first, last = page
+            blocks = self.all(from_slot=last, size=last - first + 1)
+            return [b for b in blocks if first <= b.consensus_slot <= last]
+
+        for result in run_concurrently(fetch_page, pages, concurrency=concurrency):
+            first, last = result.key
+            if not result.ok:
+                for slot in range(first, last + 1):
+                    yield SlotBlock(slot, SlotStatus.ERROR, error=result.error)
+                continue
+
+            by_slot = {b.consensus_slot: b for b in result.unwrap()}
+            for slot in range(first, last + 1):
+                if slot in by_slot:
+                    yield slot_block(BatchResult(slot, value=by_slot[slot]))
+                else:
+                    yield SlotBlock(slot, SlotStatus.MISSED)
+
 
 class Block(APIResource):
     path = "/blocks"
@@ -78,3 +251,37 @@ class Block(APIResource):
         """
         data = self.client.get(f"{self.resource_path}/{slot}")
         return json_to_instance(data, EthBlock)
+
+    def get_many(
+        self,
+        slots: Iterable[int],
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        ordered: bool = True,
+    ) -> Iterator[SlotBlock]:
+        """
+        Get blocks for many consensus slots, fetched concurrently
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> for slot in eth.block.get_many([7502102, 7502398, 7510077], concurrency=4):
+            >>>     print(f"{slot.slot = }, {slot.status = }")
+
+        Args:
+            slots: Consensus slot numbers
+            concurrency: Maximum number of requests in flight
+            ordered: Yield slots in input order, otherwise as they complete
+
+        Yields:
+            Every slot with its status and block
+        """
+        results = run_concurrently(
+            self.get, slots, concurrency=concurrency, ordered=ordered
+        )
+        for result in results:
+            yield slot_block(result)
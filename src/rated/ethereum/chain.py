@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import time
+from datetime import date, datetime, timezone
+from typing import Dict
+
+# supported networks
+MAINNET = "mainnet"
+HOLESKY = "holesky"
+
+SLOTS_PER_EPOCH: int = 32
+
+# Rated numbers days from the day of the genesis of the beacon chain
+GENESIS_DATES: Dict[str, date] = {
+    MAINNET: date(2020, 12, 1),
+    HOLESKY: date(2023, 9, 28),
+}
+
+# First slot after the Merge
+MERGE_SLOTS: Dict[str, int] = {
+    MAINNET: 4700013,
+    HOLESKY: 0,
+}
+
+SECONDS_PER_SLOT: int = 12
+
+# Unix time of the genesis of the beacon chain
+GENESIS_TIMES: Dict[str, int] = {
+    MAINNET: 1606824023,
+    HOLESKY: 1695902400,
+}
+
+
+def slot_start_time(slot: int, network: str) -> int:
+    """
+    Unix time at which a slot starts
+
+    Args:
+        slot: Consensus slot number
+        network: The network of the slot
+
+    Returns:
+        The start of the slot
+    """
+    return GENESIS_TIMES[network] + slot * SECONDS_PER_SLOT
+
+
+def slot_day(slot: int, network: str) -> int:
+    """
+    The day number a slot starts on, counted in UTC from the genesis date like Rated does
+
+    Args:
+        slot: Consensus slot number
+        network: The network of the slot
+
+    Returns:
+        The day number
+    """
+    start = datetime.fromtimestamp(slot_start_time(slot, network), timezone.utc)
+    return (start.date() - GENESIS_DATES[network]).days
+
+
+def current_slot(network: str, now: float | None = None) -> int:
+    """
+    The slot in progress according to the slot clock
+
+    Args:
+        network: The network of the slot
+        now: Unix time; defaults to the current time
+
+    Returns:
+        The consensus slot number
+    """
+    now = time.time() if now is None else now
+    return int(now - GENESIS_TIMES[network]) // SECONDS_PER_SLOT
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, InitVar
+from dataclasses import dataclass, field, InitVar
 from datetime import datetime, date
 from typing import List, Dict, Any
 
+from rated.ethereum.enums import SlotStatus
+
 
 @dataclass
 class ValidatorMetadata:
@@ -94,6 +96,19 @@ class ValidatorEffectiveness:
     hour: int | None = None
 
 
+@dataclass
+class ReportProgress:
+    fingerprint: str
+    chunk_size: int
+    chunk_count: int
+    completed_chunks: List[int] = field(default_factory=list)
+    accepted: int = 0
+
+    @property
+    def done(self) -> bool:
+        return len(self.completed_chunks) == self.chunk_count
+
+
 @dataclass
 class NetworkStats:
     day: int
@@ -220,6 +235,14 @@ class Block:
     total_type3_tx_fees: int | None = None
 
 
+@dataclass
+class SlotBlock:
+    slot: int
+    status: SlotStatus
+    block: Block | None = None
+    error: Exception | None = None
+
+
 @dataclass
 class Withdrawal:
     validator_index: int
@@ -231,6 +254,22 @@ class Withdrawal:
     withdrawal_epoch: int
 
 
+@dataclass
+class WithdrawalEpochTotal:
+    epoch: int
+    validator_count: int = 0
+    withdrawable_amount: int = 0
+    withdrawable_amount_by_type: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class WithdrawalDayTotal:
+    day: int
+    validator_count: int = 0
+    withdrawable_amount: int = 0
+    withdrawable_amount_by_type: Dict[str, int] = field(default_factory=dict)
+
+
 @dataclass
 class P2PGeographicalDistribution:
     country: str
@@ -422,3 +461,18 @@ class Percentile:
     time_window: str
     rank: int
     value: float
+
+
+@dataclass
+class OperatorSnapshot:
+    id: str
+    id_type: str
+    metadata: Operator | None = None
+    clients: List[ClientPercentage] | None = None
+    summaries: Dict[str, OperatorSummary] = field(default_factory=dict)
+    aprs: Dict[str, OperatorApr] = field(default_factory=dict)
+    relayers: Dict[str, List[RelayerPercentage]] = field(default_factory=dict)
+    stake_movements: Dict[str, List[OperatorStakeMovement]] = field(
+        default_factory=dict
+    )
+    errors: Dict[str, Exception] = field(default_factory=dict)
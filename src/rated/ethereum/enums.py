@@ -56,3 +56,9 @@ class DistributionType(str, Enum):
 class ValidatorsEffectivenessGroupBy(str, Enum):
     TIME = "timeWindow"
     VALIDATOR = "validator"
+
+
+class SlotStatus(str, Enum):
+    PROPOSED = "proposed"
+    MISSED = "missed"
+    ERROR = "error"
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Any, Dict, Iterator
+from itertools import takewhile
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
 
 from rated.base import APIResource
 from rated.client import json_to_instance
+from rated.concurrency import DEFAULT_CONCURRENCY, run_concurrently
+from rated.ethereum.backfill import (
+    backfill,
+    bucket_length,
+    day_number,
+    row_time,
+    window_length,
+)
 from rated.ethereum.datatypes import (
     Operator as OperatorType,
+    OperatorSnapshot,
     OperatorEffectiveness,
     ClientPercentage,
     RelayerPercentage,
@@ -25,6 +35,14 @@ from rated.ethereum.enums import (
     PoolType,
 )
 
+# Views fetched for every time window of a snapshot, mapped to the field of the snapshot holding them
+SNAPSHOT_VIEWS: Dict[str, str] = {
+    "summary": "summaries",
+    "apr": "aprs",
+    "relayers": "relayers",
+    "stake_movement": "stake_movements",
+}
+
 
 class Operator(APIResource):
     """Querying into pre-materialized operator groupings."""
@@ -85,6 +103,70 @@ class Operator(APIResource):
             follow_next=follow_next,
         )
 
+    def effectiveness_backfill(
+        self,
+        operator_id: str,
+        id_type: IdType,
+        *,
+        from_day: int | date,
+        to_day: int | date,
+        size: int | None = None,
+        granularity: Granularity = Granularity.DAY,
+        filter_type: FilterType = FilterType.DAY,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Iterator[OperatorEffectiveness]:
+        """
+        Historical performance of a single operator over a range of days or hours, fetched concurrently as
+        sub-windows. The length of the sub-windows adapts to the granularity and filter type.
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> effectiveness = eth.operator.effectiveness_backfill("Lido", IdType.POOL, from_day=500, to_day=1100)
+            >>> for eff in effectiveness:
+            >>>     print(f"{eff.day = }, {eff.avg_validator_effectiveness = }")
+
+        Args:
+            operator_id: The name of the entity in question
+            id_type: The type of entity class
+            from_day: First day, or hour, of the range
+            to_day: Last day, or hour, of the range
+            size: Number of results included per page
+            granularity: The size of time increments you are looking to query
+            filter_type: Whether the range is expressed in days or hours
+            concurrency: Maximum number of sub-windows fetched at the same time
+
+        Yields:
+            Operator Effectiveness, in chronological order
+        """
+
+        def fetch(first: int, last: int) -> Iterator[OperatorEffectiveness]:
+            rows = self.effectiveness(
+                operator_id,
+                id_type,
+                from_day=last,
+                size=size,
+                granularity=granularity,
+                filter_type=filter_type,
+                follow_next=True,
+            )
+            return takewhile(lambda r: (row_time(r, filter_type) or 0) >= first, rows)
+
+        network = self.client.network
+        return backfill(
+            fetch,
+            day_number(from_day, network),
+            day_number(to_day, network),
+            length=window_length(granularity, filter_type),
+            align=bucket_length(granularity, filter_type),
+            filter_type=filter_type,
+            concurrency=concurrency,
+        )
+
     def metadata(self, operator_id: str, id_type: IdType) -> OperatorType:
         """
         Retrieve profile information on specific operators.
@@ -292,6 +374,98 @@ class Operator(APIResource):
         for item in data:
             yield json_to_instance(item, OperatorStakeMovement)
 
+    def snapshot(
+        self,
+        operator_ids: Sequence[str],
+        id_type: IdType,
+        *,
+        time_windows: Sequence[TimeWindow] = (TimeWindow.ONE_DAY,),
+        apr_type: AprType = AprType.BACKWARD,
+        stake_action: StakeAction = StakeAction.ACTIVATION,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[OperatorSnapshot]:
+        """
+        Every per-operator view for many operators and time windows, fetched concurrently.
+        A view that cannot be fetched is reported in the `errors` of its snapshot rather than raised.
+        Operators and time windows given more than once are fetched once.
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> windows = [TimeWindow.ONE_DAY, TimeWindow.THIRTY_DAYS]
+            >>> snapshots = eth.operator.snapshot(["Lido", "Coinbase"], IdType.POOL, time_windows=windows)
+            >>> for snap in snapshots:
+            >>>     print(f"{snap.id = }, {snap.summaries['30d'].avg_uptime = }, {snap.errors = }")
+
+        Args:
+            operator_ids: The names of the entities in question
+            id_type: The type of entity class
+            time_windows: The time windows of aggregation
+            apr_type: Direction of flow for the APR
+            stake_action: Direction of flow for the stake movement
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            A snapshot per distinct operator, in the order of `operator_ids`
+        """
+        operator_ids = list(dict.fromkeys(operator_ids))
+        time_windows = list(dict.fromkeys(time_windows))
+        requests: List[Tuple[str, str, TimeWindow | None]] = []
+        for operator_id in operator_ids:
+            requests.append((operator_id, "metadata", None))
+            requests.append((operator_id, "clients", None))
+            for time_window in time_windows:
+                requests.extend(
+                    (operator_id, view, time_window) for view in SNAPSHOT_VIEWS
+                )
+
+        def fetch(request: Tuple[str, str, TimeWindow | None]) -> Any:
+            operator_id, view, window = request
+            if view == "metadata":
+                return self.metadata(operator_id, id_type)
+            if view == "clients":
+                return list(self.clients(operator_id, id_type))
+
+            if window is None:
+                raise ValueError(f"The {view} view needs a time window")
+            if view == "summary":
+                return self.summary(operator_id, id_type, time_window=window)
+            if view == "apr":
+                return self.apr(
+                    operator_id, id_type, time_window=window, apr_type=apr_type
+                )
+            if view == "relayers":
+                return list(self.relayers(operator_id, id_type, time_window=window))
+            return list(
+                self.stake_movement(
+                    operator_id,
+                    id_type,
+                    stake_action=stake_action,
+                    time_window=window,
+                )
+            )
+
+        snapshots = {
+            operator_id: OperatorSnapshot(id=operator_id, id_type=id_type.value)
+            for operator_id in operator_ids
+        }
+        for result in run_concurrently(fetch, requests, concurrency=concurrency):
+            operator_id, view, window = result.key
+            snap = snapshots[operator_id]
+            if result.error is not None:
+                name = view if window is None else f"{view}:{window.value}"
+                snap.errors[name] = result.error
+            elif window is None:
+                setattr(snap, view, result.value)
+            else:
+                by_window: Dict[str, Any] = getattr(snap, SNAPSHOT_VIEWS[view])
+                by_window[window.value] = result.value
+        return list(snapshots.values())
+
 
 class Operators(APIResource):
     path = "/operators"
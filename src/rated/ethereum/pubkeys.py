@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import heapq
+import mmap
+import os
+import struct
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Tuple
+
+from rated.concurrency import chunked
+from rated.ethereum.datatypes import ValidatorMetadata
+
+if TYPE_CHECKING:
+    from rated.ethereum.validators import Validators
+
+# Length in bytes of a BLS public key
+PUBKEY_LENGTH: int = 48
+
+# A pubkey and its validator index, in the file sorted by pubkey
+RECORD = struct.Struct(f"<{PUBKEY_LENGTH}sQ")
+
+EMPTY_PUBKEY: bytes = bytes(PUBKEY_LENGTH)
+
+
+def normalize_pubkey(pubkey: str) -> str:
+    """
+    Normalize a validator pubkey to its lowercase, 0x-prefixed hex form
+
+    Args:
+        pubkey: Validator pubkey
+
+    Returns:
+        The normalized pubkey
+
+    Raises:
+        ValueError: If the pubkey is not 48 bytes of hex
+    """
+    hex_ = pubkey.strip().lower()
+    if hex_.startswith("0x"):
+        hex_ = hex_[2:]
+    try:
+        valid = len(bytes.fromhex(hex_)) == PUBKEY_LENGTH
+    except ValueError:
+        valid = False
+    if not valid:
+        raise ValueError(f"Invalid validator pubkey: '{pubkey}'")
+    return f"0x{hex_}"
+
+
+def pubkey_to_bytes(pubkey: str) -> bytes:
+    """Binary form of a validator pubkey"""
+    return bytes.fromhex(normalize_pubkey(pubkey)[2:])
+
+
+class PubkeyIndex:
+    """
+    A local, bidirectional mapping between validator pubkeys and indices
+
+    Pubkeys are stored as 48-byte binary keys in two memory-mapped files: one sorted by pubkey, searched with a
+    binary search, and one addressed by validator index.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """
+        Open the index stored at the given path, creating it if needed
+
+        Args:
+            path: Path of the file sorted by pubkey; the file addressed by index lives next to it
+        """
+        self.path = os.fspath(path)
+        self.by_index_path = f"{self.path}.by_index"
+        for p in (self.path, self.by_index_path):
+            if not os.path.exists(p):
+                open(p, "wb").close()
+        self._by_pubkey = _map(self.path)
+        self._by_index = _map(self.by_index_path)
+
+    def __len__(self) -> int:
+        return len(self._by_pubkey) // RECORD.size
+
+    def __contains__(self, pubkey: object) -> bool:
+        if not isinstance(pubkey, str):
+            return False
+        try:
+            return self.index_of(pubkey) is not None
+        except ValueError:
+            return False
+
+    @property
+    def max_index(self) -> int | None:
+        """Highest validator index known to the index"""
+        count = len(self._by_index) // PUBKEY_LENGTH
+        return count - 1 if count else None
+
+    def index_of(self, pubkey: str) -> int | None:
+        """
+        Look up the index of a validator
+
+        Args:
+            pubkey: Validator pubkey
+
+        Returns:
+            The validator index, or None if the pubkey is unknown
+
+        Raises:
+            ValueError: If the pubkey is not 48 bytes of hex
+        """
+        key = pubkey_to_bytes(pubkey)
+        data = self._by_pubkey
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = mid * RECORD.size
+            found = data[offset : offset + PUBKEY_LENGTH]
+            if found < key:
+                lo = mid + 1
+            elif found > key:
+                hi = mid
+            else:
+                return RECORD.unpack_from(data, offset)[1]
+        return None
+
+    def pubkey_of(self, index: int) -> str | None:
+        """
+        Look up the pubkey of a validator
+
+        Args:
+            index: Validator index
+
+        Returns:
+            The validator pubkey, or None if the index is unknown
+        """
+        offset = index * PUBKEY_LENGTH
+        key = self._by_index[offset : offset + PUBKEY_LENGTH]
+        if len(key) < PUBKEY_LENGTH or key == EMPTY_PUBKEY:
+            return None
+        return f"0x{key.hex()}"
+
+    def update(self, entries: Iterable[Tuple[str, int]]) -> int:
+        """
+        Add pubkeys and their validator indices
+
+        The file sorted by pubkey is rewritten by merging the new entries in, then atomically swapped.
+
+        Args:
+            entries: Tuples of pubkey and validator index
+
+        Returns:
+            Number of pubkeys added, leaving out the ones already known
+        """
+        new = sorted({(pubkey_to_bytes(p), i) for p, i in entries})
+        if not new:
+            return 0
+        known = len(self)
+
+        by_index_size = (max(i for _, i in new) + 1) * PUBKEY_LENGTH
+        current_size = len(self._by_index)
+        with open(self.by_index_path, "r+b") as f:
+            if by_index_size > current_size:
+                f.truncate(by_index_size)
+            for key, index in new:
+                f.seek(index * PUBKEY_LENGTH)
+                f.write(key)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            last = None
+            for key, index in heapq.merge(self._records(), new):
+                if key != last:
+                    f.write(RECORD.pack(key, index))
+                    last = key
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, self.path)
+
+        # The old maps are not closed here, as a lookup in another thread may still be reading them; they are
+        # released once the last reference to them is gone
+        self._by_pubkey = _map(self.path)
+        self._by_index = _map(self.by_index_path)
+        return len(self) - known
+
+    def add_metadata(self, metadata: Iterable[ValidatorMetadata]) -> int:
+        """
+        Add the pubkeys of validators
+
+        Args:
+            metadata: Validator metadata
+
+        Returns:
+            Number of pubkeys added, leaving out the ones already known
+        """
+        return self.update((m.validator_pubkey, m.validator_index) for m in metadata)
+
+    def refresh(
+        self,
+        validators: Validators,
+        *,
+        size: int = 100,
+        batch_size: int = 10_000,
+    ) -> int:
+        """
+        Add the validators created since the last refresh
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>> from rated.ethereum.pubkeys import PubkeyIndex
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> eth.pubkey_index = PubkeyIndex("pubkeys.bin")
+            >>> eth.pubkey_index.refresh(eth.validators)
+            >>> print(f"{eth.pubkey_index.index_of('0xb5bc...') = }")
+
+        Args:
+            validators: The validators resource to fetch metadata from
+            size: Number of results included per page
+            batch_size: Number of validators written to disk at once
+
+        Returns:
+            Number of entries added
+        """
+        max_index = self.max_index
+        metadata = validators.metadata(
+            from_index=0 if max_index is None else max_index + 1,
+            size=size,
+            follow_next=True,
+        )
+        return sum(self.add_metadata(batch) for batch in chunked(metadata, batch_size))
+
+    def close(self) -> None:
+        """Release the memory maps"""
+        _unmap(self._by_pubkey)
+        _unmap(self._by_index)
+
+    def _records(self) -> Iterator[Tuple[bytes, int]]:
+        return RECORD.iter_unpack(self._by_pubkey)  # type: ignore[return-value]
+
+
+def _map(path: str) -> Any:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _unmap(mapped: Any) -> None:
+    if isinstance(mapped, mmap.mmap):
+        mapped.close()
+
+
+def to_index(network: Any, index_or_pubkey: int | str) -> int | str:
+    """
+    Rewrite a pubkey to its validator index when the network has a pubkey index that knows it
+
+    Args:
+        network: The network being queried
+        index_or_pubkey: Validator index or pubkey
+
+    Returns:
+        The validator index if known, otherwise the argument unchanged, including strings that are not pubkeys
+    """
+    pubkey_index: PubkeyIndex | None = getattr(network, "pubkey_index", None)
+    if pubkey_index is None or not isinstance(index_or_pubkey, str):
+        return index_or_pubkey
+
+    try:
+        index = pubkey_index.index_of(index_or_pubkey)
+    except ValueError:
+        # Left for the API to interpret, as without a pubkey index
+        return index_or_pubkey
+    return index_or_pubkey if index is None else index
+
+
+def to_indices(network: Any, pubkeys: Iterable[str]) -> List[int] | None:
+    """
+    Rewrite pubkeys to validator indices when the network has a pubkey index that knows all of them
+
+    Args:
+        network: The network being queried
+        pubkeys: Validator pubkeys
+
+    Returns:
+        The validator indices, or None if any of the pubkeys is unknown
+    """
+    if getattr(network, "pubkey_index", None) is None:
+        return None
+
+    indices = [to_index(network, p) for p in pubkeys]
+    if any(isinstance(i, str) for i in indices):
+        return None
+    return indices  # type: ignore[return-value]
@@ -0,0 +1,455 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Tuple
+
+from rated.concurrency import chunked
+from rated.ethereum.datatypes import ValidatorMetadata
+from rated.ethereum.pubkeys import normalize_pubkey, pubkey_to_bytes
+
+if TYPE_CHECKING:
+    from rated.ethereum.validators import Validators
+
+# List fields of the metadata, stored one row per entry so they can be looked up
+LIST_FIELDS: Tuple[str, ...] = ("node_operators", "deposit_addresses", "dvt_operators")
+
+# Maximum number of host parameters in a single SQLite statement
+_MAX_PARAMS: int = 500
+
+_COLUMNS = (
+    "validator_index",
+    "validator_pubkey",
+    "pool",
+    "dvt_network",
+    "activation_epoch",
+    "activation_eligibility_epoch",
+    "exit_epoch",
+    "withdrawable_epoch",
+    "withdrawal_address",
+)
+
+
+@dataclass
+class RegistryChanges:
+    """Number of validators added and updated by a refresh"""
+
+    added: int = 0
+    updated: int = 0
+
+    def __add__(self, other: RegistryChanges) -> RegistryChanges:
+        return RegistryChanges(self.added + other.added, self.updated + other.updated)
+
+
+def normalize_metadata(metadata: ValidatorMetadata) -> ValidatorMetadata:
+    """
+    Normalize validator metadata to the form kept in the registry
+
+    Pubkeys and addresses are lowercased, and empty lists are stored as missing.
+
+    Args:
+        metadata: Validator metadata
+
+    Returns:
+        The normalized metadata
+    """
+
+    def lower(values: List[str] | None) -> List[str] | None:
+        return [v.lower() for v in values] if values else None
+
+    return ValidatorMetadata(
+        validator_index=metadata.validator_index,
+        validator_pubkey=normalize_pubkey(metadata.validator_pubkey),
+        pool=metadata.pool,
+        dvt_network=metadata.dvt_network,
+        node_operators=list(metadata.node_operators or []) or None,
+        deposit_addresses=lower(metadata.deposit_addresses),
+        dvt_operators=list(metadata.dvt_operators or []) or None,
+        activation_epoch=metadata.activation_epoch,
+        activation_eligibility_epoch=metadata.activation_eligibility_epoch,
+        exit_epoch=metadata.exit_epoch,
+        withdrawable_epoch=metadata.withdrawable_epoch,
+        withdrawal_address=(
+            metadata.withdrawal_address.lower() if metadata.withdrawal_address else None
+        ),
+    )
+
+
+class ValidatorRegistry:
+    """
+    A local mirror of validator metadata, answering lookups without calling the API
+
+    Validators are stored in SQLite, with pubkeys kept as 48-byte binary keys and indexes on every field that can
+    be looked up.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """
+        Open the registry at the given path, creating it if needed
+
+        Args:
+            path: Path of the SQLite database
+        """
+        self.connection = sqlite3.connect(os.fspath(path))
+        with self.connection:
+            self.connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS validators (
+                    validator_index INTEGER PRIMARY KEY,
+                    validator_pubkey BLOB NOT NULL UNIQUE,
+                    pool TEXT,
+                    dvt_network TEXT,
+                    activation_epoch INTEGER,
+                    activation_eligibility_epoch INTEGER,
+                    exit_epoch INTEGER,
+                    withdrawable_epoch INTEGER,
+                    withdrawal_address TEXT
+                );
+                CREATE INDEX IF NOT EXISTS validators_pool ON validators (pool);
+                CREATE INDEX IF NOT EXISTS validators_withdrawal_address ON validators (withdrawal_address);
+                CREATE TABLE IF NOT EXISTS validator_entities (
+                    validator_index INTEGER NOT NULL,
+                    field TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    PRIMARY KEY (validator_index, field, position)
+                );
+                CREATE INDEX IF NOT EXISTS validator_entities_name ON validator_entities (field, name);
+                """
+            )
+
+    def __len__(self) -> int:
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM validators").fetchone()
+        return count
+
+    def __contains__(self, index: object) -> bool:
+        return isinstance(index, int) and self.by_index(index) is not None
+
+    @property
+    def max_index(self) -> int | None:
+        """Highest validator index in the registry"""
+        (index,) = self.connection.execute(
+            "SELECT MAX(validator_index) FROM validators"
+        ).fetchone()
+        return index
+
+    def by_index(self, index: int) -> ValidatorMetadata | None:
+        """
+        Look up a validator by index
+
+        Args:
+            index: Validator index
+
+        Returns:
+            The validator metadata, or None if the index is unknown
+        """
+        found = self._select("validator_index = ?", (index,))
+        return next(found, None)
+
+    def by_pubkey(self, pubkey: str) -> ValidatorMetadata | None:
+        """
+        Look up a validator by pubkey
+
+        Args:
+            pubkey: Validator pubkey
+
+        Returns:
+            The validator metadata, or None if the pubkey is unknown
+        """
+        found = self._select("validator_pubkey = ?", (pubkey_to_bytes(pubkey),))
+        return next(found, None)
+
+    def by_operator(self, operator: str) -> Iterator[ValidatorMetadata]:
+        """
+        Validators run by a node operator, in index order
+
+        Args:
+            operator: Name of the node operator
+
+        Yields:
+            Validator metadata
+        """
+        return self._by_entity("node_operators", operator)
+
+    def by_dvt_operator(self, operator: str) -> Iterator[ValidatorMetadata]:
+        """
+        Validators run by a DVT operator, in index order
+
+        Args:
+            operator: Name of the DVT operator
+
+        Yields:
+            Validator metadata
+        """
+        return self._by_entity("dvt_operators", operator)
+
+    def by_deposit_address(self, address: str) -> Iterator[ValidatorMetadata]:
+        """
+        Validators funded from a deposit address, in index order
+
+        Args:
+            address: Deposit address
+
+        Yields:
+            Validator metadata
+        """
+        return self._by_entity("deposit_addresses", address.lower())
+
+    def by_pool(self, pool: str) -> Iterator[ValidatorMetadata]:
+        """
+        Validators of a pool, in index order
+
+        Args:
+            pool: Name of the pool
+
+        Yields:
+            Validator metadata
+        """
+        return self._select("pool = ?", (pool,))
+
+    def by_withdrawal_address(self, address: str) -> Iterator[ValidatorMetadata]:
+        """
+        Validators withdrawing to an address, in index order
+
+        Args:
+            address: Withdrawal address
+
+        Yields:
+            Validator metadata
+        """
+        return self._select("withdrawal_address = ?", (address.lower(),))
+
+    def upsert(self, metadata: Iterable[ValidatorMetadata]) -> RegistryChanges:
+        """
+        Add new validators and update the ones whose metadata changed
+
+        Validators whose metadata is unchanged are not written.
+
+        Args:
+            metadata: Validator metadata
+
+        Returns:
+            Number of validators added and updated
+        """
+        incoming: Dict[int, ValidatorMetadata] = {
+            m.validator_index: normalize_metadata(m) for m in metadata
+        }
+        if not incoming:
+            return RegistryChanges()
+
+        existing: Dict[int, ValidatorMetadata] = {}
+        for chunk in chunked(incoming, _MAX_PARAMS):
+            placeholders = ", ".join("?" * len(chunk))
+            for m in self._select(f"validator_index IN ({placeholders})", chunk):
+                existing[m.validator_index] = m
+
+        changed = [m for i, m in incoming.items() if existing.get(i) != m]
+        if not changed:
+            return RegistryChanges()
+
+        rows = [
+            (
+                m.validator_index,
+                pubkey_to_bytes(m.validator_pubkey),
+                m.pool,
+                m.dvt_network,
+                m.activation_epoch,
+                m.activation_eligibility_epoch,
+                m.exit_epoch,
+                m.withdrawable_epoch,
+                m.withdrawal_address,
+            )
+            for m in changed
+        ]
+        entities = [
+            (m.validator_index, field, position, name)
+            for m in changed
+            for field in LIST_FIELDS
+            for position, name in enumerate(getattr(m, field) or [])
+        ]
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM validator_entities WHERE validator_index = ?",
+                [
+                    (m.validator_index,)
+                    for m in changed
+                    if m.validator_index in existing
+                ],
+            )
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO validators VALUES ({', '.join('?' * len(_COLUMNS))})",
+                rows,
+            )
+            self.connection.executemany(
+                "INSERT INTO validator_entities VALUES (?, ?, ?, ?)", entities
+            )
+
+        added = sum(1 for m in changed if m.validator_index not in existing)
+        return RegistryChanges(added=added, updated=len(changed) - added)
+
+    def refresh(
+        self,
+        validators: Validators,
+        *,
+        size: int = 100,
+        batch_size: int = 10_000,
+    ) -> RegistryChanges:
+        """
+        Add the validators created since the last refresh
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>> from rated.ethereum.registry import ValidatorRegistry
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> registry = ValidatorRegistry("registry.db")
+            >>> changes = registry.refresh(eth.validators)
+            >>> for m in registry.by_operator("Kiln"):
+            >>>     print(f"{m.validator_index = }, {m.exit_epoch = }")
+
+        Args:
+            validators: The validators resource to fetch metadata from
+            size: Number of results included per page
+            batch_size: Number of validators written at once
+
+        Returns:
+            Number of validators added and updated
+        """
+        max_index = self.max_index
+        metadata = validators.metadata(
+            from_index=0 if max_index is None else max_index + 1,
+            size=size,
+            follow_next=True,
+        )
+        changes = RegistryChanges()
+        for batch in chunked(metadata, batch_size):
+            changes += self.upsert(batch)
+        return changes
+
+    def refresh_validators(
+        self,
+        validators: Validators,
+        indices: Iterable[int] | None = None,
+        *,
+        size: int = 100,
+        batch_size: int = 10_000,
+    ) -> RegistryChanges:
+        """
+        Fetch the metadata of known validators again, picking up exits and other changed fields
+
+        Metadata is paged through the validators listing, starting from the lowest index not fetched yet, so that
+        a run of consecutive indices costs a single request per page rather than one per validator. Only the
+        validators whose metadata changed are written.
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>> from rated.ethereum.registry import ValidatorRegistry
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> registry = ValidatorRegistry("registry.db")
+            >>> indices = [m.validator_index for m in registry.active(by_pool="Lido")]
+            >>> changes = registry.refresh_validators(eth.validators, indices)
+            >>> print(f"{changes.updated = }")
+
+        Args:
+            validators: The validators resource to fetch metadata from
+            indices: Validator indices to fetch again, or None for every validator
+            size: Number of results included per page
+            batch_size: Number of validators written at once
+
+        Returns:
+            Number of validators added and updated
+
+        Raises:
+            Exception: The first error met while fetching a page; every batch before it is written
+        """
+        if indices is None:
+            metadata = validators.metadata(from_index=0, size=size, follow_next=True)
+        else:
+            metadata = self._pages_of(validators, sorted(set(indices)), size)
+
+        changes = RegistryChanges()
+        for batch in chunked(metadata, batch_size):
+            changes += self.upsert(batch)
+        return changes
+
+    def active(self, *, by_pool: str | None = None) -> Iterator[ValidatorMetadata]:
+        """
+        Validators with no exit recorded yet, whose metadata may still change, in index order
+
+        Args:
+            by_pool: Only include validators of this pool
+
+        Yields:
+            Validator metadata
+        """
+        if by_pool is None:
+            return self._select("exit_epoch IS NULL", ())
+        return self._select("exit_epoch IS NULL AND pool = ?", (by_pool,))
+
+    def close(self) -> None:
+        """Close the database"""
+        self.connection.close()
+
+    def _by_entity(self, field: str, name: str) -> Iterator[ValidatorMetadata]:
+        return self._select(
+            "validator_index IN "
+            "(SELECT validator_index FROM validator_entities WHERE field = ? AND name = ?)",
+            (field, name),
+        )
+
+    def _select(self, where: str, params: Iterable) -> Iterator[ValidatorMetadata]:
+        cursor = self.connection.execute(
+            f"SELECT * FROM validators WHERE {where} ORDER BY validator_index",
+            tuple(params),
+        )
+        # Rows are read a batch at a time, along with the lists of the batch, so that lookups run in bounded memory
+        while True:
+            rows = cursor.fetchmany(_MAX_PARAMS)
+            if not rows:
+                break
+            lists = self._lists([row[0] for row in rows])
+            for row in rows:
+                values: Dict[str, Any] = dict(zip(_COLUMNS, row))
+                values["validator_pubkey"] = f"0x{bytes(row[1]).hex()}"
+                values.update(lists.get(row[0], {}))
+                yield ValidatorMetadata(**values)
+
+    @staticmethod
+    def _pages_of(
+        validators: Validators, indices: List[int], size: int
+    ) -> Iterator[ValidatorMetadata]:
+        """Metadata of sorted validator indices, paging the listing from the lowest index not fetched yet"""
+        position = 0
+        while position < len(indices):
+            page = list(validators.metadata(from_index=indices[position], size=size))
+            if not page:
+                break
+            end = bisect_right(indices, max(m.validator_index for m in page))
+            wanted = set(indices[position:end])
+            yield from (m for m in page if m.validator_index in wanted)
+            position = max(end, position + 1)
+            if len(page) < size:
+                break
+
+    def _lists(self, indices: List[int]) -> Dict[int, Dict[str, List[str]]]:
+        lists: Dict[int, Dict[str, List[str]]] = {}
+        for chunk in chunked(indices, _MAX_PARAMS):
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self.connection.execute(
+                "SELECT validator_index, field, name FROM validator_entities "
+                f"WHERE validator_index IN ({placeholders}) "
+                "ORDER BY validator_index, field, position",
+                chunk,
+            )
+            for index, field, name in rows:
+                lists.setdefault(index, {}).setdefault(field, []).append(name)
+        return lists
@@ -5,6 +5,7 @@ from typing import Iterator, Dict, Any
 
 from rated.base import APIResource
 from rated.client import json_to_instance
+from rated.ethereum.pubkeys import to_index
 from rated.ethereum.datatypes import (
     SlashingOverview,
     SlashingLeaderboard,
@@ -203,6 +204,7 @@ class Slashings(APIResource):
         Returns:
             Slashing penalty
         """
+        validator_index_or_pubkey = to_index(self.network, validator_index_or_pubkey)
         url: str = f"{self.resource_path}/{validator_index_or_pubkey}"
         data = self.client.get(url)
         return json_to_instance(data, SlashingPenalty)
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from rated.concurrency import chunked
+from rated.ethereum.datatypes import ValidatorEffectiveness
+
+# Number of rows summarized by a single zone of the zone map
+ZONE_ROWS: int = 4096
+
+# Every numeric field of an effectiveness row, with the array typecode it is stored as: 64-bit integers or doubles
+COLUMNS: Dict[str, str] = {
+    "validator_index": "q",
+    "total_attestations": "q",
+    "total_unique_attestations": "q",
+    "sum_correct_head": "q",
+    "sum_correct_target": "q",
+    "avg_correctness": "d",
+    "total_attestation_assignments": "q",
+    "avg_inclusion_delay": "d",
+    "sum_inclusion_delay": "d",
+    "uptime": "d",
+    "attester_effectiveness": "d",
+    "proposed_count": "q",
+    "proposer_duties_count": "q",
+    "proposer_effectiveness": "d",
+    "slashes_collected": "q",
+    "slashes_received": "q",
+    "earnings": "q",
+    "sync_signature_count": "q",
+    "validator_effectiveness": "d",
+    "estimated_rewards": "q",
+    "estimated_penalties": "q",
+    "sum_priority_fees": "q",
+    "sum_baseline_mev": "q",
+    "sum_missed_execution_rewards": "q",
+    "sum_consensus_block_rewards": "q",
+    "sum_missed_consensus_block_rewards": "q",
+    "sum_all_rewards": "q",
+    "sum_correct_source": "q",
+    "sum_missed_sync_signatures": "q",
+    "sum_sync_committee_penalties": "d",
+    "sum_late_source_votes": "q",
+    "sum_wrong_target_votes": "q",
+    "sum_late_target_votes": "q",
+    "sum_wrong_target_penalties": "d",
+    "sum_late_target_penalties": "d",
+    "sum_missed_attestations": "q",
+    "sum_missed_attestation_penalties": "d",
+    "sum_wrong_head_votes": "q",
+    "sum_wrong_head_penalties": "d",
+    "sum_attestation_rewards": "d",
+    "sum_late_source_penalties": "d",
+    "execution_proposed_empty_count": "q",
+    "sum_missed_attestation_rewards": "d",
+    "sum_missed_sync_committee_rewards": "d",
+    "sum_externally_sourced_execution_rewards": "q",
+    "day": "q",
+    "start_day": "q",
+    "end_day": "q",
+    "start_epoch": "q",
+    "end_epoch": "q",
+    "hour": "q",
+}
+
+KEY_COLUMNS: Tuple[str, str] = ("validator_index", "day")
+
+_INT64_MAX: int = 2**63 - 1
+_INT64_MIN: int = -(2**63)
+
+Value = Optional[Union[int, float]]
+
+
+class EffectivenessStore:
+    """
+    An append-only, columnar store of daily validator effectiveness
+
+    Every numeric field is kept in its own file of fixed-width values, next to a bitmap telling which values are set.
+    A zone map keeps the lowest and highest validator index and day of every block of rows, so range scans only
+    read the blocks that can match. Rows are kept in the order they were appended, and are expected to be keyed by
+    validator index and day. Pubkeys are not stored.
+
+    Files are memory-mapped for reads, and remapped after every append.
+    """
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        """
+        Open the store in the given directory, creating it if needed
+
+        Args:
+            directory: Directory holding the files of the store
+        """
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._rows = 0
+        meta_path = self._path("meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self._rows = json.load(f)["rows"]
+
+        self._maps: Dict[str, Any] = {}
+        self._zones = array("q")
+        zones_path = self._path("zones")
+        if os.path.exists(zones_path):
+            with open(zones_path, "rb") as f:
+                self._zones.frombytes(f.read())
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def append(self, rows: Iterable[ValidatorEffectiveness]) -> int:
+        """
+        Append effectiveness rows to the store
+
+        Rows only become visible once every column is written, so an interrupted append leaves the store as it was.
+
+        Args:
+            rows: Effectiveness rows, each with a validator index and a day
+
+        Returns:
+            Number of rows appended
+
+        Raises:
+            ValueError: If a row misses its validator index or day
+        """
+        rows = list(rows)
+        if any(getattr(r, k) is None for r in rows for k in KEY_COLUMNS):
+            raise ValueError("Every row must have a validator index and a day")
+        if not rows:
+            return 0
+
+        self._unmap()
+        start = self._rows
+        for name, typecode in COLUMNS.items():
+            values = [getattr(r, name) for r in rows]
+            self._append_column(name, typecode, values, start)
+
+        for position, row in enumerate(rows, start):
+            self._update_zone(position // ZONE_ROWS, row.validator_index, row.day)  # type: ignore[arg-type]
+        self._write_atomically("zones", self._zones.tobytes())
+
+        self._rows = start + len(rows)
+        self._write_atomically("meta.json", json.dumps({"rows": self._rows}).encode())
+        return len(rows)
+
+    def ingest(
+        self,
+        rows: Iterable[ValidatorEffectiveness],
+        *,
+        batch_size: int = 10_000,
+    ) -> int:
+        """
+        Append rows as they come from an effectiveness iterator, in batches
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>> from rated.ethereum.timeseries import EffectivenessStore
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> store = EffectivenessStore("effectiveness")
+            >>> store.ingest(eth.validators.effectiveness_backfill(indices=[100, 101], from_day=900, to_day=1000))
+            >>> columns = store.read_columns(["day", "uptime"], from_index=100, to_index=100)
+
+        Args:
+            rows: Effectiveness rows, each with a validator index and a day
+            batch_size: Number of rows appended at once
+
+        Returns:
+            Number of rows appended
+        """
+        return sum(self.append(batch) for batch in chunked(rows, batch_size))
+
+    def read_columns(
+        self,
+        columns: Sequence[str],
+        *,
+        from_index: int | None = None,
+        to_index: int | None = None,
+        from_day: int | None = None,
+        to_day: int | None = None,
+    ) -> Dict[str, List[Value]]:
+        """
+        Read some columns of the rows within a range of validator indices and days, all bounds included
+
+        Args:
+            columns: Names of the columns to read
+            from_index: Lowest validator index
+            to_index: Highest validator index
+            from_day: First day
+            to_day: Last day
+
+        Returns:
+            The values of every column, in the order rows were appended; missing values are None
+        """
+        result: Dict[str, List[Value]] = {name: [] for name in columns}
+        for block in self._scan(columns, from_index, to_index, from_day, to_day):
+            for name in columns:
+                result[name].extend(block[name])
+        return result
+
+    def scan(
+        self,
+        *,
+        from_index: int | None = None,
+        to_index: int | None = None,
+        from_day: int | None = None,
+        to_day: int | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> Iterator[ValidatorEffectiveness]:
+        """
+        Rows within a range of validator indices and days, all bounds included
+
+        Args:
+            from_index: Lowest validator index
+            to_index: Highest validator index
+            from_day: First day
+            to_day: Last day
+            columns: Names of the columns to read; defaults to every column
+
+        Yields:
+            Effectiveness rows, in the order they were appended
+        """
+        names = list(COLUMNS if columns is None else columns)
+        for block in self._scan(names, from_index, to_index, from_day, to_day):
+            for values in zip(*(block[name] for name in names)):
+                yield ValidatorEffectiveness(**dict(zip(names, values)))
+
+    def _scan(
+        self,
+        columns: Sequence[str],
+        from_index: int | None,
+        to_index: int | None,
+        from_day: int | None,
+        to_day: int | None,
+    ) -> Iterator[Dict[str, List[Value]]]:
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+
+        lo_index = _INT64_MIN if from_index is None else from_index
+        hi_index = _INT64_MAX if to_index is None else to_index
+        lo_day = _INT64_MIN if from_day is None else from_day
+        hi_day = _INT64_MAX if to_day is None else to_day
+
+        for zone in range(-(-self._rows // ZONE_ROWS)):
+            min_index, max_index, min_day, max_day = self._zones[
+                zone * 4 : zone * 4 + 4
+            ]
+            if max_index < lo_index or min_index > hi_index:
+                continue
+            if max_day < lo_day or min_day > hi_day:
+                continue
+
+            start = zone * ZONE_ROWS
+            stop = min(start + ZONE_ROWS, self._rows)
+            indices = self._read_values("validator_index", start, stop)
+            days = self._read_values("day", start, stop)
+            selected = [
+                i
+                for i in range(stop - start)
+                if lo_index <= indices[i] <= hi_index and lo_day <= days[i] <= hi_day
+            ]
+            if not selected:
+                continue
+
+            block: Dict[str, List[Value]] = {}
+            for name in columns:
+                values = self._read_values(name, start, stop)
+                valid = self._read_validity(name, start, stop)
+                block[name] = [
+                    values[i] if valid[i >> 3] >> (i & 7) & 1 else None
+                    for i in selected
+                ]
+            yield block
+
+    def _append_column(
+        self,
+        name: str,
+        typecode: str,
+        values: List[Value],
+        start: int,
+    ) -> None:
+        data = array(typecode, (0 if v is None else v for v in values))
+        with open(self._path(f"{name}.values"), "ab+") as f:
+            # Drop whatever an interrupted append left past the last visible row
+            f.truncate(start * data.itemsize)
+            f.write(data.tobytes())
+
+        with open(self._path(f"{name}.valid"), "ab+") as f:
+            f.seek(start // 8)
+            bitmap = bytearray(f.read(1) if start % 8 else b"")
+            if bitmap:
+                bitmap[0] &= (1 << start % 8) - 1
+            for offset, value in enumerate(values, start % 8):
+                if offset >> 3 >= len(bitmap):
+                    bitmap.append(0)
+                if value is not None:
+                    bitmap[offset >> 3] |= 1 << (offset & 7)
+            f.truncate(start // 8)
+            f.write(bitmap)
+
+    def _update_zone(self, zone: int, index: int, day: int) -> None:
+        if zone * 4 >= len(self._zones):
+            self._zones.extend([index, index, day, day])
+            return
+        z = zone * 4
+        self._zones[z] = min(self._zones[z], index)
+        self._zones[z + 1] = max(self._zones[z + 1], index)
+        self._zones[z + 2] = min(self._zones[z + 2], day)
+        self._zones[z + 3] = max(self._zones[z + 3], day)
+
+    def close(self) -> None:
+        """Release the memory maps"""
+        self._unmap()
+
+    def _read_values(self, name: str, start: int, stop: int) -> array:
+        values = array(COLUMNS[name])
+        data = self._map(f"{name}.values")
+        values.frombytes(data[start * values.itemsize : stop * values.itemsize])
+        return values
+
+    def _read_validity(self, name: str, start: int, stop: int) -> bytes:
+        # Zones start on a byte boundary of the bitmap
+        return self._map(f"{name}.valid")[start // 8 : -(-stop // 8)]
+
+    def _map(self, name: str) -> Any:
+        if name not in self._maps:
+            with open(self._path(name), "rb") as f:
+                empty = os.fstat(f.fileno()).st_size == 0
+                self._maps[name] = (
+                    b"" if empty else mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+        return self._maps[name]
+
+    def _unmap(self) -> None:
+        for mapped in self._maps.values():
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        self._maps.clear()
+
+    def _write_atomically(self, name: str, data: bytes) -> None:
+        tmp_path = self._path(f"{name}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path(name))
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from typing import AbstractSet, Any, Callable, Iterable, Iterator, List, Tuple
+
+from rated.ethereum.datatypes import ValidatorMetadata
+
+# Positions of the bits set in every byte value
+_BYTE_BITS: List[Tuple[int, ...]] = [
+    tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)
+]
+
+
+class ValidatorSet(AbstractSet[int]):
+    """
+    An immutable set of validator indices, stored as a bitset
+
+    Every validator index is a single bit of an integer, so set algebra runs over whole machine words and a million
+    validators fit in 125 kB. Membership is tested on the bytes of the bitset, built once on first use. A validator
+    set can be passed directly as `indices` wherever validator indices are accepted.
+    """
+
+    __slots__ = ("_bitmap", "_bits")
+
+    def __init__(self, indices: Iterable[int] = ()) -> None:
+        """
+        Initialize a set of validator indices
+
+        Args:
+            indices: Validator indices
+        """
+        indices = list(indices)
+        bitmap = bytearray((max(indices, default=-1) >> 3) + 1)
+        for index in indices:
+            if index < 0:
+                raise ValueError(f"Invalid validator index: {index}")
+            bitmap[index >> 3] |= 1 << (index & 7)
+        self._bits: int = int.from_bytes(bitmap, "little")
+        self._bitmap: bytes | None = None
+
+    @classmethod
+    def from_metadata(
+        cls,
+        metadata: Iterable[ValidatorMetadata],
+        *,
+        where: Callable[[ValidatorMetadata], bool] | None = None,
+    ) -> ValidatorSet:
+        """
+        Build a set from a stream of validator metadata
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>> from rated.ethereum.enums import IdType
+            >>> from rated.ethereum.validator_set import ValidatorSet
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> kiln = ValidatorSet.from_metadata(eth.validators.metadata(operators_ids=["Kiln"], follow_next=True))
+            >>> lido = eth.validators.metadata(operators_ids=["Lido"], id_type=IdType.POOL, follow_next=True)
+            >>> exited = ValidatorSet.from_metadata(lido, where=lambda m: m.exit_epoch is not None)
+            >>> print(f"{len(kiln & exited) = }")
+
+        Args:
+            metadata: Validator metadata
+            where: Only include the validators for which this returns True
+
+        Returns:
+            The set of their validator indices
+        """
+        return cls(m.validator_index for m in metadata if where is None or where(m))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> ValidatorSet:
+        """
+        Load a set saved with `to_bytes`
+
+        Args:
+            data: The bitset, least significant bit first
+
+        Returns:
+            The validator set
+        """
+        return cls._from_bits(int.from_bytes(data, "little"))
+
+    def to_bytes(self) -> bytes:
+        """The bitset, least significant bit first"""
+        if self._bitmap is None:
+            self._bitmap = self._bits.to_bytes(
+                (self._bits.bit_length() + 7) // 8, "little"
+            )
+        return self._bitmap
+
+    @classmethod
+    def _from_bits(cls, bits: int) -> ValidatorSet:
+        validator_set = cls.__new__(cls)
+        validator_set._bits = bits
+        validator_set._bitmap = None
+        return validator_set
+
+    def __contains__(self, index: object) -> bool:
+        if not isinstance(index, int) or index < 0:
+            return False
+        bitmap = self.to_bytes()
+        position = index >> 3
+        return position < len(bitmap) and bool(bitmap[position] >> (index & 7) & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        for position, byte in enumerate(self.to_bytes()):
+            if byte:
+                base = position << 3
+                for bit in _BYTE_BITS[byte]:
+                    yield base + bit
+
+    def __len__(self) -> int:
+        bit_count = getattr(self._bits, "bit_count", None)
+        if bit_count is not None:
+            return bit_count()
+        return bin(self._bits).count("1")
+
+    def __bool__(self) -> bool:
+        return self._bits != 0
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ValidatorSet):
+            return self._bits == other._bits
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash(self._bits)
+
+    def __repr__(self) -> str:
+        return f"ValidatorSet(<{len(self)} validators>)"
+
+    def __or__(self, other: AbstractSet[Any]) -> ValidatorSet:
+        return self._from_bits(self._bits | _bits(other))
+
+    def __and__(self, other: AbstractSet[Any]) -> ValidatorSet:
+        return self._from_bits(self._bits & _bits(other))
+
+    def __sub__(self, other: AbstractSet[Any]) -> ValidatorSet:
+        return self._from_bits(self._bits & ~_bits(other))
+
+    def __xor__(self, other: AbstractSet[Any]) -> ValidatorSet:
+        return self._from_bits(self._bits ^ _bits(other))
+
+    __ror__ = __or__
+    __rand__ = __and__
+    __rxor__ = __xor__
+
+    def __rsub__(self, other: AbstractSet[Any]) -> ValidatorSet:
+        return self._from_bits(_bits(other) & ~self._bits)
+
+    def union(self, *others: Iterable[int]) -> ValidatorSet:
+        """Validators in this set or any of the others"""
+        bits = self._bits
+        for other in others:
+            bits |= _bits(other)
+        return self._from_bits(bits)
+
+    def intersection(self, *others: Iterable[int]) -> ValidatorSet:
+        """Validators in this set and all of the others"""
+        bits = self._bits
+        for other in others:
+            bits &= _bits(other)
+        return self._from_bits(bits)
+
+    def difference(self, *others: Iterable[int]) -> ValidatorSet:
+        """Validators in this set but in none of the others"""
+        bits = self._bits
+        for other in others:
+            bits &= ~_bits(other)
+        return self._from_bits(bits)
+
+
+def _bits(indices: Iterable[int]) -> int:
+    if isinstance(indices, ValidatorSet):
+        return indices._bits
+    return ValidatorSet(indices)._bits
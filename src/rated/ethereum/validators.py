@@ -1,11 +1,40 @@
 from __future__ import annotations
 
+import hashlib
 from datetime import date
-from typing import Iterator, Dict, Any, List, Sequence, Union
+from itertools import chain, takewhile
+from typing import (
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    Dict,
+    Any,
+    List,
+    Sequence,
+    Union,
+)
 
 from rated.base import APIResource
-from rated.client import json_to_instance
+from rated.client import is_transient, json_to_instance
+from rated.concurrency import (
+    DEFAULT_CONCURRENCY,
+    BatchResult,
+    chunked,
+    run_concurrently,
+    with_retries,
+)
+from rated.ethereum.aggregation import merge_by_time_window
+from rated.ethereum.backfill import (
+    backfill,
+    bucket_length,
+    day_number,
+    split_range,
+    window_length,
+)
+from rated.ethereum.pubkeys import normalize_pubkey, to_index, to_indices
 from rated.ethereum.datatypes import (
+    ReportProgress,
     ValidatorAPR,
     ValidatorMetadata,
     ValidatorEffectiveness,
@@ -19,6 +48,15 @@ from rated.ethereum.enums import (
     ValidatorsEffectivenessGroupBy,
 )
 
+# Keep the query string of a single request well under common URL length limits
+MAX_INDICES_PER_REQUEST: int = 250
+MAX_PUBKEYS_PER_REQUEST: int = 40
+
+# Keep the body of a single self-report upload small enough to go through before timing out
+MAX_PUBKEYS_PER_REPORT: int = 1000
+
+REPORT_URL: str = "/v0/selfReports/validators"
+
 
 class Validator(APIResource):
     path = "/validators"
@@ -43,9 +81,48 @@ class Validator(APIResource):
         Returns:
             Metadata about the validator
         """
+        index_or_pubkey = to_index(self.network, index_or_pubkey)
         validator = self.client.get(f"{self.resource_path}/{index_or_pubkey}")
         return json_to_instance(validator, ValidatorMetadata)
 
+    def metadata_many(
+        self,
+        indices_or_pubkeys: Iterable[int | str],
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult[int | str, ValidatorMetadata]]:
+        """
+        Metadata for many validators, fetched concurrently
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> for result in eth.validator.metadata_many([560000, 560001], concurrency=16):
+            >>>     if result.ok:
+            >>>         print(f"{result.key = }, {result.value.node_operators = }")
+            >>>     else:
+            >>>         print(f"{result.key = }, {result.error = }")
+
+        Args:
+            indices_or_pubkeys: Validator indices or pubkeys
+            concurrency: Maximum number of requests in flight
+            ordered: Yield results in input order, otherwise as they complete
+
+        Yields:
+            The metadata, or the error raised, for every validator
+        """
+        return run_concurrently(
+            self.metadata,
+            indices_or_pubkeys,
+            concurrency=concurrency,
+            ordered=ordered,
+        )
+
     def apr(
         self,
         index_or_pubkey: int | str,
@@ -74,6 +151,7 @@ class Validator(APIResource):
         Returns:
             APR %
         """
+        index_or_pubkey = to_index(self.network, index_or_pubkey)
         params = {"aprType": apr_type.value, "window": time_window.value}
         apr = self.client.get(
             f"{self.resource_path}/{index_or_pubkey}/apr",
@@ -81,6 +159,47 @@ class Validator(APIResource):
         )
         return json_to_instance(apr, ValidatorAPR)
 
+    def apr_many(
+        self,
+        indices_or_pubkeys: Iterable[int | str],
+        *,
+        apr_type: AprType = AprType.BACKWARD,
+        time_window: TimeWindow = TimeWindow.ONE_DAY,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult[int | str, ValidatorAPR]]:
+        """
+        Historical returns of many validators, fetched concurrently
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> aprs = eth.validator.apr_many([560000, 560001], time_window=TimeWindow.THIRTY_DAYS)
+            >>> for result in aprs:
+            >>>     if result.ok:
+            >>>         print(f"{result.key = }, {result.value.percentage = }%")
+
+        Args:
+            indices_or_pubkeys: Validator indices or pubkeys
+            apr_type: Direction of flow
+            time_window: The time window of aggregation
+            concurrency: Maximum number of requests in flight
+            ordered: Yield results in input order, otherwise as they complete
+
+        Yields:
+            The APR, or the error raised, for every validator
+        """
+        return run_concurrently(
+            lambda key: self.apr(key, apr_type=apr_type, time_window=time_window),
+            indices_or_pubkeys,
+            concurrency=concurrency,
+            ordered=ordered,
+        )
+
     def effectiveness(
         self,
         index_or_pubkey: int | str,
@@ -116,6 +235,7 @@ class Validator(APIResource):
         if from_ is not None and isinstance(from_, date):
             from_ = from_.isoformat()
 
+        index_or_pubkey = to_index(self.network, index_or_pubkey)
         params: Dict[str, Any] = {"from": from_, "size": size}
         url = f"{self.resource_path}/{index_or_pubkey}/effectiveness"
         return self.client.yield_paginated_results(
@@ -125,6 +245,56 @@ class Validator(APIResource):
             follow_next=follow_next,
         )
 
+    def effectiveness_backfill(
+        self,
+        index_or_pubkey: int | str,
+        *,
+        from_day: int | date,
+        to_day: int | date,
+        size: int | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Iterator[ValidatorEffectiveness]:
+        """
+        Historical performance of a single validator index over a range of days, fetched concurrently as sub-windows
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> effectiveness = eth.validator.effectiveness_backfill(560000, from_day=500, to_day=1100)
+            >>> for eff in effectiveness:
+            >>>     print(f"{eff.day = }, {eff.validator_effectiveness = }")
+
+        Args:
+            index_or_pubkey: Validator index or pubkey
+            from_day: First day of the range
+            to_day: Last day of the range
+            size: Number of results included per page
+            concurrency: Maximum number of sub-windows fetched at the same time
+
+        Yields:
+            Effectiveness metrics, in chronological order
+        """
+
+        def fetch(first: int, last: int) -> Iterator[ValidatorEffectiveness]:
+            rows = self.effectiveness(
+                index_or_pubkey, from_day=last, size=size, follow_next=True
+            )
+            return takewhile(lambda r: (r.day or 0) >= first, rows)
+
+        network = self.client.network
+        return backfill(
+            fetch,
+            day_number(from_day, network),
+            day_number(to_day, network),
+            length=window_length(Granularity.DAY, FilterType.DAY),
+            filter_type=FilterType.DAY,
+            concurrency=concurrency,
+        )
+
 
 class Validators(APIResource):
     path = "/validators"
@@ -182,8 +352,8 @@ class Validators(APIResource):
     def effectiveness(
         self,
         *,
-        pubkeys: List[str] | None = None,
-        indices: List[int] | None = None,
+        pubkeys: Sequence[str] | None = None,
+        indices: Collection[int] | None = None,
         from_day: int | date | None = None,
         to_day: Union[int, date] | None = None,
         filter_type: FilterType = FilterType.DAY,
@@ -191,11 +361,16 @@ class Validators(APIResource):
         granularity: Granularity | None = None,
         group_by: ValidatorsEffectivenessGroupBy = ValidatorsEffectivenessGroupBy.VALIDATOR,
         follow_next: bool = False,
+        chunk_size: int | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
     ) -> Iterator[ValidatorEffectiveness]:
         """
         Enables the aggregation of all the metrics that live under Validators across an arbitrary number of validator
         indices or pubkeys
 
+        Long lists of pubkeys or indices are split into chunks which are fetched concurrently. When grouping by
+        time window, the rows of every chunk are combined so there is a single row per time window.
+
         Examples:
             >>> from rated import Rated
             >>> from rated.ethereum import MAINNET
@@ -209,7 +384,7 @@ class Validators(APIResource):
 
         Args:
             pubkeys: Array of pubkeys
-            indices: Array of indices
+            indices: Array of indices, or a validator set
             from_day: Start day
             to_day: End day
             filter_type: Type of filter to apply to from
@@ -217,6 +392,8 @@ class Validators(APIResource):
             granularity: The size of time increments you are looking to query
             group_by: Time window or validator; we either group by validator index or across time
             follow_next: Whether to follow pagination or not
+            chunk_size: Maximum number of pubkeys or indices per request
+            concurrency: Maximum number of chunks fetched at the same time
 
         Yields:
             Effectiveness metrics
@@ -235,9 +412,19 @@ class Validators(APIResource):
         if pubkeys and indices:
             raise ValueError("Cannot specify both pubkeys and indices")
 
+        if pubkeys:
+            resolved = to_indices(self.network, pubkeys)
+            if resolved is not None:
+                pubkeys, indices = None, resolved
+
+        key_name = "pubkeys" if pubkeys else "indices"
+        keys: List[Any] = list(pubkeys or indices or [])
+        max_keys = chunk_size or (
+            MAX_PUBKEYS_PER_REQUEST if pubkeys else MAX_INDICES_PER_REQUEST
+        )
+
         params: Dict[str, Any] = {
-            "pubkeys": pubkeys,
-            "indices": indices,
+            key_name: keys,
             "from": from_,
             "to": to_,
             "filterType": filter_type.value,
@@ -246,17 +433,131 @@ class Validators(APIResource):
             "groupBy": group_by.value,
         }
         url = f"{self.resource_path}/effectiveness"
-        return self.client.yield_paginated_results(
-            url,
-            params=params,
-            cls=ValidatorEffectiveness,
-            follow_next=follow_next,
+        if len(keys) <= max_keys:
+            return self.client.yield_paginated_results(
+                url,
+                params=params,
+                cls=ValidatorEffectiveness,
+                follow_next=follow_next,
+            )
+
+        def fetch_chunk(chunk: List[Any]) -> List[ValidatorEffectiveness]:
+            results = self.client.yield_paginated_results(
+                url,
+                params={**params, key_name: chunk},
+                cls=ValidatorEffectiveness,
+                follow_next=follow_next,
+            )
+            return list(results)
+
+        chunks = run_concurrently(
+            fetch_chunk, chunked(keys, max_keys), concurrency=concurrency
+        )
+        pages = (chunk.unwrap() for chunk in chunks)
+        if group_by == ValidatorsEffectivenessGroupBy.TIME:
+            return merge_by_time_window(pages)
+        return chain.from_iterable(pages)
+
+    def effectiveness_backfill(
+        self,
+        *,
+        pubkeys: Sequence[str] | None = None,
+        indices: Collection[int] | None = None,
+        from_day: int | date,
+        to_day: int | date,
+        filter_type: FilterType = FilterType.DAY,
+        size: int = 10,
+        granularity: Granularity | None = None,
+        group_by: ValidatorsEffectivenessGroupBy = ValidatorsEffectivenessGroupBy.VALIDATOR,
+        chunk_size: int | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Iterator[ValidatorEffectiveness]:
+        """
+        Aggregated metrics of many validators over a range of days or hours, fetched concurrently as sub-windows.
+        The length of the sub-windows adapts to the granularity and filter type.
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> effectiveness = eth.validators.effectiveness_backfill(indices=[500, 501], from_day=500, to_day=1100)
+            >>> for eff in effectiveness:
+            >>>     print(f"{eff.day = }, {eff.validator_index = }, {eff.validator_effectiveness = }")
+
+        Args:
+            pubkeys: Array of pubkeys
+            indices: Array of indices, or a validator set
+            from_day: First day, or hour, of the range
+            to_day: Last day, or hour, of the range
+            filter_type: Whether the range is expressed in days or hours
+            size: Number of results included per page
+            granularity: The size of time increments you are looking to query
+            group_by: Time window or validator; we either group by validator index or across time
+            chunk_size: Maximum number of pubkeys or indices per request
+            concurrency: Maximum number of requests in flight, shared between the sub-windows and their chunks
+
+        Yields:
+            Effectiveness metrics, in chronological order
+        """
+        network = self.client.network
+        start, end = day_number(from_day, network), day_number(to_day, network)
+        length = window_length(granularity or Granularity.DAY, filter_type)
+        align = bucket_length(granularity or Granularity.DAY, filter_type)
+
+        # Every sub-window fetched at the same time gets an equal share of the requests for its chunks
+        windows = len(split_range(start, end, length, align=align))
+        chunk_concurrency = max(1, concurrency // windows)
+
+        def fetch(first: int, last: int) -> Iterator[ValidatorEffectiveness]:
+            return self.effectiveness(
+                pubkeys=pubkeys,
+                indices=indices,
+                from_day=first,
+                to_day=last,
+                filter_type=filter_type,
+                size=size,
+                granularity=granularity,
+                group_by=group_by,
+                follow_next=True,
+                chunk_size=chunk_size,
+                concurrency=chunk_concurrency,
+            )
+
+        return backfill(
+            fetch,
+            start,
+            end,
+            length=length,
+            align=align,
+            filter_type=filter_type,
+            concurrency=concurrency,
         )
 
-    def report(self, validators: Sequence[str], *, pool_tag: str | None = None) -> int:
+    def report(
+        self,
+        validators: Sequence[str],
+        *,
+        pool_tag: str | None = None,
+        chunk_size: int = MAX_PUBKEYS_PER_REPORT,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = 3,
+        backoff: float = 0.5,
+        progress: ReportProgress | None = None,
+        on_progress: Callable[[ReportProgress], None] | None = None,
+    ) -> int:
         """
         Gateway for node operators to "upload" their sets
 
+        Pubkeys are normalized and deduplicated, then uploaded concurrently in chunks. Every chunk is retried on its
+        own when the upload fails on network or server errors. For very large sets, pass a `progress` record from a
+        previous attempt to only upload the chunks that have not been accepted yet.
+
+        Every pubkey is checked before anything is uploaded, so that a malformed one fails the whole report rather
+        than being left to the API. An empty set is not uploaded at all, and reports 0 validators.
+
         Examples:
             >>> from rated import Rated
             >>> from rated.ethereum import MAINNET
@@ -269,12 +570,57 @@ class Validators(APIResource):
         Args:
             validators: Array of validator pubkeys associated with the node operator
             pool_tag: Pool name as they appear in the Rated Explorer
+            chunk_size: Maximum number of pubkeys per upload
+            concurrency: Maximum number of chunks uploaded at the same time
+            retries: Maximum number of retries per chunk
+            backoff: Seconds to wait before retrying a chunk, doubled on every retry
+            progress: Progress of a previous attempt at reporting the same set
+            on_progress: Called with the progress every time a chunk is accepted, e.g. to persist it
 
         Returns:
             Number of accepted validators
+
+        Raises:
+            ValueError: If a pubkey is not 48 bytes of hex, or the progress belongs to a different set
         """
-        url = "/v0/selfReports/validators"
-        data = {"validators": validators, "poolTag": pool_tag}
-        res = self.client.post(url, json=data)
-        count = len(res.json()["validators"])
-        return count
+        pubkeys = list(dict.fromkeys(normalize_pubkey(v) for v in validators))
+        chunks = list(chunked(pubkeys, chunk_size))
+
+        digest = hashlib.sha256()
+        for pubkey in pubkeys:
+            digest.update(pubkey.encode())
+        fingerprint = f"{digest.hexdigest()}:{pool_tag}:{chunk_size}"
+
+        if progress is None:
+            progress = ReportProgress(fingerprint, chunk_size, len(chunks))
+        elif progress.fingerprint != fingerprint:
+            raise ValueError("Progress does not belong to this set of validators")
+
+        def upload(chunk_index: int) -> int:
+            data = {"validators": chunks[chunk_index], "poolTag": pool_tag}
+            res = with_retries(
+                lambda: self.client.post(REPORT_URL, json=data),
+                retries=retries,
+                backoff=backoff,
+                retry_on=is_transient,
+            )
+            return len(res.json()["validators"])
+
+        completed = set(progress.completed_chunks)
+        pending = [i for i in range(len(chunks)) if i not in completed]
+        errors: List[Exception] = []
+        for result in run_concurrently(
+            upload, pending, concurrency=concurrency, ordered=False
+        ):
+            if result.error is not None:
+                errors.append(result.error)
+                continue
+
+            progress.completed_chunks.append(result.key)
+            progress.accepted += result.unwrap()
+            if on_progress:
+                on_progress(progress)
+
+        if errors:
+            raise errors[0]
+        return progress.accepted
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Iterator, Dict, Any
+from itertools import chain
+from typing import Iterator, Dict, Any, List, Set, Tuple
 
 from rated.base import APIResource
 from rated.client import json_to_instance
-from rated.ethereum.datatypes import Withdrawal
+from rated.concurrency import DEFAULT_CONCURRENCY, run_concurrently
+from rated.ethereum.chain import SLOTS_PER_EPOCH
+from rated.ethereum.datatypes import Withdrawal, WithdrawalEpochTotal
 
 
 class Withdrawals(APIResource):
@@ -82,3 +85,109 @@ class Withdrawals(APIResource):
         data = self.client.get(url)
         for item in data:
             yield json_to_instance(item, Withdrawal)
+
+    def by_slot_range(
+        self,
+        start_slot: int,
+        end_slot: int,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Iterator[Withdrawal]:
+        """
+        Returns all the validators that are expected to withdraw between two slots, both included
+
+        Slots are fetched concurrently while withdrawals are yielded in slot order. A slot that cannot be fetched
+        fails the whole range once the withdrawals of the slots before it have been yielded, so that a gap is never
+        mistaken for a slot without withdrawals.
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> withdrawals = eth.withdrawals.by_slot_range(8432961, 8440161, concurrency=16)
+            >>> for w in withdrawals:
+            >>>     print(f"{w.withdrawal_slot = }, {w.id = }, {w.withdrawable_amount = }")
+
+        Args:
+            start_slot: First withdrawal slot number
+            end_slot: Last withdrawal slot number
+            concurrency: Maximum number of slots fetched at the same time
+
+        Yields:
+            Withdrawal
+
+        Raises:
+            ValueError: If the end slot precedes the start slot
+            RatedApiError: The error of the first slot that could not be fetched
+        """
+        if end_slot < start_slot:
+            raise ValueError("The end slot must not precede the start slot")
+
+        def fetch_slot(slot: int) -> List[Withdrawal]:
+            return list(self.by_slot(slot))
+
+        slots = range(start_slot, end_slot + 1)
+        results = run_concurrently(fetch_slot, slots, concurrency=concurrency)
+        return chain.from_iterable(result.unwrap() for result in results)
+
+    def totals_by_epoch(
+        self,
+        start_slot: int,
+        end_slot: int,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Iterator[WithdrawalEpochTotal]:
+        """
+        Expected withdrawals between two slots, both included, summed up per epoch
+
+        A validator is listed once for every entity it belongs to, so every validator is only counted once per slot.
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> totals = eth.withdrawals.totals_by_epoch(8432960, 8440159)
+            >>> for t in totals:
+            >>>     print(f"{t.epoch = }, {t.validator_count = }, {t.withdrawable_amount = }")
+
+        Args:
+            start_slot: First withdrawal slot number
+            end_slot: Last withdrawal slot number
+            concurrency: Maximum number of slots fetched at the same time
+
+        Yields:
+            Withdrawal totals for every epoch of the range
+
+        Raises:
+            RatedApiError: The error of the first slot that could not be fetched, rather than totals missing a slot
+        """
+        withdrawals = self.by_slot_range(start_slot, end_slot, concurrency=concurrency)
+        total = WithdrawalEpochTotal(epoch=start_slot // SLOTS_PER_EPOCH)
+        seen: Set[Tuple[int, int]] = set()
+        for w in withdrawals:
+            while w.withdrawal_epoch > total.epoch:
+                yield total
+                total = WithdrawalEpochTotal(epoch=total.epoch + 1)
+                seen.clear()
+
+            key = (w.validator_index, w.withdrawal_slot)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            total.validator_count += 1
+            total.withdrawable_amount += w.withdrawable_amount
+            by_type = total.withdrawable_amount_by_type
+            by_type[w.withdrawal_type] = (
+                by_type.get(w.withdrawal_type, 0) + w.withdrawable_amount
+            )
+
+        yield total
+        for epoch in range(total.epoch + 1, end_slot // SLOTS_PER_EPOCH + 1):
+            yield WithdrawalEpochTotal(epoch=epoch)
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Sequence
+
+from rated.concurrency import DEFAULT_CONCURRENCY
+from rated.ethereum.backfill import split_range
+from rated.ethereum.blocks import Blocks
+from rated.ethereum.chain import MERGE_SLOTS
+from rated.ethereum.datatypes import Block, SlotBlock
+
+
+@dataclass
+class SyncProgress:
+    """Progress and throughput of a sync"""
+
+    start_slot: int
+    end_slot: int
+    last_slot: int | None = None
+    slots_synced: int = 0
+    blocks_written: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def remaining_slots(self) -> int:
+        """Number of slots left to sync"""
+        last = self.start_slot - 1 if self.last_slot is None else self.last_slot
+        return max(0, self.end_slot - last)
+
+    @property
+    def slots_per_second(self) -> float:
+        """Slots synced per second"""
+        return self.slots_synced / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def blocks_per_second(self) -> float:
+        """Blocks written per second"""
+        return self.blocks_written / self.elapsed if self.elapsed else 0.0
+
+
+class SQLiteBlockStore:
+    """A local store of blocks, keyed by slot, with a checkpoint of the last slot synced"""
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """
+        Open the store at the given path, creating it if needed
+
+        Args:
+            path: Path of the SQLite database
+        """
+        self.connection = sqlite3.connect(os.fspath(path))
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS blocks ("
+                "consensus_slot INTEGER PRIMARY KEY, "
+                "epoch INTEGER NOT NULL, "
+                "validator_index INTEGER NOT NULL, "
+                "data TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoint ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), "
+                "last_slot INTEGER NOT NULL)"
+            )
+
+    def __len__(self) -> int:
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM blocks").fetchone()
+        return count
+
+    def last_slot(self) -> int | None:
+        """The last slot persisted, if any"""
+        row = self.connection.execute("SELECT last_slot FROM checkpoint").fetchone()
+        return row[0] if row else None
+
+    def write(self, blocks: Sequence[Block], *, last_slot: int) -> None:
+        """
+        Persist blocks and move the checkpoint in a single transaction
+
+        Writing a block again replaces it, so replaying a batch never creates duplicates.
+
+        Args:
+            blocks: Blocks to persist
+            last_slot: The last slot covered by this batch
+        """
+        rows = [
+            (
+                b.consensus_slot,
+                b.epoch,
+                b.validator_index,
+                json.dumps(dataclasses.asdict(b), default=str),
+            )
+            for b in blocks
+        ]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?)", rows
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO checkpoint VALUES (0, ?)", (last_slot,)
+            )
+
+    def get(self, slot: int) -> Block | None:
+        """
+        Get a persisted block by consensus slot number
+
+        Args:
+            slot: Consensus slot number
+
+        Returns:
+            The block, or None if there is no block for this slot
+        """
+        row = self.connection.execute(
+            "SELECT data FROM blocks WHERE consensus_slot = ?", (slot,)
+        ).fetchone()
+        return Block(**json.loads(row[0])) if row else None
+
+    def blocks(self, *, from_slot: int = 0) -> Iterator[Block]:
+        """
+        Persisted blocks in slot order
+
+        Args:
+            from_slot: First slot
+
+        Yields:
+            Blocks
+        """
+        rows = self.connection.execute(
+            "SELECT data FROM blocks WHERE consensus_slot >= ? ORDER BY consensus_slot",
+            (from_slot,),
+        )
+        for (data,) in rows:
+            yield Block(**json.loads(data))
+
+    def close(self) -> None:
+        """Close the database"""
+        self.connection.close()
+
+
+class BlockSync:
+    """Incrementally mirror blocks into a local store, resuming from its checkpoint"""
+
+    def __init__(
+        self,
+        blocks: Blocks,
+        store: SQLiteBlockStore,
+        *,
+        start_slot: int | None = None,
+        batch_size: int = 1000,
+        page_size: int = 100,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> None:
+        """
+        Initialize a sync of blocks into a store
+
+        Args:
+            blocks: The blocks resource to sync from
+            store: The store to sync to
+            start_slot: First slot to sync when the store is empty; defaults to the first slot after the Merge
+            batch_size: Number of slots persisted per transaction
+            page_size: Number of slots per page of the blocks listing
+            concurrency: Maximum number of requests in flight
+        """
+        self.blocks = blocks
+        self.store = store
+        if start_slot is None:
+            start_slot = MERGE_SLOTS[blocks.client.network]
+        self.start_slot: int = start_slot
+        self.batch_size = batch_size
+        self.page_size = page_size
+        self.concurrency = concurrency
+
+    def head_slot(self) -> int:
+        """The most recent slot with a block available from the Rated API"""
+        return next(iter(self.blocks.all(size=1))).consensus_slot
+
+    def run(
+        self,
+        *,
+        end_slot: int | None = None,
+        on_progress: Callable[[SyncProgress], None] | None = None,
+    ) -> SyncProgress:
+        """
+        Sync blocks from the checkpoint of the store up to a slot
+
+        Examples:
+            >>> from rated import Rated
+            >>> from rated.ethereum import MAINNET
+            >>> from rated.sync import BlockSync, SQLiteBlockStore
+            >>>
+            >>> RATED_KEY = "ey..."
+            >>> r = Rated(RATED_KEY)
+            >>> eth = r.ethereum(network=MAINNET)
+            >>> sync = BlockSync(eth.blocks, SQLiteBlockStore("blocks.db"))
+            >>> progress = sync.run(on_progress=lambda p: print(f"{p.last_slot = }, {p.slots_per_second = }"))
+
+        Args:
+            end_slot: Last slot to sync; defaults to the most recent slot with a block
+            on_progress: Called with the progress after every batch
+
+        Returns:
+            The progress of the sync
+
+        Raises:
+            Exception: The first error met while fetching a batch; every batch before it is persisted
+        """
+        last_slot = self.store.last_slot()
+        start_slot = self.start_slot if last_slot is None else last_slot + 1
+        if end_slot is None:
+            end_slot = self.head_slot()
+
+        progress = SyncProgress(start_slot, end_slot, last_slot=last_slot)
+        if end_slot < start_slot:
+            return progress
+
+        started = time.monotonic()
+        for first, last in split_range(start_slot, end_slot, self.batch_size):
+            slots: List[SlotBlock] = list(
+                self.blocks.range(
+                    first,
+                    last,
+                    page_size=self.page_size,
+                    concurrency=self.concurrency,
+                )
+            )
+            for slot in slots:
+                if slot.error is not None:
+                    raise slot.error
+
+            batch = [s.block for s in slots if s.block is not None]
+            self.store.write(batch, last_slot=last)
+
+            progress.last_slot = last
+            progress.slots_synced += len(slots)
+            progress.blocks_written += len(batch)
+            progress.elapsed = time.monotonic() - started
+            if on_progress:
+                on_progress(progress)
+        return progress
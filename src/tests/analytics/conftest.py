@@ -0,0 +1,12 @@
+import pytest
+
+import rated.analytics.columns
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(rated.analytics.columns, "HAS_NUMPY", False)
+    return request.param
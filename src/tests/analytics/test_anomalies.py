@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from rated.analytics.anomalies import AnomalyDetector, Baseline
+from rated.ethereum.datatypes import ValidatorEffectiveness
+
+
+def _rows(hours, validators=50):
+    rng = random.Random(3)
+    for hour in range(hours):
+        for index in range(validators):
+            uptime = 0.99 + rng.uniform(-0.005, 0.005)
+            if index == 3:
+                # Steadily behind the fleet, but in line with its own history
+                uptime = 0.8
+            if index == 7 and hour == 20:
+                uptime = 0.5
+            yield ValidatorEffectiveness(
+                validator_index=index,
+                hour=hour,
+                day=hour // 24,
+                uptime=uptime,
+                attester_effectiveness=None if index == 9 else 0.95,
+            )
+
+
+def test_detector_flags_drops_against_history_and_fleet():
+    detector = AnomalyDetector(window=12, capacity=4)
+    anomalies = list(detector.detect(_rows(30)))
+
+    assert len(detector) == 50
+    by_validator = {}
+    for a in anomalies:
+        by_validator.setdefault(a.validator_index, []).append(a)
+
+    assert by_validator.keys() == {3, 7}
+    # Validator 3 only ever deviates from the fleet, from the second hour on, except right after the drop of
+    # validator 7 widens the spread of the fleet
+    assert {a.baseline for a in by_validator[3]} == {Baseline.FLEET}
+    assert [a.hour for a in by_validator[3]] == [h for h in range(1, 30) if h != 21]
+
+    drop = by_validator[7]
+    assert {(a.hour, a.baseline) for a in drop} == {
+        (20, Baseline.HISTORY),
+        (20, Baseline.FLEET),
+    }
+    history = next(a for a in drop if a.baseline == Baseline.HISTORY)
+    assert history.field == "uptime"
+    assert history.value == 0.5
+    assert history.expected == pytest.approx(0.99, abs=0.005)
+    assert history.deviation < -3
+
+
+def test_detector_keeps_rolling_windows():
+    detector = AnomalyDetector(["uptime"], window=4, capacity=1)
+    for hour in range(6):
+        detector.update(
+            ValidatorEffectiveness(validator_index=5, hour=hour, uptime=hour)
+        )
+    detector.update(ValidatorEffectiveness(validator_index=8, hour=6, uptime=1.0))
+
+    assert detector.history(5, "uptime") == [2.0, 3.0, 4.0, 5.0]
+    assert detector.history(8, "uptime") == [1.0]
+    assert detector.history(9, "uptime") == []
+
+    rings = detector._rings["uptime"]
+    assert rings.stats(0) == (4, 3.5, pytest.approx(1.118, abs=1e-3))
+    assert len(rings.values) == 4 * 2
+
+
+def test_detector_two_sided():
+    rows = [
+        ValidatorEffectiveness(validator_index=1, day=d, uptime=0.5) for d in range(6)
+    ]
+    rows.append(ValidatorEffectiveness(validator_index=1, day=6, uptime=0.9))
+
+    assert list(AnomalyDetector(min_history=6).detect(rows)) == []
+    rises = list(AnomalyDetector(min_history=6, two_sided=True).detect(rows))
+    assert [(a.day, a.baseline, a.deviation) for a in rises] == [
+        (6, Baseline.HISTORY, float("inf"))
+    ]
+
+    with pytest.raises(ValueError):
+        AnomalyDetector(window=0)
+
+
+def test_detector_needs_rows_in_time_order():
+    # Newest first, as the API returns effectiveness when not backfilled
+    rows = sorted(_rows(3), key=lambda r: r.hour, reverse=True)
+    detector = AnomalyDetector()
+
+    with pytest.raises(ValueError, match="time order"):
+        list(detector.detect(rows))
+    assert len(detector) == 50
@@ -0,0 +1,103 @@
+import pytest
+
+from rated.analytics.apr import group_apr, validator_apr
+from rated.analytics.columns import to_columns
+from rated.ethereum.datatypes import OperatorApr, ValidatorAPR, ValidatorEffectiveness
+from rated.ethereum.enums import IdType, TimeWindow
+
+FEES, MEV = 300_000, 200_000
+
+
+def _row(index, day):
+    consensus = 2_500_000 + 10_000 * index
+    # Older days earn far more, so that leaking them into the window would show
+    if day < 1000:
+        consensus *= 10
+    return ValidatorEffectiveness(
+        validator_index=index,
+        day=day,
+        sum_all_rewards=consensus + FEES + MEV,
+        sum_priority_fees=FEES,
+        sum_baseline_mev=MEV,
+    )
+
+
+ROWS = [_row(i, d) for d in range(990, 1030) for i in range(4)]
+
+
+def test_validator_apr(backend):
+    aprs = validator_apr(ROWS, time_window=TimeWindow.THIRTY_DAYS)
+
+    assert sorted(aprs) == [0, 1, 2, 3]
+    apr = aprs[0]
+    # 3,000,000 gwei a day on a stake of 32 ETH: 3e6 * 365 / 32e9 = 3.421875% a year, of which 2,500,000 gwei is
+    # consensus rewards and 500,000 gwei priority fees and MEV
+    assert apr.percentage == pytest.approx(3.421875)
+    assert apr.percentage_consensus == pytest.approx(2.8515625)
+    assert apr.percentage_execution == pytest.approx(0.5703125)
+    assert apr.active_stake == 32 * 10**9
+    assert apr.active_validators == 1
+    # 3,030,000 gwei a day: 3.03e6 * 365 / 32e9
+    assert aprs[3].percentage == pytest.approx(3.45609375)
+
+    assert isinstance(apr, ValidatorAPR)
+    assert (apr.validator_index, apr.id_type, apr.time_window, apr.apr_type) == (
+        0,
+        "validator",
+        "30d",
+        "backward",
+    )
+
+
+def test_group_apr(backend):
+    labels = {0: "Kiln", 1: ["Kiln", "Figment"], 2: "Figment"}
+    aprs = group_apr(
+        to_columns(ROWS),
+        labels,
+        time_window=TimeWindow.SEVEN_DAYS,
+        id_type=IdType.NODE_OPERATOR,
+    )
+
+    assert aprs.keys() == {"Kiln", "Figment"}
+    kiln = aprs["Kiln"]
+    # Validators 0 and 1 earn 3,000,000 and 3,010,000 gwei a day on 64 ETH: 6.01e6 * 365 / 64e9 = 3.427578125%,
+    # of which 5,010,000 gwei is consensus rewards and 1,000,000 gwei priority fees and MEV
+    assert kiln.percentage == pytest.approx(3.427578125)
+    assert kiln.percentage_consensus == pytest.approx(2.857265625)
+    assert kiln.percentage_execution == pytest.approx(0.5703125)
+    assert kiln.active_stake == pytest.approx(64 * 10**9)
+    assert kiln.active_validators == 2
+    # Validators 1 and 2 earn 3,010,000 and 3,020,000 gwei a day: 6.03e6 * 365 / 64e9
+    assert aprs["Figment"].percentage == pytest.approx(3.438984375)
+
+    assert isinstance(kiln, OperatorApr)
+    assert (kiln.id, kiln.id_type, kiln.time_window, kiln.apr_type) == (
+        "Kiln",
+        "nodeOperator",
+        "7d",
+        "backward",
+    )
+
+
+def test_apr_over_all_time_averages_stake(backend):
+    # Validator 0 only shows up for the last 20 of 40 days
+    rows = [r for r in ROWS if r.validator_index != 0 or r.day >= 1010]
+
+    apr = group_apr(rows, lambda index: "all")["all"]
+
+    assert apr.active_validators == 4
+    assert apr.active_stake == pytest.approx(3.5 * 32 * 10**9)
+    assert group_apr([], lambda index: "all") == {}
+
+
+def test_apr_over_history_shorter_than_the_window(backend):
+    # Only 3 days are cached for a 7-day window
+    rows = [r for r in ROWS if r.day >= 1027]
+
+    aprs = validator_apr(rows, time_window=TimeWindow.SEVEN_DAYS)
+    apr = group_apr(rows, lambda index: "all", time_window=TimeWindow.SEVEN_DAYS)
+
+    assert aprs[0].active_validators == 1
+    assert aprs[0].active_stake == 32 * 10**9
+    assert aprs[0].percentage == pytest.approx(3.421875)
+    assert apr["all"].active_validators == 4
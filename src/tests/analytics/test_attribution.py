@@ -0,0 +1,117 @@
+from collections import defaultdict
+
+import pytest
+
+from rated.analytics.attribution import ValidatorLabels, attribute
+from rated.ethereum.datatypes import Block, SlotBlock, ValidatorMetadata
+from rated.ethereum.enums import SlotStatus
+
+METADATA = [
+    ValidatorMetadata(
+        validator_index=i,
+        validator_pubkey="0x",
+        pool="Lido" if i % 2 else None,
+        node_operators=["Kiln", "Lido"]
+        if i % 3 == 0
+        else ["Figment"]
+        if i < 8
+        else None,
+    )
+    for i in range(12)
+    if i != 5
+]
+
+
+def _block(slot):
+    missed = slot % 9 == 0
+    return Block(
+        epoch=slot // 32,
+        consensus_slot=slot,
+        # Validator 5 has no metadata, and validator 20 is beyond the known indices
+        validator_index=20 if slot % 17 == 0 else slot % 12,
+        relays=[],
+        block_builder_pubkeys=[],
+        execution_proposer_duty="missed" if missed else "proposed",
+        consensus_proposer_duty="missed" if missed else "proposed",
+        total_rewards=None if missed else 3 * 10**18 + slot,
+        missed_execution_rewards=10**17 + slot if missed else 0,
+    )
+
+
+BLOCKS = [_block(slot) for slot in range(500)]
+
+
+def _expected(field):
+    by_index = {m.validator_index: getattr(m, field) for m in METADATA}
+    groups = defaultdict(list)
+    for block in BLOCKS:
+        labels = by_index.get(block.validator_index)
+        for label in (labels if isinstance(labels, list) else [labels]) or [None]:
+            groups[label].append(block)
+    return groups
+
+
+@pytest.mark.parametrize("field", ["node_operators", "pool"])
+def test_attribute_matches_dict_join(backend, field):
+    labels = ValidatorLabels(iter(METADATA), field=field)
+    totals = attribute(iter(BLOCKS), labels, page_size=64)
+
+    expected = _expected(field)
+    assert totals.keys() == expected.keys()
+    for label, blocks in expected.items():
+        t = totals[label]
+        assert t.blocks == len(blocks)
+        assert t.missed_blocks == sum(
+            b.consensus_proposer_duty == "missed" for b in blocks
+        )
+        assert t.share == len(blocks) / len(BLOCKS)
+        assert t.total_rewards == sum(b.total_rewards or 0 for b in blocks)
+        assert t.missed_execution_rewards == sum(
+            b.missed_execution_rewards for b in blocks
+        )
+
+
+def test_attribute_consumes_the_stream_page_by_page(backend):
+    labels = ValidatorLabels(METADATA)
+    consumed = []
+
+    def stream():
+        for block in BLOCKS:
+            consumed.append(block.consensus_slot)
+            yield block
+
+    assert attribute(stream(), labels, page_size=100)["Kiln"].blocks == len(
+        _expected("node_operators")["Kiln"]
+    )
+    assert len(consumed) == len(BLOCKS)
+    assert attribute([], labels) == {}
+
+
+def test_attribute_slots_skips_missed_slots(backend):
+    labels = ValidatorLabels(METADATA)
+    slots = [SlotBlock(b.consensus_slot, SlotStatus.PROPOSED, b) for b in BLOCKS]
+    # A whole page of missed slots
+    slots[100:100] = [SlotBlock(slot, SlotStatus.MISSED) for slot in range(500, 520)]
+
+    assert attribute(slots, labels, page_size=16) == attribute(BLOCKS, labels)
+
+
+def test_attribute_fails_on_slots_not_fetched(backend):
+    labels = ValidatorLabels(METADATA)
+    slots = [SlotBlock(b.consensus_slot, SlotStatus.PROPOSED, b) for b in BLOCKS]
+    slots.insert(250, SlotBlock(500, SlotStatus.ERROR, error=TimeoutError("slot 500")))
+
+    with pytest.raises(TimeoutError, match="slot 500"):
+        attribute(slots, labels, page_size=64)
+
+
+def test_labels(backend):
+    labels = ValidatorLabels(METADATA)
+
+    assert len(labels) == 8
+    assert labels.combinations == [("Kiln", "Lido"), ("Figment",)]
+    assert labels.of(3) == ("Kiln", "Lido")
+    assert labels.of(5) == ()
+    assert labels.of(10_000) == ()
+    assert list(labels.lookup([0, 1, 5, 11, -1, 10_000])) == [0, 1, -1, -1, -1, -1]
+    assert list(labels.lookup([1, 8], missing=9)) == [1, 9]
@@ -0,0 +1,150 @@
+from collections import defaultdict
+
+import pytest
+
+from rated.analytics.blocks import (
+    block_columns,
+    breakdown,
+    by_builder,
+    by_epoch,
+    by_fee_recipient,
+    by_relay,
+    explode,
+)
+from rated.ethereum.datatypes import Block, SlotBlock
+from rated.ethereum.enums import SlotStatus
+
+RELAYS = [[], ["flashbots"], ["flashbots", "ultrasound"], ["agnostic"]]
+
+
+def _block(slot):
+    missed = slot % 11 == 0
+    relays = [] if missed else RELAYS[slot % 4]
+    return Block(
+        epoch=slot // 32,
+        consensus_slot=slot,
+        validator_index=slot % 7,
+        relays=relays,
+        block_builder_pubkeys=[f"0xb{len(r)}" for r in relays],
+        execution_proposer_duty="missed" if missed else "proposed",
+        consensus_proposer_duty="missed" if missed else "proposed",
+        fee_recipient=None if missed else f"0xf{slot % 3}",
+        total_priority_fees=None if missed else 10**16 + slot,
+        baseline_mev=None if missed or not relays else 4 * 10**18 + slot,
+        missed_execution_rewards=10**17 if missed else 0,
+        missed_consensus_rewards=0.5 if missed else 0.0,
+        total_gas_used=None if missed else 15_000_000,
+    )
+
+
+BLOCKS = [_block(slot) for slot in range(320)]
+
+
+def _expected(label_of):
+    groups = defaultdict(list)
+    for block in BLOCKS:
+        for label in label_of(block):
+            groups[label].append(block)
+    return groups
+
+
+def _total(blocks, name):
+    values = [getattr(b, name) for b in blocks if getattr(b, name) is not None]
+    return sum(values) if values else None
+
+
+@pytest.mark.parametrize(
+    "breakdown_by, label_of",
+    [
+        (by_relay, lambda b: b.relays or [None]),
+        (by_builder, lambda b: b.block_builder_pubkeys or [None]),
+        (by_fee_recipient, lambda b: [b.fee_recipient]),
+        (by_epoch, lambda b: [b.epoch]),
+    ],
+)
+def test_breakdowns_match_plain_totals(backend, breakdown_by, label_of):
+    expected = _expected(label_of)
+    totals = breakdown_by(BLOCKS)
+
+    assert totals.keys() == expected.keys()
+    for label, blocks in expected.items():
+        t = totals[label]
+        assert t.blocks == len(blocks)
+        assert t.missed_blocks == sum(
+            b.consensus_proposer_duty == "missed" for b in blocks
+        )
+        assert t.share == len(blocks) / len(BLOCKS)
+        for name in (
+            "total_priority_fees",
+            "baseline_mev",
+            "missed_execution_rewards",
+            "missed_consensus_rewards",
+            "total_gas_used",
+        ):
+            assert getattr(t, name) == _total(blocks, name), name
+
+
+def test_totals_beyond_64_bits_are_exact(backend):
+    totals = by_relay(BLOCKS)
+
+    # Four exa-wei of MEV per block add up to more than 2**63
+    assert totals["flashbots"].baseline_mev > 2**63
+    assert totals["flashbots"].baseline_mev == _total(
+        [b for b in BLOCKS if "flashbots" in b.relays], "baseline_mev"
+    )
+    assert totals[None].baseline_mev is None
+
+
+def test_mev_share():
+    totals = by_relay(BLOCKS)
+
+    assert totals[None].mev_share == 0
+    flashbots = totals["flashbots"]
+    assert flashbots.mev_share == pytest.approx(
+        flashbots.baseline_mev
+        / (flashbots.baseline_mev + flashbots.total_priority_fees)
+    )
+
+
+def test_breakdown_by_relay_and_epoch_over_columns(backend):
+    np = pytest.importorskip("numpy")
+    columns = block_columns(BLOCKS)
+    columns["epoch"] = np.asarray(columns["epoch"])
+    columns["total_gas_used"] = np.asarray(
+        [np.nan if v is None else v for v in columns["total_gas_used"]]
+    )
+
+    totals = breakdown(columns, by=("epoch", "relays"))
+    expected = _expected(lambda b: [(b.epoch, r) for r in b.relays or [None]])
+
+    assert totals.keys() == expected.keys()
+    for key, blocks in expected.items():
+        assert totals[key].blocks == len(blocks)
+        assert totals[key].total_gas_used == _total(blocks, "total_gas_used")
+
+
+def test_breakdown_of_slots_skips_missed_slots(backend):
+    slots = [SlotBlock(b.consensus_slot, SlotStatus.PROPOSED, b) for b in BLOCKS]
+    slots.insert(5, SlotBlock(320, SlotStatus.MISSED))
+
+    assert by_relay(slots) == by_relay(BLOCKS)
+    assert block_columns(slots, ["consensus_slot"]) == {
+        "consensus_slot": list(range(320))
+    }
+
+
+def test_breakdown_of_slots_fails_on_slots_not_fetched(backend):
+    slots = [SlotBlock(b.consensus_slot, SlotStatus.PROPOSED, b) for b in BLOCKS]
+    slots.append(SlotBlock(320, SlotStatus.ERROR, error=TimeoutError("slot 320")))
+
+    with pytest.raises(TimeoutError, match="slot 320"):
+        by_relay(slots)
+    with pytest.raises(ValueError, match="Slot 321"):
+        block_columns([SlotBlock(321, SlotStatus.ERROR)])
+
+
+def test_explode(backend):
+    rows, entries = explode([["a", "b"], [], None, ["c"]])
+
+    assert list(rows) == [0, 0, 1, 2, 3]
+    assert entries == ["a", "b", None, None, "c"]
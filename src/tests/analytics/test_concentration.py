@@ -0,0 +1,116 @@
+import math
+
+import pytest
+
+from rated.analytics.concentration import Concentration, concentration_by_snapshot
+from rated.analytics.streaming import observe
+from rated.ethereum.datatypes import (
+    NetworkChurnCapacityPool,
+    P2PHostingProviderDistribution,
+)
+
+HOSTING = [
+    P2PHostingProviderDistribution(
+        hosting_provider=name, validator_share=share, dist_type="all"
+    )
+    for name, share in [("aws", 0.4), ("hetzner", 0.2), ("ovh", 0.2), ("self", 0.1)]
+]
+
+
+def test_concentration_of_shares():
+    hosting = Concentration("validator_share", total=1)
+    hosting.update(HOSTING)
+
+    assert hosting.count == 4
+    assert hosting.hhi == pytest.approx(0.16 + 0.04 + 0.04 + 0.01)
+    assert hosting.entropy == pytest.approx(
+        -sum(p * math.log2(p) for p in (0.4, 0.2, 0.2, 0.1))
+    )
+    # Gini only looks at the entities seen
+    assert hosting.gini == pytest.approx(
+        sum(abs(a - b) for a in (4, 2, 2, 1) for b in (4, 2, 2, 1)) / (2 * 16 * 9 / 4)
+    )
+    assert hosting.nakamoto == 1
+    assert hosting.result["nakamoto"] == 1
+
+    # The listed providers hold 90%, so a majority takes the two largest
+    majority = Concentration("validator_share", total=1, threshold=0.5)
+    majority.update(HOSTING)
+    assert majority.nakamoto == 2
+
+    nobody = Concentration("validator_share", total=1, threshold=0.95)
+    nobody.update(HOSTING)
+    assert nobody.nakamoto is None
+
+
+def test_concentration_extremes():
+    equal = Concentration()
+    equal.update([5, 5, 5, 5])
+    assert equal.gini == pytest.approx(0)
+    assert equal.hhi == pytest.approx(0.25)
+    assert equal.entropy == pytest.approx(2)
+    assert equal.nakamoto == 2
+
+    one = Concentration()
+    one.update([0, 0, 0, 10])
+    assert one.gini == pytest.approx(0.75)
+    assert one.hhi == 1
+    assert one.entropy == 0
+
+    empty = Concentration()
+    assert empty.result == {
+        "count": 0,
+        "gini": None,
+        "hhi": None,
+        "entropy": None,
+        "nakamoto": None,
+    }
+
+
+def test_concentration_recomputes_after_updates():
+    concentration = Concentration()
+    concentration.update([5, 5])
+    assert concentration.hhi == pytest.approx(0.5)
+    assert concentration.result is not concentration.result
+
+    concentration.add(10)
+    assert concentration.hhi == pytest.approx(0.375)
+
+    other = Concentration()
+    other.add(20)
+    concentration.merge(other)
+    assert concentration.count == 4
+    assert concentration.nakamoto == 1
+
+
+def test_concentration_by_snapshot_in_one_pass():
+    pools = [
+        NetworkChurnCapacityPool(
+            time_window=window,
+            stake_action="activation",
+            latest_epoch=1,
+            churn_limit=8,
+            pool=pool,
+            validator_count=count,
+            capacity_filled=0,
+            network_capacity_remaining=0,
+        )
+        for window, counts in [("1d", [10, 10]), ("7d", [60, 20, 10, 10])]
+        for pool, count in zip(["Lido", "Coinbase", "Kiln", "Figment"], counts)
+    ]
+    overall = Concentration("validator_count")
+
+    snapshots = concentration_by_snapshot(
+        observe(iter(pools), overall), by="time_window", field="validator_count"
+    )
+
+    assert list(snapshots) == ["1d", "7d"]
+    assert snapshots["1d"].hhi == pytest.approx(0.5)
+    assert snapshots["7d"].hhi == pytest.approx(0.36 + 0.04 + 0.01 + 0.01)
+    assert snapshots["7d"].nakamoto == 1
+    assert overall.count == 6
+
+    merged = Concentration("validator_count")
+    for snapshot in snapshots.values():
+        merged.merge(snapshot)
+    assert merged.values == overall.values
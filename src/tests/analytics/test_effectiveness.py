@@ -0,0 +1,170 @@
+import pytest
+
+from rated.analytics.columns import (
+    aggregate_columns,
+    factorize,
+    factorize_columns,
+    group_sums,
+    to_columns,
+)
+from rated.analytics.effectiveness import (
+    aggregate,
+    group_by_time,
+    operator_labels,
+    pool_labels,
+)
+from rated.ethereum.aggregation import (
+    merge_by_time_window,
+    merge_effectiveness,
+    most_recent_first,
+)
+from rated.ethereum.datatypes import ValidatorEffectiveness, ValidatorMetadata
+
+
+def _row(index, day):
+    return ValidatorEffectiveness(
+        validator_index=index,
+        day=day,
+        total_attestation_assignments=225 - index % 4,
+        total_unique_attestations=None if index == 3 else 220,
+        uptime=None if index == 2 else 0.9 + index % 5 / 100,
+        attester_effectiveness=0.8 + day % 3 / 10,
+        avg_inclusion_delay=1 + index % 3 / 10,
+        sum_all_rewards=10**12 * index + day,
+        estimated_penalties=None if index % 2 else index,
+        sum_missed_attestations=index % 3,
+    )
+
+
+ROWS = [_row(i, d) for d in range(1000, 1004) for i in range(12)]
+
+METADATA = [
+    ValidatorMetadata(
+        validator_index=i,
+        validator_pubkey="0x",
+        pool="Lido" if i % 2 else None,
+        node_operators=["Kiln", "Lido"]
+        if i % 3 == 0
+        else ["Figment"]
+        if i < 8
+        else None,
+    )
+    for i in range(12)
+]
+
+COMPARED = (
+    "sum_all_rewards",
+    "estimated_penalties",
+    "sum_missed_attestations",
+    "uptime",
+    "attester_effectiveness",
+    "avg_inclusion_delay",
+)
+
+
+def _assert_same(row, expected):
+    for name in COMPARED:
+        assert getattr(row, name) == pytest.approx(getattr(expected, name)), name
+
+
+def test_group_by_time_matches_merged_windows(backend):
+    expected = list(merge_by_time_window([ROWS[:20], ROWS[20:]]))
+
+    windows = group_by_time(ROWS)
+
+    assert [w.day for w in windows] == [1003, 1002, 1001, 1000]
+    for window, merged in zip(windows, expected):
+        _assert_same(window, merged)
+
+
+def test_aggregate_by_operator_and_day(backend):
+    result = aggregate(ROWS, labels=operator_labels(METADATA))
+
+    assert sorted(result) == [
+        (operator, day)
+        for operator in ("Figment", "Kiln", "Lido")
+        for day in range(1000, 1004)
+    ]
+    kiln = [r for r in ROWS if r.validator_index % 3 == 0 and r.day == 1001]
+    _assert_same(result["Kiln", 1001], merge_effectiveness(kiln))
+    assert result["Kiln", 1001].day == 1001
+    assert result["Kiln", 1001].validator_index is None
+
+
+def test_aggregate_by_pool_over_columns(backend):
+    columns = to_columns(ROWS)
+
+    result = aggregate(columns, by=(), labels=pool_labels(METADATA))
+
+    assert list(result) == [("Lido",)]
+    lido = [r for r in ROWS if r.validator_index % 2]
+    _assert_same(result["Lido",], merge_effectiveness(lido))
+    assert result["Lido",].estimated_penalties is None
+
+
+def test_aggregate_by_custom_labels(backend):
+    result = aggregate(ROWS, by=(), labels=lambda index: "low" if index < 4 else None)
+
+    _assert_same(
+        result["low",], merge_effectiveness([r for r in ROWS if r.validator_index < 4])
+    )
+
+
+def test_aggregate_numpy_columns():
+    np = pytest.importorskip("numpy")
+    columns = {
+        "validator_index": np.array([1, 2, 3]),
+        "day": np.array([5, 5, 6]),
+        "uptime": np.array([0.5, np.nan, 1.0]),
+        "total_attestation_assignments": np.array([100.0, 100.0, 300.0]),
+        "sum_all_rewards": np.array([1, 2, 3], dtype=np.int64),
+    }
+
+    result = aggregate(columns, labels={1: "a", 2: "a", 3: "b"})
+
+    assert result["a", 5].uptime == 0.5
+    assert result["a", 5].sum_all_rewards == 3
+    assert result["b", 6].uptime == 1.0
+
+
+def test_aggregate_sums_beyond_64_bits(backend):
+    # Every value fits in 64 bits, but the totals of the first group do not
+    rewards = [2**62, 2**62 - 1, 2**62, -5, 7]
+    columns = {"sum_all_rewards": rewards, "earnings": [None, 1, 2, None, None]}
+
+    result = aggregate_columns(columns, [0, 0, 0, 0, 1], 3)
+
+    assert result["sum_all_rewards"] == [3 * 2**62 - 6, 7, None]
+    assert result["earnings"] == [3, None, None]
+
+
+def test_group_sums_ignore_nulls(backend):
+    values = [1.5, float("nan"), None, 2**70, None]
+
+    assert group_sums(values, [0, 0, 1, 1, 2], 3) == [1.5, 2**70, None]
+
+
+def test_factorize_columns_numbers_keys_in_order_of_appearance(backend):
+    days, relays = [5, 3, 5, 3, 7, 5], ["a", None, "a", "c", "a", "a"]
+    expected_ids, expected_groups = factorize(zip(days, relays))
+    if backend == "numpy":
+        np = pytest.importorskip("numpy")
+        days = np.asarray(days)
+
+    group_ids, groups = factorize_columns([days, relays], 6)
+
+    assert list(group_ids) == expected_ids
+    assert groups == expected_groups
+    assert list(factorize_columns([], 2)[0]) == [0, 0]
+
+
+def test_most_recent_first_puts_null_times_last():
+    keys = [(1, 5), (None, 5), (3, None), (0, 5), (3, 4)]
+
+    assert sorted(keys, key=most_recent_first) == [
+        (3, 4),
+        (3, None),
+        (1, 5),
+        (0, 5),
+        (None, 5),
+    ]
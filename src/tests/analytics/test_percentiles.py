@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+import pytest
+
+from rated.analytics.percentiles import PercentileRanks
+from rated.ethereum.datatypes import Percentile
+
+
+@dataclass
+class Summary:
+    id: str
+    effectiveness: float | None
+
+
+def _naive_rank(population, value):
+    return 100 * sum(v <= value for v in population) / len(population)
+
+
+def test_ranks_match_counting(backend):
+    rng = random.Random(7)
+    population = [round(rng.uniform(80, 100), 1) for _ in range(1000)]
+    ranks = PercentileRanks(population)
+
+    probes = [70.0, 80.0, 85.55, 90.0, 99.9, 100.0, 101.0, None]
+    assert ranks.ranks(probes) == [
+        None if p is None else pytest.approx(_naive_rank(population, p)) for p in probes
+    ]
+    assert ranks.rank(max(population)) == 100
+
+
+def test_values_invert_ranks(backend):
+    population = list(range(100, 0, -1))
+    ranks = PercentileRanks(population)
+
+    assert ranks.values([0, 1, 7, 50, 99.5, 100]) == [1, 1, 7, 50, 100, 100]
+    assert ranks.table()[:3] == [
+        Percentile(time_window="", rank=1, value=1),
+        Percentile(time_window="", rank=2, value=2),
+        Percentile(time_window="", rank=3, value=3),
+    ]
+    for rank in range(1, 101):
+        assert ranks.rank(ranks.value(rank)) >= rank
+
+    with pytest.raises(ValueError):
+        ranks.value(101)
+    with pytest.raises(ValueError):
+        PercentileRanks().rank(1.0)
+
+
+def test_incremental_updates(backend):
+    summaries = [Summary(f"op{i}", i / 10) for i in range(10)] + [Summary("x", None)]
+    ranks = PercentileRanks(summaries, field="effectiveness", key="id")
+
+    assert len(ranks) == 10
+    assert ranks.rank(0.45) == 50
+
+    ranks.update([Summary("op9", 0.0), Summary("op10", 0.5), Summary("op11", 2.0)])
+
+    assert len(ranks) == 12
+    expected = [i / 10 for i in range(9)] + [0.0, 0.5, 2.0]
+    for probe in (0.0, 0.45, 0.5, 1.0, 2.0):
+        assert ranks.rank(probe) == pytest.approx(_naive_rank(expected, probe))
+
+    unkeyed = PercentileRanks([1.0, 2.0])
+    unkeyed.add(1.0)
+    assert len(unkeyed) == 3
+    assert unkeyed.rank(1.0) == pytest.approx(200 / 3)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import http
+from dataclasses import dataclass
+
+import httpx
+import pytest
+
+from rated.analytics.ranking import bottom_k, top_k
+
+
+@dataclass
+class Item:
+    id: str
+    score: float | None
+    size: int
+
+
+ITEMS = [
+    Item("a", 0.5, 10),
+    Item("b", 0.9, 5),
+    Item("c", None, 100),
+    Item("d", 0.9, 20),
+    Item("e", 0.1, 1),
+    Item("f", 0.9, 5),
+    Item("g", 0.7, 3),
+]
+
+
+def _ids(items):
+    return [i.id for i in items]
+
+
+def test_top_k():
+    assert _ids(top_k(iter(ITEMS), 3, key="score")) == ["b", "d", "f"]
+    assert _ids(top_k(ITEMS, 3, key=("score", "size"))) == ["d", "b", "f"]
+    assert _ids(top_k(ITEMS, 3, key=("score", "-size"))) == ["b", "f", "d"]
+    assert _ids(top_k(ITEMS, 2, key=lambda i: i.size)) == ["c", "d"]
+    assert _ids(top_k(ITEMS, 10, key="score")) == ["b", "d", "f", "g", "a", "e"]
+    assert top_k(ITEMS, 0, key="score") == []
+
+    with pytest.raises(ValueError):
+        top_k(ITEMS, -1, key="score")
+
+
+def test_bottom_k():
+    assert _ids(bottom_k(ITEMS, 3, key="score")) == ["e", "a", "g"]
+    assert _ids(bottom_k(ITEMS, 2, key=("size", "-score"))) == ["e", "g"]
+
+
+def test_top_k_presorted_stops_early(respx_mock, eth_mainnet):
+    def page(request):
+        start = int(request.url.params.get("from", 1))
+        data = [
+            {
+                "id": f"op{rank}",
+                "idType": "nodeOperator",
+                "slashes": 100 - rank,
+                "medianSlashedMonth": "2023-01",
+                "slasherPedigree": "",
+                "slashingRole": "slashed",
+                "validatorCount": rank,
+            }
+            for rank in range(start, start + 2)
+        ]
+        next_ = f"/v0/eth/slashings/leaderboard?from={start + 2}&size=2"
+        return httpx.Response(http.HTTPStatus.OK, json={"data": data, "next": next_})
+
+    route = respx_mock.get(
+        "https://api.rated.network/v0/eth/slashings/leaderboard"
+    ).mock(side_effect=page)
+
+    leaders = top_k(
+        eth_mainnet.slashings.leaderboard(size=2, follow_next=True),
+        3,
+        key="slashes",
+        presorted=True,
+    )
+
+    assert _ids(leaders) == ["op1", "op2", "op3"]
+    assert route.call_count == 2
@@ -0,0 +1,105 @@
+import pytest
+
+from rated.analytics.rollups import Rollups, bucket_bounds
+from rated.ethereum import MAINNET
+from rated.ethereum.aggregation import merge_effectiveness
+from rated.ethereum.datatypes import ValidatorEffectiveness
+from rated.ethereum.enums import Granularity
+
+
+def _row(index, day=None, hour=None):
+    time = day if day is not None else hour
+    return ValidatorEffectiveness(
+        validator_index=index,
+        day=day,
+        hour=hour,
+        start_epoch=time * 225,
+        end_epoch=time * 225 + 224,
+        total_attestation_assignments=225 - time % 3,
+        total_unique_attestations=220 - time % 5,
+        uptime=0.9 + (index + time) % 7 / 100,
+        avg_inclusion_delay=1 + time % 4 / 10,
+        earnings=1000 * index + time,
+        proposer_duties_count=None,
+        proposer_effectiveness=None,
+        sum_missed_attestations=None if time % 2 else 1,
+    )
+
+
+def test_bucket_bounds():
+    assert bucket_bounds(3, Granularity.DAY, MAINNET) == (3, 3)
+    assert bucket_bounds(0, Granularity.WEEK, MAINNET) == (0, 5)
+    assert bucket_bounds(6, Granularity.WEEK, MAINNET) == (6, 12)
+    assert bucket_bounds(0, Granularity.MONTH, MAINNET) == (0, 30)
+    assert bucket_bounds(40, Granularity.MONTH, MAINNET) == (31, 61)
+    assert bucket_bounds(40, Granularity.QUARTER, MAINNET) == (31, 120)
+    assert bucket_bounds(40, Granularity.YEAR, MAINNET) == (31, 395)
+
+
+def test_rollups_match_merged_rows(backend):
+    rows = [_row(i, day=d) for d in range(40) for i in (7, 8)]
+    rollups = Rollups(rows, network=MAINNET)
+
+    monthly = rollups.at(Granularity.MONTH)
+
+    assert [(r.validator_index, r.start_day, r.end_day) for r in monthly] == [
+        (7, 31, 61),
+        (8, 31, 61),
+        (7, 0, 30),
+        (8, 0, 30),
+    ]
+    expected = merge_effectiveness(
+        [r for r in rows if r.validator_index == 7 and r.day <= 30]
+    )
+    december = monthly[2]
+    assert december.earnings == expected.earnings
+    assert december.uptime == pytest.approx(expected.uptime)
+    assert december.avg_inclusion_delay == pytest.approx(expected.avg_inclusion_delay)
+    assert december.sum_missed_attestations == expected.sum_missed_attestations
+    assert december.proposer_effectiveness is None
+    assert december.start_epoch == 0
+    assert december.end_epoch == 30 * 225 + 224
+    assert rollups.at(Granularity.MONTH) is monthly
+
+
+def test_rollups_across_validators(backend):
+    rows = [_row(i, day=d) for d in range(10) for i in range(5)]
+
+    (total,) = Rollups(rows).at(Granularity.ALL_TIME, by_validator=False)
+
+    expected = merge_effectiveness(rows)
+    assert total.validator_index is None
+    assert (total.start_day, total.end_day) == (0, 9)
+    assert total.earnings == expected.earnings
+    assert total.uptime == pytest.approx(expected.uptime)
+
+
+def test_rollups_from_hours(backend):
+    rows = [_row(1, hour=h) for h in range(20, 50)]
+    rollups = Rollups(rows)
+
+    daily = rollups.at(Granularity.DAY)
+
+    assert [r.day for r in daily] == [2, 1, 0]
+    assert daily[1].earnings == sum(1000 + h for h in range(24, 48))
+    assert len(rollups.at(Granularity.HOUR)) == 30
+
+
+def test_rollups_sum_beyond_64_bits(backend):
+    # Every amount fits in 64 bits, but their total does not
+    rows = [
+        ValidatorEffectiveness(validator_index=1, day=d, sum_all_rewards=2**62)
+        for d in range(3)
+    ]
+
+    (total,) = Rollups(rows).at(Granularity.ALL_TIME)
+
+    assert total.sum_all_rewards == 3 * 2**62
+
+
+def test_rollups_reject_finer_granularities():
+    with pytest.raises(ValueError):
+        Rollups([_row(1, day=1)]).at(Granularity.HOUR)
+
+    with pytest.raises(ValueError):
+        Rollups([ValidatorEffectiveness(validator_index=1)])
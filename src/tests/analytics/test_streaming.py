@@ -0,0 +1,118 @@
+import bisect
+import random
+import statistics
+
+import pytest
+
+from rated.analytics.streaming import (
+    Aggregator,
+    Count,
+    Max,
+    Min,
+    Moments,
+    Quantiles,
+    Sum,
+    Summary,
+    observe,
+)
+from rated.ethereum.datatypes import Block
+
+
+def _values(n, seed=7):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(0, 1) for _ in range(n)]
+
+
+def test_moments_match_statistics():
+    values = _values(10_000)
+    moments = Moments()
+
+    moments.update(values)
+
+    assert moments.count == 10_000
+    assert moments.mean == pytest.approx(statistics.fmean(values))
+    assert moments.variance == pytest.approx(statistics.variance(values))
+    assert moments.std == pytest.approx(statistics.stdev(values))
+
+
+def test_quantiles_are_accurate_in_bounded_memory():
+    values = _values(100_000)
+    digest = Quantiles()
+
+    digest.update(values)
+
+    ordered = sorted(values)
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99, 0.999):
+        rank = bisect.bisect(ordered, digest.quantile(q)) / len(ordered)
+        assert rank == pytest.approx(q, abs=0.002), q
+    assert digest.quantile(0) == ordered[0]
+    assert digest.quantile(1) == ordered[-1]
+    assert len(digest.centroids) < 2 * digest.compression
+
+    with pytest.raises(ValueError):
+        digest.quantile(1.5)
+
+
+def test_aggregators_merge():
+    left, right = _values(5_000, seed=1), _values(7_000, seed=2)
+    aggregators = [Count, Sum, Min, Max, Moments, Quantiles]
+
+    for cls in aggregators:
+        merged, first, second, whole = cls(), cls(), cls(), cls()
+        first.update(left)
+        second.update(right)
+        whole.update(left + right)
+        merged.merge(first)
+        merged.merge(second)
+
+        if cls is Quantiles:
+            assert merged.count == whole.count
+            assert merged.quantile(0.5) == pytest.approx(whole.quantile(0.5), rel=0.02)
+        elif cls is Moments:
+            assert merged.mean == pytest.approx(whole.mean)
+            assert merged.variance == pytest.approx(whole.variance)
+        else:
+            assert merged.result == pytest.approx(whole.result)
+
+    with pytest.raises(TypeError):
+        Min().merge(Max())
+
+
+def test_aggregators_must_implement_the_statistic():
+    class Partial(Aggregator):
+        def _add(self, value):
+            pass
+
+    with pytest.raises(TypeError):
+        Aggregator()
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_observe_passes_items_through():
+    blocks = [
+        Block(
+            epoch=1,
+            consensus_slot=slot,
+            validator_index=1,
+            relays=None,
+            block_builder_pubkeys=None,
+            execution_proposer_duty="proposed",
+            consensus_proposer_duty="proposed",
+            total_rewards=None if slot == 3 else slot * 10,
+        )
+        for slot in range(10)
+    ]
+    rewards = Summary("total_rewards")
+    slots = Count(lambda b: b.consensus_slot)
+
+    assert list(observe(iter(blocks), rewards, slots)) == blocks
+
+    result = rewards.result
+    assert result["count"] == 9
+    assert result["nulls"] == 1
+    assert result["sum"] == 420
+    assert (result["min"], result["max"]) == (0, 90)
+    assert result["mean"] == pytest.approx(420 / 9)
+    assert rewards.quantile(0.5) == pytest.approx(45, abs=5)
+    assert slots.result == 10
@@ -0,0 +1,77 @@
+from rated.analytics.withdrawals import WithdrawalProjection
+from rated.ethereum.chain import MAINNET, slot_day
+from rated.ethereum.datatypes import Withdrawal, WithdrawalEpochTotal
+
+
+def _withdrawal(index, epoch, amount, withdrawal_type="partial"):
+    return Withdrawal(
+        validator_index=index,
+        withdrawal_type=withdrawal_type,
+        withdrawable_amount=amount,
+        id="Lido",
+        id_type="pool",
+        withdrawal_slot=epoch * 32 + index % 32,
+        withdrawal_epoch=epoch,
+    )
+
+
+# Epochs 110 to 115 straddle the end of day 0, which is epoch 112
+WITHDRAWALS = [
+    _withdrawal(1, 112, 10),
+    _withdrawal(2, 110, 20, "full"),
+    _withdrawal(3, 115, 30),
+    _withdrawal(4, 112, 40, "full"),
+    _withdrawal(5, 113, 50),
+]
+
+
+def test_slot_day():
+    assert slot_day(0, MAINNET) == 0
+    assert slot_day(3598, MAINNET) == 0
+    assert slot_day(3599, MAINNET) == 1
+    assert slot_day(3599 + 7200, MAINNET) == 2
+
+
+def test_projection_by_epoch():
+    projection = WithdrawalProjection(iter(WITHDRAWALS))
+    totals = list(projection.by_epoch())
+
+    assert projection.epochs == range(110, 116)
+    assert totals[0] == WithdrawalEpochTotal(
+        epoch=110,
+        validator_count=1,
+        withdrawable_amount=20,
+        withdrawable_amount_by_type={"full": 20},
+    )
+    assert totals[1] == WithdrawalEpochTotal(epoch=111)
+    assert totals[2].validator_count == 2
+    assert totals[2].withdrawable_amount_by_type == {"full": 40, "partial": 10}
+    assert [t.withdrawable_amount for t in totals] == [20, 0, 50, 50, 0, 30]
+    assert projection.totals_by_type() == {"full": 60, "partial": 90}
+
+
+def test_projection_by_day():
+    projection = WithdrawalProjection(WITHDRAWALS)
+    days = list(projection.by_day())
+
+    assert [d.day for d in days] == [0, 1]
+    assert days[0].validator_count == 3
+    assert days[0].withdrawable_amount == 70
+    assert days[0].withdrawable_amount_by_type == {"full": 60, "partial": 10}
+    assert days[1].withdrawable_amount == 80
+    assert days[1].withdrawable_amount_by_type == {"partial": 80}
+
+
+def test_projection_grows_both_ways():
+    projection = WithdrawalProjection()
+    assert list(projection.by_day()) == []
+
+    projection.add(_withdrawal(1, 1000, 5))
+    projection.add(_withdrawal(2, 990, 7, "full"))
+    projection.add(_withdrawal(3, 1002, 9))
+
+    assert len(projection) == 13
+    totals = list(projection.by_epoch())
+    assert totals[0].withdrawable_amount_by_type == {"full": 7}
+    assert totals[10].withdrawable_amount == 5
+    assert totals[12].withdrawable_amount == 9
@@ -0,0 +1,90 @@
+from datetime import date
+
+import pytest
+
+from rated.ethereum import MAINNET
+from rated.ethereum.backfill import (
+    backfill,
+    bucket_length,
+    day_number,
+    split_range,
+    window_length,
+)
+from rated.ethereum.datatypes import ValidatorEffectiveness
+from rated.ethereum.enums import FilterType, Granularity
+
+
+def test_day_number():
+    assert day_number(803, MAINNET) == 803
+    assert day_number(date(2023, 2, 12), MAINNET) == 803
+
+
+@pytest.mark.parametrize(
+    "granularity, filter_type, length",
+    [
+        (Granularity.DAY, FilterType.DAY, 30),
+        (Granularity.HOUR, FilterType.DAY, 30),
+        (Granularity.WEEK, FilterType.DAY, None),
+        (Granularity.MONTH, FilterType.DAY, None),
+        (Granularity.HOUR, FilterType.HOUR, 30),
+        (Granularity.DAY, FilterType.HOUR, 720),
+        (Granularity.ALL_TIME, FilterType.DAY, None),
+    ],
+)
+def test_window_length_adapts_to_granularity(granularity, filter_type, length):
+    assert window_length(granularity, filter_type) == length
+
+
+def test_bucket_length():
+    assert bucket_length(Granularity.DAY, FilterType.HOUR) == 24
+    assert bucket_length(Granularity.HOUR, FilterType.DAY) == 1
+    assert bucket_length(Granularity.MONTH, FilterType.DAY) == 1
+
+
+def test_window_length_needs_day_or_hour_filter():
+    with pytest.raises(ValueError):
+        window_length(Granularity.DAY, FilterType.DATETIME)
+
+
+def test_split_range():
+    assert split_range(1, 10, 4) == [(1, 4), (5, 8), (9, 10)]
+    assert split_range(1, 10, None) == [(1, 10)]
+    assert split_range(30, 100, 48, align=24) == [(30, 71), (72, 100)]
+    assert split_range(48, 100, 48, align=24) == [(48, 95), (96, 100)]
+
+    with pytest.raises(ValueError):
+        split_range(10, 1, 4)
+    with pytest.raises(ValueError):
+        split_range(1, 10, 30, align=24)
+
+
+def _fetch_with_timeless_row(first, last):
+    rows = [ValidatorEffectiveness(validator_index=1, day=d) for d in (last, first)]
+    return rows + [ValidatorEffectiveness(validator_index=2)]
+
+
+def test_backfill_keeps_rows_without_time_when_not_split():
+    rows = backfill(
+        _fetch_with_timeless_row,
+        3,
+        9,
+        length=None,
+        filter_type=FilterType.DAY,
+        concurrency=2,
+    )
+
+    assert [(r.validator_index, r.day) for r in rows] == [(1, 3), (1, 9), (2, None)]
+
+
+def test_backfill_rejects_rows_without_time_when_split():
+    rows = backfill(
+        _fetch_with_timeless_row,
+        3,
+        9,
+        length=4,
+        filter_type=FilterType.DAY,
+        concurrency=2,
+    )
+
+    with pytest.raises(ValueError, match="without a day"):
+        list(rows)
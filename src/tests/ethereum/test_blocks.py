@@ -1,8 +1,15 @@
 import http
+import time
+from itertools import islice
 
 import httpx
 import pytest
 
+from rated.client import RatedApiError
+from rated.ethereum import MAINNET
+from rated.ethereum.chain import slot_start_time
+from rated.ethereum.enums import SlotStatus
+
 
 def test_blocks_all_ok_dont_follow_next(respx_mock, eth_mainnet):
     respx_mock.get("https://api.rated.network/v0/eth/blocks?size=1").mock(
@@ -119,3 +126,135 @@ def test_block_by_slot_ok(respx_mock, eth_mainnet):
     assert block.total_rewards == 76277932
     assert block.consensus_slot == 7502102
     assert len(block.block_builder_pubkeys) == 3
+
+
+def _block(slot, duty="proposed"):
+    return {
+        "epoch": slot // 32,
+        "consensusSlot": slot,
+        "validatorIndex": 888078,
+        "relays": [],
+        "blockBuilderPubkeys": [],
+        "executionProposerDuty": duty,
+        "consensusProposerDuty": duty,
+    }
+
+
+def test_block_get_many_reports_missed_slots(respx_mock, eth_mainnet):
+    respx_mock.get("https://api.rated.network/v0/eth/blocks/100").mock(
+        return_value=httpx.Response(http.HTTPStatus.OK, json=_block(100))
+    )
+    respx_mock.get("https://api.rated.network/v0/eth/blocks/101").mock(
+        return_value=httpx.Response(http.HTTPStatus.OK, json=_block(101, "missed"))
+    )
+    respx_mock.get("https://api.rated.network/v0/eth/blocks/102").mock(
+        return_value=httpx.Response(http.HTTPStatus.NOT_FOUND)
+    )
+    respx_mock.get("https://api.rated.network/v0/eth/blocks/103").mock(
+        return_value=httpx.Response(http.HTTPStatus.INTERNAL_SERVER_ERROR)
+    )
+
+    results = list(eth_mainnet.block.get_many([100, 101, 102, 103]))
+
+    assert [r.slot for r in results] == [100, 101, 102, 103]
+    assert [r.status for r in results] == [
+        SlotStatus.PROPOSED,
+        SlotStatus.MISSED,
+        SlotStatus.MISSED,
+        SlotStatus.ERROR,
+    ]
+    assert results[0].block.consensus_slot == 100
+    assert results[2].block is None
+    assert results[2].error is None
+    assert isinstance(results[3].error, RatedApiError)
+
+
+def test_blocks_range_uses_listing_pages(respx_mock, eth_mainnet):
+    def listing(request):
+        last = int(request.url.params["from"])
+        size = int(request.url.params["size"])
+        slots = [s for s in range(last, last - size - 1, -1) if s != 203]
+        return httpx.Response(
+            http.HTTPStatus.OK,
+            json={"data": [_block(s) for s in slots], "next": None},
+        )
+
+    route = respx_mock.get("https://api.rated.network/v0/eth/blocks").mock(
+        side_effect=listing
+    )
+
+    results = list(eth_mainnet.blocks.range(200, 209, page_size=4))
+
+    assert route.call_count == 3
+    assert [r.slot for r in results] == list(range(200, 210))
+    assert results[3].status == SlotStatus.MISSED
+    assert all(r.status == SlotStatus.PROPOSED for r in results if r.slot != 203)
+    assert results[9].block.consensus_slot == 209
+
+
+def test_blocks_range_reports_failed_pages(respx_mock, eth_mainnet):
+    respx_mock.get("https://api.rated.network/v0/eth/blocks").mock(
+        return_value=httpx.Response(http.HTTPStatus.BAD_GATEWAY)
+    )
+
+    results = list(eth_mainnet.blocks.range(200, 201))
+
+    assert [r.status for r in results] == [SlotStatus.ERROR, SlotStatus.ERROR]
+
+
+def test_blocks_range_single_slot_uses_lookup(respx_mock, eth_mainnet):
+    route = respx_mock.get("https://api.rated.network/v0/eth/blocks/200").mock(
+        return_value=httpx.Response(http.HTTPStatus.OK, json=_block(200))
+    )
+
+    results = list(eth_mainnet.blocks.range(200, 200))
+
+    assert route.call_count == 1
+    assert results[0].status == SlotStatus.PROPOSED
+
+    with pytest.raises(ValueError):
+        eth_mainnet.blocks.range(201, 200)
+
+
+def test_blocks_follow_paces_to_the_slot_clock(respx_mock, eth_mainnet, monkeypatch):
+    heads = iter([102, 102, None, 104])
+
+    def listing(request):
+        size = int(request.url.params["size"])
+        if size == 1:
+            head = next(heads)
+            if head is None:
+                return httpx.Response(http.HTTPStatus.BAD_GATEWAY)
+            return httpx.Response(
+                http.HTTPStatus.OK, json={"data": [_block(head)], "next": None}
+            )
+        last = int(request.url.params["from"])
+        slots = [s for s in range(last, last - size, -1) if s != 103]
+        data = [_block(s) for s in slots]
+        return httpx.Response(http.HTTPStatus.OK, json={"data": data, "next": None})
+
+    respx_mock.get("https://api.rated.network/v0/eth/blocks").mock(side_effect=listing)
+    sleeps = []
+    now = slot_start_time(103, MAINNET) - 5
+    monkeypatch.setattr(time, "time", lambda: now)
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+
+    slots = list(islice(eth_mainnet.blocks.follow(100), 5))
+
+    assert [(s.slot, s.status) for s in slots] == [
+        (100, SlotStatus.PROPOSED),
+        (101, SlotStatus.PROPOSED),
+        (102, SlotStatus.PROPOSED),
+        (103, SlotStatus.MISSED),
+        (104, SlotStatus.PROPOSED),
+    ]
+    assert sleeps == [5, 1.0]
+
+
+def test_blocks_follow_raises_on_client_errors(respx_mock, eth_mainnet):
+    respx_mock.get("https://api.rated.network/v0/eth/blocks").mock(
+        return_value=httpx.Response(http.HTTPStatus.FORBIDDEN)
+    )
+
+    with pytest.raises(RatedApiError):
+        next(eth_mainnet.blocks.follow(100))
@@ -3,7 +3,15 @@ import http
 import httpx
 import pytest
 
-from rated.ethereum.enums import IdType, TimeWindow, StakeAction, PoolType, AprType
+from rated.ethereum.enums import (
+    AprType,
+    FilterType,
+    Granularity,
+    IdType,
+    PoolType,
+    StakeAction,
+    TimeWindow,
+)
 
 
 def test_operator_metadata_ok(respx_mock, eth_mainnet):
@@ -409,3 +417,120 @@ def test_operators_summaries_ok(respx_mock, eth_mainnet):
     assert results[0].display_name == "0xf82ac5937a20dc862f9bc0668779031e06000f17"
     assert results[0].validator_count == 260708
     assert results[0].network_penetration == pytest.approx(0.2756513344942688)
+
+
+def test_operator_snapshot_reports_partial_failures(respx_mock, eth_mainnet):
+    route = respx_mock.get(
+        url__regex=r"https://api.rated.network/v0/eth/operators/.*"
+    ).mock(side_effect=_operator_view)
+
+    snapshots = eth_mainnet.operator.snapshot(
+        ["Lido", "Kiln"],
+        IdType.POOL,
+        time_windows=[TimeWindow.ONE_DAY, TimeWindow.SEVEN_DAYS],
+    )
+
+    assert route.call_count == 2 * (2 + 2 * 4)
+    lido, kiln = snapshots
+    assert lido.id == "Lido"
+    assert lido.metadata.display_name == "Lido"
+    assert lido.clients[0].client == "Lighthouse"
+    assert lido.summaries["1d"].avg_uptime == 1.0
+    assert lido.summaries["7d"].avg_uptime == 0.9
+    assert lido.aprs["7d"].percentage == 3.5
+    assert lido.relayers["1d"][0].relayer == "flashbots"
+    assert lido.stake_movements["7d"] == []
+    assert lido.errors == {}
+    assert kiln.summaries == {}
+    assert set(kiln.errors) == {"summary:1d", "summary:7d"}
+    assert kiln.aprs["1d"].id == "Kiln"
+
+
+def test_operator_snapshot_fetches_repeated_ids_once(respx_mock, eth_mainnet):
+    route = respx_mock.get(
+        url__regex=r"https://api.rated.network/v0/eth/operators/.*"
+    ).mock(side_effect=_operator_view)
+
+    snapshots = eth_mainnet.operator.snapshot(
+        ["Lido", "Kiln", "Lido"],
+        IdType.POOL,
+        time_windows=[TimeWindow.ONE_DAY, TimeWindow.ONE_DAY],
+    )
+
+    assert route.call_count == 2 * (2 + 4)
+    assert [snap.id for snap in snapshots] == ["Lido", "Kiln"]
+    assert list(snapshots[0].summaries) == ["1d"]
+
+
+def _operator_view(request):
+    operator_id, *view = request.url.path.split("/")[4:]
+    window = request.url.params.get("window")
+    if operator_id == "Kiln" and view == ["summary"]:
+        return httpx.Response(http.HTTPStatus.INTERNAL_SERVER_ERROR)
+    if not view:
+        data = {
+            "id": operator_id,
+            "idType": "pool",
+            "displayName": operator_id,
+            "operatorTags": [],
+        }
+    elif view == ["clients"]:
+        data = [{"client": "Lighthouse", "percentage": 100.0}]
+    elif view == ["relayers"]:
+        data = [{"relayer": "flashbots", "percentage": 100.0}]
+    elif view == ["stakeMovement"]:
+        data = []
+    elif view == ["apr"]:
+        data = {
+            "id": operator_id,
+            "idType": "pool",
+            "timeWindow": window,
+            "aprType": "backward",
+            "percentage": 3.5,
+            "percentageConsensus": 3.0,
+            "percentageExecution": 0.5,
+            "activeStake": 32,
+            "activeValidators": 1,
+        }
+    else:
+        data = {
+            "id": operator_id,
+            "idType": "pool",
+            "timeWindow": window,
+            "validatorCount": 1,
+            "avgCorrectness": 0.99,
+            "avgUptime": 1.0 if window == "1d" else 0.9,
+            "avgValidatorEffectiveness": 97.0,
+            "clientPercentages": [],
+            "relayerPercentages": [],
+            "operatorTags": [],
+        }
+    return httpx.Response(http.HTTPStatus.OK, json=data)
+
+
+def test_operator_effectiveness_backfill_by_hour(respx_mock, eth_mainnet):
+    def effectiveness_page(request):
+        last = int(request.url.params["from"])
+        hours = range(last, last - 10, -1)
+        return httpx.Response(
+            http.HTTPStatus.OK,
+            json={
+                "data": [{"id": "Lido", "idType": "pool", "hour": h} for h in hours],
+                "next": f"/v0/eth/operators/Lido/effectiveness?from={last - 10}",
+            },
+        )
+
+    respx_mock.get(
+        "https://api.rated.network/v0/eth/operators/Lido/effectiveness"
+    ).mock(side_effect=effectiveness_page)
+
+    effectiveness = eth_mainnet.operator.effectiveness_backfill(
+        "Lido",
+        IdType.POOL,
+        from_day=100,
+        to_day=165,
+        granularity=Granularity.HOUR,
+        filter_type=FilterType.HOUR,
+    )
+
+    assert [e.hour for e in effectiveness] == list(range(100, 166))
@@ -0,0 +1,142 @@
+import http
+
+import httpx
+import pytest
+
+import rated
+from rated.ethereum.pubkeys import (
+    PUBKEY_LENGTH,
+    PubkeyIndex,
+    normalize_pubkey,
+    pubkey_to_bytes,
+)
+
+
+def _pubkey(n):
+    return f"0x{((n + 1) * 7919):096x}"
+
+
+@pytest.fixture
+def pubkey_index(tmp_path):
+    index = PubkeyIndex(tmp_path / "pubkeys.bin")
+    yield index
+    index.close()
+
+
+def test_normalize_pubkey():
+    assert normalize_pubkey(" 0X" + "AB" * 48) == "0x" + "ab" * 48
+    assert normalize_pubkey("ab" * 48) == "0x" + "ab" * 48
+
+    with pytest.raises(ValueError):
+        normalize_pubkey("0x1234")
+
+
+def test_pubkey_index_lookups_both_ways(pubkey_index):
+    assert len(pubkey_index) == 0
+    assert pubkey_index.max_index is None
+    assert pubkey_index.index_of(_pubkey(1)) is None
+
+    assert pubkey_index.update((_pubkey(n), n) for n in range(0, 50, 2)) == 25
+    assert pubkey_index.update((_pubkey(n), n) for n in range(1, 50, 2)) == 25
+    assert (
+        pubkey_index.update([(_pubkey(3), 3), (_pubkey(3), 3), (_pubkey(50), 50)]) == 1
+    )
+
+    assert len(pubkey_index) == 51
+    assert pubkey_index.max_index == 50
+    assert all(pubkey_index.index_of(_pubkey(n)) == n for n in range(51))
+    assert all(pubkey_index.pubkey_of(n) == _pubkey(n) for n in range(51))
+    assert pubkey_index.index_of(_pubkey(51)) is None
+    assert pubkey_index.pubkey_of(51) is None
+    assert _pubkey(7) in pubkey_index
+
+
+def test_pubkey_index_persists(tmp_path):
+    index = PubkeyIndex(tmp_path / "pubkeys.bin")
+    index.update([(_pubkey(5), 5)])
+    index.close()
+
+    reopened = PubkeyIndex(tmp_path / "pubkeys.bin")
+
+    assert reopened.index_of(_pubkey(5)) == 5
+    assert reopened.pubkey_of(4) is None
+    reopened.close()
+
+
+def test_pubkey_index_refresh_from_last_index(respx_mock, eth_mainnet, pubkey_index):
+    pubkey_index.update([(_pubkey(0), 0)])
+    route = respx_mock.get(
+        "https://api.rated.network/v0/eth/validators?from=1&size=100&id_type=nodeOperator"
+    ).mock(
+        return_value=httpx.Response(
+            http.HTTPStatus.OK,
+            json={
+                "data": [
+                    {"validatorIndex": n, "validatorPubkey": _pubkey(n)} for n in (1, 2)
+                ],
+                "next": None,
+            },
+        )
+    )
+
+    assert pubkey_index.refresh(eth_mainnet.validators) == 2
+    assert route.called
+    assert pubkey_index.index_of(_pubkey(2)) == 2
+
+
+def test_pubkeys_rewritten_to_indices(respx_mock, pubkey_index):
+    eth = rated.Rated("fake_key").ethereum(network=rated.ethereum.MAINNET)
+    eth.pubkey_index = pubkey_index
+    pubkey_index.update([(_pubkey(n), n) for n in (100, 101)])
+    respx_mock.get("https://api.rated.network/v0/eth/validators/100").mock(
+        return_value=httpx.Response(
+            http.HTTPStatus.OK,
+            json={"validatorIndex": 100, "validatorPubkey": _pubkey(100)},
+        )
+    )
+    route = respx_mock.get(
+        "https://api.rated.network/v0/eth/validators/effectiveness"
+    ).mock(
+        return_value=httpx.Response(http.HTTPStatus.OK, json={"data": [], "next": None})
+    )
+
+    metadata = eth.validator.metadata(_pubkey(100))
+    list(eth.validators.effectiveness(pubkeys=[_pubkey(100), _pubkey(101)]))
+    list(eth.validators.effectiveness(pubkeys=[_pubkey(100), _pubkey(102)]))
+
+    assert metadata.validator_index == 100
+    first, second = (call.request.url.params for call in route.calls)
+    assert first.get_list("indices") == ["100", "101"]
+    assert "pubkeys" not in first
+    assert second.get_list("pubkeys") == [_pubkey(100), _pubkey(102)]
+
+
+def test_non_pubkey_strings_passed_through(respx_mock, pubkey_index):
+    eth = rated.Rated("fake_key").ethereum(network=rated.ethereum.MAINNET)
+    eth.pubkey_index = pubkey_index
+    pubkey_index.update([(_pubkey(100), 100)])
+    respx_mock.get("https://api.rated.network/v0/eth/validators/560000").mock(
+        return_value=httpx.Response(
+            http.HTTPStatus.OK,
+            json={"validatorIndex": 560000, "validatorPubkey": _pubkey(560000)},
+        )
+    )
+
+    metadata = eth.validator.metadata("560000")
+
+    assert metadata.validator_index == 560000
+    assert "560000" not in pubkey_index
+    assert rated.ethereum.pubkeys.to_indices(eth, ["560000"]) is None
+
+
+def test_pubkey_index_lookups_survive_updates(pubkey_index):
+    pubkey_index.update([(_pubkey(1), 1)])
+    by_pubkey = pubkey_index._by_pubkey
+
+    pubkey_index.update([(_pubkey(2), 2)])
+
+    # A reader still holding the previous map can keep reading it
+    assert pubkey_index._by_pubkey is not by_pubkey
+    assert by_pubkey[:PUBKEY_LENGTH] == pubkey_to_bytes(_pubkey(1))
+    assert pubkey_index.index_of(_pubkey(1)) == 1
+    assert pubkey_index.pubkey_of(2) == _pubkey(2)
@@ -0,0 +1,150 @@
+import http
+
+import httpx
+import pytest
+
+from rated.ethereum.datatypes import ValidatorMetadata
+from rated.ethereum.registry import RegistryChanges, ValidatorRegistry
+
+
+def _pubkey(n):
+    return f"0x{((n + 1) * 7919):096x}"
+
+
+def _metadata(n, **kwargs):
+    return {
+        "validatorIndex": n,
+        "validatorPubkey": _pubkey(n),
+        "pool": "Lido" if n % 2 else "Solo",
+        "nodeOperators": ["Kiln", "Lido"] if n % 2 else [],
+        "depositAddresses": ["0xABC"],
+        "withdrawalAddress": f"0xW{n % 3}",
+        "activationEpoch": 100 + n,
+        **kwargs,
+    }
+
+
+def _row(n, **kwargs):
+    return {
+        "validator_index": n,
+        "validator_pubkey": _pubkey(n),
+        "pool": "Lido" if n % 2 else "Solo",
+        "node_operators": ["Kiln", "Lido"] if n % 2 else [],
+        "deposit_addresses": ["0xABC"],
+        "withdrawal_address": f"0xW{n % 3}",
+        "activation_epoch": 100 + n,
+        **kwargs,
+    }
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = ValidatorRegistry(tmp_path / "registry.db")
+    yield registry
+    registry.close()
+
+
+def test_registry_lookups(registry):
+    changes = registry.upsert(ValidatorMetadata(**_row(n)) for n in range(6))
+
+    assert changes == RegistryChanges(added=6, updated=0)
+    assert len(registry) == 6
+    assert registry.max_index == 5
+    assert registry.by_index(3).node_operators == ["Kiln", "Lido"]
+    assert registry.by_index(2).node_operators is None
+    assert registry.by_index(9) is None
+    assert registry.by_pubkey(_pubkey(4)[2:]).validator_index == 4
+    assert [m.validator_index for m in registry.by_operator("Kiln")] == [1, 3, 5]
+    assert [m.validator_index for m in registry.by_pool("Solo")] == [0, 2, 4]
+    assert [m.validator_index for m in registry.by_withdrawal_address("0xw1")] == [1, 4]
+    assert len(list(registry.by_deposit_address("0xabc"))) == 6
+    assert 5 in registry
+
+
+def test_registry_only_writes_changes(registry):
+    registry.upsert(ValidatorMetadata(**_row(n)) for n in range(3))
+
+    changes = registry.upsert(
+        [
+            ValidatorMetadata(**_row(0)),
+            ValidatorMetadata(**_row(1, exit_epoch=900, withdrawable_epoch=1156)),
+            ValidatorMetadata(**_row(3)),
+        ]
+    )
+
+    assert changes == RegistryChanges(added=1, updated=1)
+    assert registry.by_index(1).exit_epoch == 900
+    assert registry.by_index(1).node_operators == ["Kiln", "Lido"]
+    assert [m.validator_index for m in registry.active()] == [0, 2, 3]
+    assert [m.validator_index for m in registry.active(by_pool="Lido")] == [3]
+
+
+def test_registry_refresh_new_indices(respx_mock, eth_mainnet, registry):
+    registry.upsert([ValidatorMetadata(**_row(0))])
+    route = respx_mock.get(
+        "https://api.rated.network/v0/eth/validators?from=1&size=100&id_type=nodeOperator"
+    ).mock(
+        return_value=httpx.Response(
+            http.HTTPStatus.OK,
+            json={"data": [_metadata(n) for n in (1, 2)], "next": None},
+        )
+    )
+
+    assert registry.refresh(eth_mainnet.validators) == RegistryChanges(added=2)
+    assert route.called
+    assert registry.by_index(2).activation_epoch == 102
+
+
+def _listing(exits):
+    def page(request):
+        first = int(request.url.params["from"])
+        size = int(request.url.params["size"])
+        data = [
+            _metadata(n, exitEpoch=exits.get(n))
+            for n in range(first, min(first + size, 10))
+        ]
+        return httpx.Response(http.HTTPStatus.OK, json={"data": data, "next": None})
+
+    return page
+
+
+def test_registry_refresh_validators(respx_mock, eth_mainnet, registry):
+    registry.upsert(ValidatorMetadata(**_row(n)) for n in range(10))
+    route = respx_mock.get("https://api.rated.network/v0/eth/validators").mock(
+        side_effect=_listing({2: 500, 5: 600, 8: 700})
+    )
+
+    changes = registry.refresh_validators(
+        eth_mainnet.validators, [9, 2, 3, 4, 2, 8], size=3
+    )
+
+    # Pages start from 2 and from 8, as 5 was not asked for
+    assert [int(c.request.url.params["from"]) for c in route.calls] == [2, 8]
+    assert changes == RegistryChanges(updated=2)
+    assert registry.by_index(2).exit_epoch == 500
+    assert registry.by_index(5).exit_epoch is None
+    assert registry.by_index(8).exit_epoch == 700
+
+
+def test_registry_refresh_every_validator(respx_mock, eth_mainnet, registry):
+    registry.upsert(ValidatorMetadata(**_row(n)) for n in range(10))
+    respx_mock.get("https://api.rated.network/v0/eth/validators").mock(
+        side_effect=_listing({5: 600})
+    )
+
+    changes = registry.refresh_validators(eth_mainnet.validators, size=100)
+
+    assert changes == RegistryChanges(updated=1)
+    assert [m.validator_index for m in registry.active()] == [
+        n for n in range(10) if n != 5
+    ]
+
+
+def test_registry_lookups_stream_in_batches(registry):
+    registry.upsert(ValidatorMetadata(**_row(n)) for n in range(1_200))
+
+    found = registry.by_operator("Kiln")
+
+    assert next(found).validator_index == 1
+    assert [m.validator_index for m in found][-1] == 1_199
+    assert all(m.node_operators for m in registry.by_pool("Lido"))
@@ -0,0 +1,119 @@
+from dataclasses import fields
+
+import pytest
+
+from rated.ethereum.datatypes import ValidatorEffectiveness
+from rated.ethereum.timeseries import COLUMNS, EffectivenessStore
+
+
+def _row(index, day, **kwargs):
+    return ValidatorEffectiveness(
+        validator_index=index,
+        validator_pubkey="0xa",
+        day=day,
+        uptime=None if day % 5 == 0 else index / 1000,
+        earnings=index * day,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EffectivenessStore(tmp_path / "effectiveness")
+    yield store
+    store.close()
+
+
+def test_columns_cover_every_numeric_field():
+    numeric = {
+        f.name: "d" if f.type == "float | None" else "q"
+        for f in fields(ValidatorEffectiveness)
+        if f.type != "str | None"
+    }
+
+    assert COLUMNS == numeric
+    assert all(
+        f.type in ("int | None", "float | None", "str | None")
+        for f in fields(ValidatorEffectiveness)
+    )
+
+
+def test_store_round_trips_rows(store):
+    rows = [_row(i, d, proposed_count=1) for d in range(10) for i in range(3)]
+
+    assert store.ingest(iter(rows), batch_size=7) == 30
+    assert len(store) == 30
+
+    scanned = list(store.scan())
+    assert len(scanned) == 30
+    assert [r.uptime for r in scanned] == [r.uptime for r in rows]
+    assert scanned[4].validator_index == 1
+    assert scanned[4].day == 1
+    assert scanned[4].uptime == 0.001
+    assert scanned[4].earnings == 1
+    assert scanned[4].proposed_count == 1
+    assert scanned[0].uptime is None
+    assert scanned[0].avg_correctness is None
+    assert scanned[0].validator_pubkey is None
+
+
+def test_store_range_scans(store):
+    store.append(_row(i, d) for d in range(100, 120) for i in range(50))
+
+    columns = store.read_columns(
+        ["validator_index", "day", "uptime"],
+        from_index=10,
+        to_index=11,
+        from_day=104,
+        to_day=106,
+    )
+
+    assert list(zip(columns["validator_index"], columns["day"])) == [
+        (i, d) for d in range(104, 107) for i in (10, 11)
+    ]
+    assert columns["uptime"] == [0.01, 0.011, None, None, 0.01, 0.011]
+    assert list(store.scan(from_day=200)) == []
+
+    with pytest.raises(ValueError):
+        store.read_columns(["validator_pubkey"])
+
+
+def test_store_skips_zones(store, monkeypatch):
+    store.append(_row(i, d) for d in range(3) for i in range(5000))
+    reads = []
+    read_values = store._read_values
+    monkeypatch.setattr(
+        store,
+        "_read_values",
+        lambda name, start, stop: reads.append(start) or read_values(name, start, stop),
+    )
+
+    rows = list(store.scan(from_day=2, to_day=2, columns=["validator_index"]))
+
+    assert len(rows) == 5000
+    assert set(reads) == {8192, 12288}
+
+
+def test_store_persists_and_appends(tmp_path):
+    store = EffectivenessStore(tmp_path / "effectiveness")
+    store.append([_row(1, 1), _row(2, 1), _row(3, 1)])
+    store.close()
+
+    reopened = EffectivenessStore(tmp_path / "effectiveness")
+    reopened.append([_row(1, 2)])
+
+    assert len(reopened) == 4
+    assert [
+        (r.validator_index, r.day) for r in reopened.scan(from_index=1, to_index=1)
+    ] == [
+        (1, 1),
+        (1, 2),
+    ]
+    reopened.close()
+
+
+def test_store_rejects_rows_without_keys(store):
+    with pytest.raises(ValueError):
+        store.append([ValidatorEffectiveness(validator_index=1)])
+
+    assert len(store) == 0
@@ -0,0 +1,74 @@
+import http
+
+import httpx
+import pytest
+
+from rated.ethereum.datatypes import ValidatorMetadata
+from rated.ethereum.validator_set import ValidatorSet
+
+
+def test_validator_set_algebra():
+    a = ValidatorSet([1, 5, 9, 1000, 5])
+    b = ValidatorSet(range(5, 12))
+
+    assert len(a) == 4
+    assert list(a) == [1, 5, 9, 1000]
+    assert 1000 in a and 2 not in a and -1 not in a
+    assert list(a & b) == [5, 9]
+    assert list(a | b) == [1, 5, 6, 7, 8, 9, 10, 11, 1000]
+    assert list(a - b) == [1, 1000]
+    assert list(a ^ b) == [1, 6, 7, 8, 10, 11, 1000]
+    assert a.intersection(b, [9]) == ValidatorSet([9])
+    assert a.union([2]) == a | {2}
+    assert a.difference([1], [1000]) == {5, 9}
+    assert {5, 9, 3} - a == ValidatorSet([3])
+    assert not ValidatorSet()
+    assert len(ValidatorSet()) == 0
+
+
+def test_validator_set_round_trips_bytes():
+    validator_set = ValidatorSet([0, 7, 8, 123456])
+
+    assert ValidatorSet.from_bytes(validator_set.to_bytes()) == validator_set
+
+
+def test_validator_set_membership():
+    validator_set = ValidatorSet([0, 7, 8, 999_999]) - {8}
+
+    assert [i in validator_set for i in (0, 7, 8, 999_999)] == [True, True, False, True]
+    assert 6 not in validator_set and 1_000_000 not in validator_set
+    assert "7" not in validator_set and None not in validator_set
+    assert 10**30 not in validator_set
+    assert 7 not in ValidatorSet()
+
+
+def test_validator_set_rejects_negative_indices():
+    with pytest.raises(ValueError):
+        ValidatorSet([-1])
+
+
+def test_validator_set_from_metadata():
+    metadata = [
+        ValidatorMetadata(
+            validator_index=n, validator_pubkey="0x", exit_epoch=n * 10 or None
+        )
+        for n in range(4)
+    ]
+
+    exited = ValidatorSet.from_metadata(
+        metadata, where=lambda m: m.exit_epoch is not None
+    )
+
+    assert list(exited) == [1, 2, 3]
+
+
+def test_validator_set_as_indices(respx_mock, eth_mainnet):
+    route = respx_mock.get(
+        "https://api.rated.network/v0/eth/validators/effectiveness"
+    ).mock(
+        return_value=httpx.Response(http.HTTPStatus.OK, json={"data": [], "next": None})
+    )
+
+    list(eth_mainnet.validators.effectiveness(indices=ValidatorSet([3, 1, 2])))
+
+    assert route.calls.last.request.url.params.get_list("indices") == ["1", "2", "3"]
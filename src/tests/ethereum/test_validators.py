@@ -1,14 +1,20 @@
+import dataclasses
 import http
+import json
+from datetime import date
 
 import httpx
 import pytest
 
+from rated.client import RatedApiError
+from rated.ethereum.datatypes import ReportProgress
 from rated.ethereum.enums import (
     AprType,
     TimeWindow,
     Granularity,
     ValidatorsEffectivenessGroupBy,
 )
+from rated.ethereum.validators import Validators
 
 
 def test_validator_apr_response_ok(respx_mock, eth_mainnet):
@@ -495,3 +501,264 @@ def test_validator_self_report_ok(respx_mock, eth_mainnet):
     )
 
     assert result == 1
+
+
+def _effectiveness_page(request: httpx.Request) -> httpx.Response:
+    indices = [int(i) for i in request.url.params.get_list("indices")]
+    if request.url.params["groupBy"] == ValidatorsEffectivenessGroupBy.TIME.value:
+        data = [
+            {
+                "day": day,
+                "uptime": 1.0 if indices[0] < 3 else 0.5,
+                "totalAttestationAssignments": 225 * len(indices),
+                "sumAllRewards": 1000 * len(indices),
+                "estimatedPenalties": None,
+            }
+            for day in (803, 802)
+        ]
+    else:
+        data = [{"validatorIndex": index, "day": 803} for index in indices]
+    return httpx.Response(200, json={"data": data, "next": None})
+
+
+def test_validators_effectiveness_chunks_indices(respx_mock, eth_mainnet):
+    route = respx_mock.get(
+        "https://api.rated.network/v0/eth/validators/effectiveness"
+    ).mock(side_effect=_effectiveness_page)
+
+    effectiveness = eth_mainnet.validators.effectiveness(
+        indices=list(range(5)),
+        chunk_size=2,
+    )
+    results = list(effectiveness)
+
+    assert route.call_count == 3
+    assert [r.validator_index for r in results] == [0, 1, 2, 3, 4]
+
+
+def test_validators_effectiveness_merges_time_windows_across_chunks(
+    respx_mock, eth_mainnet
+):
+    route = respx_mock.get(
+        "https://api.rated.network/v0/eth/validators/effectiveness"
+    ).mock(side_effect=_effectiveness_page)
+
+    effectiveness = eth_mainnet.validators.effectiveness(
+        indices=list(range(4)),
+        group_by=ValidatorsEffectivenessGroupBy.TIME,
+        chunk_size=3,
+    )
+    results = list(effectiveness)
+
+    assert route.call_count == 2
+    assert [r.day for r in results] == [803, 802]
+    assert results[0].sum_all_rewards == 4000
+    assert results[0].total_attestation_assignments == 900
+    assert results[0].uptime == pytest.approx((3 * 1.0 + 1 * 0.5) / 4)
+    assert results[0].estimated_penalties is None
+    assert results[0].validator_index is None
+
+
+def test_validator_metadata_many_reports_errors_per_key(respx_mock, eth_mainnet):
+    for index in (100, 102):
+        respx_mock.get(f"https://api.rated.network/v0/eth/validators/{index}").mock(
+            return_value=httpx.Response(
+                200,
+                json={"validatorIndex": index, "validatorPubkey": f"0x{index}"},
+            )
+        )
+    respx_mock.get("https://api.rated.network/v0/eth/validators/101").mock(
+        return_value=httpx.Response(http.HTTPStatus.NOT_FOUND)
+    )
+
+    results = list(eth_mainnet.validator.metadata_many([100, 101, 102]))
+
+    assert [r.key for r in results] == [100, 101, 102]
+    assert results[0].value.validator_pubkey == "0x100"
+    assert isinstance(results[1].error, RatedApiError)
+    assert results[1].error.status_code == http.HTTPStatus.NOT_FOUND
+    assert results[2].value.validator_pubkey == "0x102"
+
+
+def test_validator_apr_many_ok(respx_mock, eth_mainnet):
+    route = respx_mock.get(
+        url__regex=r"https://api.rated.network/v0/eth/validators/\d+/apr\?aprType=backward&window=30d"
+    ).mock(
+        side_effect=lambda request: httpx.Response(
+            200,
+            json={
+                "id": int(request.url.path.split("/")[-2]),
+                "idType": "validator",
+                "timeWindow": "30d",
+                "aprType": "backward",
+                "percentage": 3.5,
+                "percentageConsensus": 3.0,
+                "percentageExecution": 0.5,
+                "activeStake": 32,
+                "activeValidators": 1,
+            },
+        )
+    )
+
+    results = eth_mainnet.validator.apr_many(
+        range(10), time_window=TimeWindow.THIRTY_DAYS, ordered=False
+    )
+
+    assert sorted(r.unwrap().validator_index for r in results) == list(range(10))
+    assert route.call_count == 10
+
+
+def _pubkey(n):
+    return f"0x{n:096x}"
+
+
+def _accept_report(request):
+    validators = json.loads(request.content)["validators"]
+    return httpx.Response(http.HTTPStatus.OK, json={"validators": validators})
+
+
+def test_validators_report_in_chunks(respx_mock, eth_mainnet):
+    route = respx_mock.post("https://api.rated.network/v0/selfReports/validators")
+    route.mock(side_effect=_accept_report)
+    validators = [_pubkey(n) for n in range(5)]
+    validators += [_pubkey(0).upper().replace("0X", "0x"), _pubkey(1)[2:]]
+
+    result = eth_mainnet.validators.report(validators, chunk_size=2)
+
+    assert result == 5
+    assert route.call_count == 3
+    uploaded = [json.loads(c.request.content)["validators"] for c in route.calls]
+    assert sorted(p for chunk in uploaded for p in chunk) == [
+        _pubkey(n) for n in range(5)
+    ]
+
+
+def test_validators_report_retries_failed_chunks(respx_mock, eth_mainnet):
+    route = respx_mock.post("https://api.rated.network/v0/selfReports/validators")
+    route.mock(
+        side_effect=[
+            httpx.Response(http.HTTPStatus.SERVICE_UNAVAILABLE),
+            _accept_report,
+        ]
+    )
+
+    result = eth_mainnet.validators.report([_pubkey(1)], backoff=0)
+
+    assert result == 1
+    assert route.call_count == 2
+
+
+def test_validators_report_resumes_from_progress(respx_mock, eth_mainnet):
+    route = respx_mock.post("https://api.rated.network/v0/selfReports/validators")
+    route.mock(
+        side_effect=[
+            _accept_report,
+            httpx.Response(http.HTTPStatus.BAD_REQUEST),
+            _accept_report,
+        ]
+    )
+    validators = [_pubkey(n) for n in range(4)]
+    saved = []
+
+    with pytest.raises(RatedApiError):
+        eth_mainnet.validators.report(
+            validators,
+            chunk_size=2,
+            concurrency=1,
+            on_progress=lambda p: saved.append(dataclasses.asdict(p)),
+        )
+
+    progress = ReportProgress(**saved[-1])
+    assert progress.completed_chunks == [0]
+    assert not progress.done
+
+    result = eth_mainnet.validators.report(validators, chunk_size=2, progress=progress)
+
+    assert result == 4
+    assert progress.done
+    assert json.loads(route.calls[-1].request.content)["validators"] == validators[2:]
+
+    with pytest.raises(ValueError):
+        eth_mainnet.validators.report(validators[:3], chunk_size=2, progress=progress)
+
+
+def test_validators_report_rejects_malformed_pubkeys(eth_mainnet):
+    with pytest.raises(ValueError):
+        eth_mainnet.validators.report(["0x1234"])
+    with pytest.raises(ValueError):
+        eth_mainnet.validators.report(["0x" + "zz" * 48])
+
+
+def test_validators_report_of_empty_set_uploads_nothing(respx_mock, eth_mainnet):
+    route = respx_mock.post("https://api.rated.network/v0/selfReports/validators")
+
+    assert eth_mainnet.validators.report([]) == 0
+    assert route.call_count == 0
+
+
+def test_validator_effectiveness_backfill_in_chronological_order(
+    respx_mock, eth_mainnet
+):
+    def effectiveness_page(request):
+        last = int(request.url.params["from"])
+        days = [d for d in range(last, last - 5, -1) if d >= 0]
+        return httpx.Response(
+            200,
+            json={
+                "data": [{"validatorIndex": 100, "day": d} for d in days],
+                "next": f"/v0/eth/validators/100/effectiveness?from={last - 5}&size=5",
+            },
+        )
+
+    respx_mock.get(
+        "https://api.rated.network/v0/eth/validators/100/effectiveness"
+    ).mock(side_effect=effectiveness_page)
+
+    effectiveness = eth_mainnet.validator.effectiveness_backfill(
+        100, from_day=3, to_day=70, size=5
+    )
+
+    assert [e.day for e in effectiveness] == list(range(3, 71))
+
+
+def test_validators_effectiveness_backfill_in_sub_windows(respx_mock, eth_mainnet):
+    def effectiveness_page(request):
+        first = int(request.url.params["from"])
+        last = int(request.url.params["to"])
+        data = [
+            {"validatorIndex": i, "day": d}
+            for d in range(first, last + 1)
+            for i in (2, 1)
+        ]
+        return httpx.Response(200, json={"data": data, "next": None})
+
+    route = respx_mock.get(
+        "https://api.rated.network/v0/eth/validators/effectiveness"
+    ).mock(side_effect=effectiveness_page)
+
+    effectiveness = eth_mainnet.validators.effectiveness_backfill(
+        indices=[1, 2], from_day=date(2023, 2, 1), to_day=date(2023, 4, 1)
+    )
+    results = [(e.day, e.validator_index) for e in effectiveness]
+
+    assert route.call_count == 2
+    assert results == [(d, i) for d in range(792, 852) for i in (1, 2)]
+
+
+@pytest.mark.parametrize("to_day, chunk_concurrency", [(819, 4), (1000, 1)])
+def test_validators_effectiveness_backfill_shares_concurrency(
+    eth_mainnet, monkeypatch, to_day, chunk_concurrency
+):
+    calls = []
+
+    def effectiveness(self, **kwargs):
+        calls.append(kwargs["concurrency"])
+        return iter([])
+
+    monkeypatch.setattr(Validators, "effectiveness", effectiveness)
+    effectiveness_rows = eth_mainnet.validators.effectiveness_backfill(
+        indices=[1, 2], from_day=760, to_day=to_day, concurrency=8
+    )
+
+    assert list(effectiveness_rows) == []
+    assert set(calls) == {chunk_concurrency}
@@ -1,6 +1,9 @@
 import http
 
 import httpx
+import pytest
+
+from rated.client import RatedApiError
 
 
 def test_withdrawals_by_operator_ok(respx_mock, eth_mainnet):
@@ -94,3 +97,79 @@ def test_withdrawals_by_slot_ok(respx_mock, eth_mainnet):
     assert results[1].id == "0xf82ac5937a20dc862f9bc0668779031e06000f17"
     assert results[1].validator_index == 1055616
     assert results[1].withdrawable_amount == 60491748
+
+
+def _predicted_withdrawals(request):
+    slot = int(request.url.path.split("/")[-1])
+    if slot % 2:
+        return httpx.Response(http.HTTPStatus.OK, json=[])
+    return httpx.Response(
+        http.HTTPStatus.OK,
+        json=[
+            {
+                "id": id_,
+                "idType": id_type,
+                "validatorIndex": slot * 10,
+                "withdrawableAmount": slot,
+                "withdrawalEpoch": slot // 32,
+                "withdrawalSlot": slot,
+                "withdrawalType": "full" if slot == 64 else "partial",
+            }
+            for id_, id_type in (("Lido", "pool"), ("Kiln", "nodeOperator"))
+        ],
+    )
+
+
+def test_withdrawals_by_slot_range_keeps_slot_order(respx_mock, eth_mainnet):
+    route = respx_mock.get(
+        url__regex=r"https://api.rated.network/v0/eth/withdrawals/predicted/slot/\d+"
+    ).mock(side_effect=_predicted_withdrawals)
+
+    withdrawals = eth_mainnet.withdrawals.by_slot_range(60, 70, concurrency=4)
+    results = list(withdrawals)
+
+    assert route.call_count == 11
+    assert [w.withdrawal_slot for w in results] == [
+        s for s in range(60, 71) if s % 2 == 0 for _ in range(2)
+    ]
+
+    with pytest.raises(ValueError):
+        eth_mainnet.withdrawals.by_slot_range(70, 60)
+
+
+def test_withdrawals_by_slot_range_fails_on_slots_not_fetched(respx_mock, eth_mainnet):
+    def predicted_withdrawals(request):
+        if request.url.path.endswith("/64"):
+            return httpx.Response(http.HTTPStatus.BAD_REQUEST)
+        return _predicted_withdrawals(request)
+
+    respx_mock.get(
+        url__regex=r"https://api.rated.network/v0/eth/withdrawals/predicted/slot/\d+"
+    ).mock(side_effect=predicted_withdrawals)
+
+    withdrawals = eth_mainnet.withdrawals.by_slot_range(60, 70, concurrency=4)
+    yielded = []
+    with pytest.raises(RatedApiError):
+        for w in withdrawals:
+            yielded.append(w.withdrawal_slot)
+
+    assert yielded == [60, 60, 62, 62]
+
+
+def test_withdrawals_totals_by_epoch(respx_mock, eth_mainnet):
+    respx_mock.get(
+        url__regex=r"https://api.rated.network/v0/eth/withdrawals/predicted/slot/\d+"
+    ).mock(side_effect=_predicted_withdrawals)
+
+    totals = list(eth_mainnet.withdrawals.totals_by_epoch(60, 97))
+
+    assert [t.epoch for t in totals] == [1, 2, 3]
+    assert totals[0].validator_count == 2
+    assert totals[0].withdrawable_amount == 60 + 62
+    assert totals[1].validator_count == 16
+    assert totals[1].withdrawable_amount == sum(range(64, 96, 2))
+    assert totals[1].withdrawable_amount_by_type == {
+        "full": 64,
+        "partial": sum(range(66, 96, 2)),
+    }
+    assert totals[2].withdrawable_amount == 96
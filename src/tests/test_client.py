@@ -4,6 +4,7 @@ import httpx
 import pytest
 
 import rated.client
+from rated.ethereum.datatypes import ValidatorMetadata
 from rated.version import __version__
 
 
@@ -134,3 +135,43 @@ def test_client_follows_redirects(respx_mock, status_code):
     )
 
     assert response.status_code == status_code
+
+
+def test_paginated_results_resume_from_cursor(respx_mock):
+    def page(request):
+        start = int(request.url.params.get("from", 0))
+        next_ = f"https://foo.bar/v0/items?from={start + 3}" if start < 6 else None
+        data = [
+            {"validatorIndex": n, "validatorPubkey": "0x"}
+            for n in range(start, start + 3)
+        ]
+        return httpx.Response(http.HTTPStatus.OK, json={"data": data, "next": next_})
+
+    respx_mock.get("https://foo.bar/v0/items").mock(side_effect=page)
+    c = rated.client.Client("fake_api_key", network="foobar")
+    c.client.base_url = "https://foo.bar"
+
+    results = c.yield_paginated_results(
+        "/v0/items",
+        params={"size": 3, "from": None},
+        cls=ValidatorMetadata,
+        follow_next=True,
+    )
+    consumed = [next(results).validator_index for _ in range(4)]
+    saved = results.cursor.to_json()
+
+    cursor = rated.client.PaginationCursor.from_json(saved)
+    resumed = [m.validator_index for m in c.resume(cursor)]
+
+    assert consumed == [0, 1, 2, 3]
+    assert resumed == [4, 5, 6, 7, 8]
+    assert cursor.items_consumed == 9
+    assert cursor.done
+    assert list(c.resume(cursor)) == []
+
+
+def test_pagination_cursor_only_resumes_package_types():
+    cursor = rated.client.PaginationCursor("/v0/items", cls="os:system")
+
+    with pytest.raises(ValueError):
+        cursor.result_type()
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from rated.concurrency import BatchResult, chunked, run_concurrently, with_retries
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+
+    with pytest.raises(ValueError):
+        list(chunked([1], 0))
+
+
+def test_run_concurrently_keeps_input_order():
+    def slow_square(n):
+        time.sleep(0.01 * (5 - n))
+        return n * n
+
+    results = list(run_concurrently(slow_square, range(5), concurrency=5))
+
+    assert [r.key for r in results] == [0, 1, 2, 3, 4]
+    assert [r.unwrap() for r in results] == [0, 1, 4, 9, 16]
+
+
+def test_run_concurrently_as_completed():
+    results = run_concurrently(lambda n: n, range(20), concurrency=3, ordered=False)
+
+    assert sorted(r.value for r in results) == list(range(20))
+
+
+def test_run_concurrently_reports_errors_without_aborting():
+    def fail_on_odd(n):
+        if n % 2:
+            raise ValueError(n)
+        return n
+
+    results = list(run_concurrently(fail_on_odd, range(4), concurrency=2))
+
+    assert [r.ok for r in results] == [True, False, True, False]
+    assert isinstance(results[1].error, ValueError)
+    with pytest.raises(ValueError):
+        results[1].unwrap()
+
+
+def test_run_concurrently_bounds_calls_in_flight():
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def track(n):
+        with lock:
+            in_flight.append(n)
+            peak.append(len(in_flight))
+        time.sleep(0.005)
+        with lock:
+            in_flight.remove(n)
+        return n
+
+    results = list(run_concurrently(track, range(30), concurrency=3))
+
+    assert len(results) == 30
+    assert max(peak) <= 3
+
+
+def test_run_concurrently_rejects_invalid_concurrency():
+    with pytest.raises(ValueError):
+        list(run_concurrently(lambda n: n, [1], concurrency=0))
+
+
+def test_batch_result_ok():
+    assert BatchResult("a", value=1).ok
+    assert not BatchResult("a", error=ValueError()).ok
+
+
+def test_with_retries_stops_on_errors_not_worth_retrying():
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise KeyError()
+
+    with pytest.raises(KeyError):
+        with_retries(fail, retries=3, backoff=0, retry_on=lambda e: False)
+    assert len(calls) == 1
+
+    with pytest.raises(KeyError):
+        with_retries(fail, retries=2, backoff=0)
+    assert len(calls) == 4
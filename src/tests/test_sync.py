@@ -0,0 +1,95 @@
+import http
+
+import httpx
+import pytest
+
+from rated.client import RatedApiError
+from rated.sync import BlockSync, SQLiteBlockStore
+
+
+def _block(slot):
+    return {
+        "epoch": slot // 32,
+        "consensusSlot": slot,
+        "validatorIndex": slot * 10,
+        "relays": ["flashbots"],
+        "blockBuilderPubkeys": [],
+        "executionProposerDuty": "proposed",
+        "consensusProposerDuty": "proposed",
+        "blockTimestamp": "2023-10-09T11:00:47",
+    }
+
+
+def _listing(failing_slots=()):
+    def listing(request):
+        last = int(request.url.params.get("from", 219))
+        size = int(request.url.params["size"])
+        if last in failing_slots:
+            return httpx.Response(http.HTTPStatus.BAD_GATEWAY)
+        slots = [s for s in range(last, last - size, -1) if s % 7]
+        return httpx.Response(
+            http.HTTPStatus.OK,
+            json={"data": [_block(s) for s in slots], "next": None},
+        )
+
+    return listing
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteBlockStore(tmp_path / "blocks.db")
+    yield store
+    store.close()
+
+
+def test_block_sync_resumes_from_checkpoint(respx_mock, eth_mainnet, store):
+    route = respx_mock.get("https://api.rated.network/v0/eth/blocks")
+    route.mock(side_effect=_listing(failing_slots={219}))
+    sync = BlockSync(
+        eth_mainnet.blocks, store, start_slot=200, batch_size=10, page_size=5
+    )
+
+    with pytest.raises(RatedApiError):
+        sync.run(end_slot=219)
+
+    assert store.last_slot() == 209
+    assert len(store) == 9
+
+    route.mock(side_effect=_listing())
+    updates = []
+    progress = sync.run(on_progress=lambda p: updates.append(p.last_slot))
+
+    assert updates == [219]
+    assert store.last_slot() == 219
+    assert progress.slots_synced == 10
+    assert progress.blocks_written == 8
+    assert progress.remaining_slots == 0
+    assert progress.slots_per_second > 0
+    assert [b.consensus_slot for b in store.blocks()] == [
+        s for s in range(200, 220) if s % 7
+    ]
+    assert store.get(201).relays == ["flashbots"]
+    assert store.get(203) is None
+
+
+def test_block_sync_is_idempotent(respx_mock, eth_mainnet, store):
+    respx_mock.get("https://api.rated.network/v0/eth/blocks").mock(
+        side_effect=_listing()
+    )
+    sync = BlockSync(
+        eth_mainnet.blocks, store, start_slot=200, batch_size=10, page_size=5
+    )
+
+    sync.run(end_slot=209)
+    store.write([store.get(201)], last_slot=204)
+    progress = sync.run(end_slot=209)
+
+    assert progress.last_slot == 209
+    assert len(store) == len([s for s in range(200, 210) if s % 7])
+
+
+def test_block_sync_defaults_to_the_merge(eth_mainnet, store):
+    sync = BlockSync(eth_mainnet.blocks, store)
+
+    assert sync.start_slot == 4700013
+    assert sync.run(end_slot=0).slots_synced == 0